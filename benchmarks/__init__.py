@@ -0,0 +1,11 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Benchmarks for configman.  They are not part of the installed package.
+
+Run them from the root of the repository with:
+
+    python -m benchmarks --output=benchmark_results.json
+
+See 'python -m benchmarks --help' for the options."""
@@ -0,0 +1,96 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""run the benchmarks, print a table of the results and write them to a json
+file"""
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import sys
+
+from benchmarks import construction, results as results_file
+from benchmarks.shapes import SHAPES
+
+
+#------------------------------------------------------------------------------
+def print_table(results, output_stream=sys.stdout):
+    name_width = max(len(x['name']) for x in results)
+    print(
+        '%-*s %12s %12s' % (name_width, 'benchmark', 'min', 'median'),
+        file=output_stream
+    )
+    for a_result in results:
+        print(
+            '%-*s %12.6f %12.6f' % (
+                name_width,
+                a_result['name'],
+                a_result['min'],
+                a_result['median']
+            ),
+            file=output_stream
+        )
+
+
+#------------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='time the construction of configurations at scale'
+    )
+    parser.add_argument(
+        '--shape',
+        action='append',
+        choices=sorted(SHAPES),
+        help='a shape of option definitions to benchmark, may be repeated '
+             '(default: all of them)'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help='the number of times to time each benchmark'
+    )
+    parser.add_argument(
+        '--scale',
+        type=float,
+        default=1.0,
+        help='a multiplier for the number of options in each shape'
+    )
+    parser.add_argument(
+        '--worklist',
+        action='store_true',
+        help='construct with use_worklist_expansion=True'
+    )
+    parser.add_argument(
+        '--output',
+        default='benchmark_results.json',
+        help='the pathname of the json results file'
+    )
+    arguments = parser.parse_args(argv)
+
+    config_manager_kwargs = {}
+    if arguments.worklist:
+        config_manager_kwargs['use_worklist_expansion'] = True
+    results = construction.run(
+        arguments.shape,
+        arguments.repeat,
+        arguments.scale,
+        config_manager_kwargs
+    )
+    print_table(results)
+    parameters = {
+        'suite': 'construction',
+        'shapes': arguments.shape or sorted(SHAPES),
+        'repeat': arguments.repeat,
+        'scale': arguments.scale,
+        'config_manager_kwargs': config_manager_kwargs,
+    }
+    results_file.save(
+        results_file.results_document(results, parameters),
+        arguments.output
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""This module times the work of a ConfigurationManager for each of the
+shapes of option definitions from the module 'shapes':
+
+    construction - creating the ConfigurationManager, which includes the
+                   overlay and expansion of the definitions
+    get_config - creating the config mapping
+    write_conf - writing the configuration in ini format
+    help - writing the help output
+"""
+from __future__ import absolute_import, division, print_function
+
+import contextlib
+import timeit
+
+from six.moves import cStringIO as StringIO
+
+from configman import ConfigurationManager, command_line
+from configman.value_sources import has_registration_for
+
+from benchmarks.shapes import SHAPES
+
+MEASUREMENTS = ('construction', 'get_config', 'write_conf', 'help')
+
+
+#------------------------------------------------------------------------------
+def median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+#------------------------------------------------------------------------------
+def percentile(values, fraction):
+    """the value at 'fraction' of the way through the sorted values,
+    interpolating linearly between neighbours"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (
+        position - lower
+    )
+
+
+#------------------------------------------------------------------------------
+def interquartile_range(values):
+    return percentile(values, 0.75) - percentile(values, 0.25)
+
+
+#------------------------------------------------------------------------------
+def summarize(name, times, **extra):
+    """return the result of a benchmark as a dict"""
+    result = {
+        'name': name,
+        'times': times,
+        'min': min(times),
+        'median': median(times),
+        'iqr': interquartile_range(times),
+    }
+    result.update(extra)
+    return result
+
+
+#------------------------------------------------------------------------------
+@contextlib.contextmanager
+def _string_opener():
+    yield StringIO()
+
+
+#------------------------------------------------------------------------------
+def _time(function, repeat):
+    times = []
+    for i in range(repeat):
+        start = timeit.default_timer()
+        function()
+        times.append(timeit.default_timer() - start)
+    return times
+
+
+#------------------------------------------------------------------------------
+def run(shapes=None, repeat=5, scale=1.0, config_manager_kwargs=None):
+    """return a list of the results of the benchmarks for each of the named
+    shapes"""
+    if shapes is None:
+        shapes = sorted(SHAPES)
+    if config_manager_kwargs is None:
+        config_manager_kwargs = {}
+    if has_registration_for('ini'):
+        config_file_type = 'ini'
+    else:
+        config_file_type = 'conf'
+
+    results = []
+    for shape_name in shapes:
+        definitions = SHAPES[shape_name](scale)
+
+        def construct():
+            return ConfigurationManager(
+                definitions,
+                values_source_list=[command_line],
+                argv_source=[],
+                quit_after_admin=False,
+                **config_manager_kwargs
+            )
+
+        config_manager = construct()
+        number_of_options = len(config_manager.get_option_names())
+        functions = {
+            'construction': construct,
+            'get_config': config_manager.get_config,
+            'write_conf': lambda: config_manager.write_conf(
+                config_file_type,
+                _string_opener
+            ),
+            'help': lambda: config_manager.output_summary(
+                output_stream=StringIO()
+            ),
+        }
+        for measurement in MEASUREMENTS:
+            results.append(summarize(
+                '%s.%s' % (shape_name, measurement),
+                _time(functions[measurement], repeat),
+                shape=shape_name,
+                measurement=measurement,
+                number_of_options=number_of_options,
+            ))
+    return results
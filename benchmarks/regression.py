@@ -0,0 +1,516 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""This module tracks the performance of configman from commit to commit.  It
+runs a fixed set of scenarios, stores the results as a baseline named by the
+git commit and compares a run against a stored baseline:
+
+    python -m benchmarks.regression --save
+    ... change things ...
+    python -m benchmarks.regression --baseline=<commit>
+
+A scenario has regressed when its median time exceeds the median of the
+baseline by more than the threshold (10% by default) AND by more than the
+noise of the measurements, the larger of the two interquartile ranges.  When
+any scenario regresses, a table of all the scenarios is printed and the exit
+status is 1.
+
+The scenarios are:
+
+    construction.<shape> - a ConfigurationManager for each of the shapes of
+                           the module 'shapes'
+    dotdict.<operation> - attribute, dotted key and breadth first access of
+                          a DotDict
+    converters.<name> - a batch of strings through each of the common
+                        from string converters and values through to_str
+    value_source.<module> - reading values through each of the modules of
+                            'configman.value_sources'
+"""
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import collections
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+import types
+
+import six
+
+from configman import ConfigurationManager, command_line
+from configman.dotdict import DotDict
+from configman.converters import (
+    str_to_boolean,
+    str_to_list,
+    str_to_python_object,
+    to_str,
+)
+from configman.value_sources import (
+    for_argparse,
+    for_conf,
+    for_configobj,
+    for_getopt,
+    for_json,
+    for_mapping,
+    for_modules,
+)
+
+from benchmarks import construction, results as results_file
+from benchmarks.shapes import SHAPES, flat
+
+DEFAULT_BASELINE_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    'baselines'
+)
+
+
+#------------------------------------------------------------------------------
+def _construction_scenario(shape_name):
+    def setup(scale, working_directory):
+        definitions = SHAPES[shape_name](scale)
+        return lambda: ConfigurationManager(
+            definitions,
+            values_source_list=[command_line],
+            argv_source=[],
+            quit_after_admin=False,
+        )
+    return setup
+
+
+#------------------------------------------------------------------------------
+def _dotdict(scale):
+    """a DotDict three levels deep with 8000 leaves at a scale of 1"""
+    d = DotDict()
+    width = max(2, int(round(20 * scale ** (1 / 3))))
+    keys = []
+    for i in range(width):
+        for j in range(width):
+            for k in range(width):
+                key = 'a%d.b%d.c%d' % (i, j, k)
+                d[key] = k
+                keys.append(key)
+    return d, keys
+
+
+#------------------------------------------------------------------------------
+def _dotdict_get_attribute(scale, working_directory):
+    d, keys = _dotdict(scale)
+    paths = [key.split('.') for key in keys]
+
+    def get_attributes():
+        for a, b, c in paths:
+            getattr(getattr(getattr(d, a), b), c)
+    return get_attributes
+
+
+#------------------------------------------------------------------------------
+def _dotdict_get_dotted_key(scale, working_directory):
+    d, keys = _dotdict(scale)
+
+    def get_items():
+        for key in keys:
+            d[key]
+    return get_items
+
+
+#------------------------------------------------------------------------------
+def _dotdict_set_dotted_key(scale, working_directory):
+    keys = _dotdict(scale)[1]
+
+    def set_items():
+        d = DotDict()
+        for key in keys:
+            d[key] = 0
+    return set_items
+
+
+#------------------------------------------------------------------------------
+def _dotdict_keys_breadth_first(scale, working_directory):
+    d = _dotdict(scale)[0]
+    return lambda: list(d.keys_breadth_first())
+
+
+#------------------------------------------------------------------------------
+def _converter_scenario(converter, inputs):
+    def setup(scale, working_directory):
+        batch = inputs * max(1, int(100 * scale))
+
+        def convert():
+            for an_input in batch:
+                converter(an_input)
+        return convert
+    return setup
+
+
+#------------------------------------------------------------------------------
+def _value_source_definitions(scale):
+    return flat(scale, number_of_options=1000)
+
+
+#------------------------------------------------------------------------------
+def _value_source_config_manager(scale, argv_source=()):
+    return ConfigurationManager(
+        _value_source_definitions(scale),
+        values_source_list=[],
+        argv_source=list(argv_source),
+        quit_after_admin=False,
+    )
+
+
+#------------------------------------------------------------------------------
+def _value_source_file(config_manager, working_directory, extension):
+    pathname = os.path.join(working_directory, 'values.%s' % extension)
+    config_manager.write_conf(extension, lambda: open(pathname, 'w'))
+    return pathname
+
+
+#------------------------------------------------------------------------------
+def _file_value_source_scenario(a_module):
+    def setup(scale, working_directory):
+        config_manager = _value_source_config_manager(scale)
+        pathname = _value_source_file(
+            config_manager,
+            working_directory,
+            a_module.file_name_extension
+        )
+        return lambda: a_module.ValueSource(
+            pathname,
+            config_manager
+        ).get_values(config_manager, True, DotDict)
+    return setup
+
+
+#------------------------------------------------------------------------------
+def _mapping_value_source(scale, working_directory):
+    config_manager = _value_source_config_manager(scale)
+    values = dict(
+        (key, to_str(config_manager.option_definitions[key].default))
+        for key in config_manager.option_definitions.keys_breadth_first()
+    )
+    return lambda: for_mapping.ValueSource(
+        values,
+        config_manager
+    ).get_values(config_manager, True, DotDict)
+
+
+#------------------------------------------------------------------------------
+def _command_line_arguments(scale):
+    return [
+        '--%s=%s' % (key, i)
+        for i, key in enumerate(
+            _value_source_definitions(scale).keys_breadth_first()
+        )
+    ]
+
+
+#------------------------------------------------------------------------------
+def _getopt_value_source(scale, working_directory):
+    argv_source = _command_line_arguments(scale)
+    config_manager = _value_source_config_manager(scale, argv_source)
+    return lambda: for_getopt.ValueSource(
+        argv_source,
+        config_manager
+    ).get_values(config_manager, True, DotDict)
+
+
+#------------------------------------------------------------------------------
+def _argparse_value_source(scale, working_directory):
+    argv_source = _command_line_arguments(scale)
+    config_manager = _value_source_config_manager(scale, argv_source)
+    return lambda: for_argparse.ValueSource(
+        for_argparse.argparse,
+        config_manager
+    ).get_values(config_manager, True, DotDict)
+
+
+#------------------------------------------------------------------------------
+def _modules_value_source(scale, working_directory):
+    config_manager = _value_source_config_manager(scale)
+    pathname = _value_source_file(config_manager, working_directory, 'py')
+    with open(pathname) as f:
+        code = compile(f.read(), pathname, 'exec')
+
+    def load_module():
+        a_module = types.ModuleType('values')
+        six.exec_(code, a_module.__dict__)
+        return for_modules.ValueSource(
+            a_module,
+            config_manager
+        ).get_values(config_manager, True, DotDict)
+    return load_module
+
+
+# scenario name -> function of (scale, working_directory) that returns the
+# function to time
+SCENARIOS = collections.OrderedDict(
+    [
+        ('construction.%s' % shape_name, _construction_scenario(shape_name))
+        for shape_name in sorted(SHAPES)
+    ] + [
+        ('dotdict.get_attribute', _dotdict_get_attribute),
+        ('dotdict.get_dotted_key', _dotdict_get_dotted_key),
+        ('dotdict.set_dotted_key', _dotdict_set_dotted_key),
+        ('dotdict.keys_breadth_first', _dotdict_keys_breadth_first),
+        ('converters.str_to_boolean', _converter_scenario(
+            str_to_boolean,
+            ['true', 'False', '1', 'no']
+        )),
+        ('converters.str_to_list', _converter_scenario(
+            str_to_list,
+            ['a, b, c', '1,2,3,4,5', '']
+        )),
+        ('converters.str_to_python_object', _converter_scenario(
+            str_to_python_object,
+            ['int', 'os.path.join', 'configman.dotdict.DotDict', '']
+        )),
+        ('converters.to_str', _converter_scenario(
+            to_str,
+            [1, 2.5, True, 'a string', ['a', 'list'], DotDict]
+        )),
+        ('value_source.for_argparse', _argparse_value_source),
+        ('value_source.for_conf', _file_value_source_scenario(for_conf)),
+        ('value_source.for_configobj',
+            _file_value_source_scenario(for_configobj)),
+        ('value_source.for_getopt', _getopt_value_source),
+        ('value_source.for_json', _file_value_source_scenario(for_json)),
+        ('value_source.for_mapping', _mapping_value_source),
+        ('value_source.for_modules', _modules_value_source),
+    ]
+)
+
+
+#------------------------------------------------------------------------------
+def _time(function, repeat, number):
+    times = []
+    for i in range(repeat):
+        start = timeit.default_timer()
+        for j in range(number):
+            function()
+        times.append((timeit.default_timer() - start) / number)
+    return times
+
+
+#------------------------------------------------------------------------------
+def run(scenarios=None, repeat=7, number=3, scale=1.0):
+    """return a list of the results of the named scenarios, each timed
+    'repeat' times as the mean of 'number' calls"""
+    if scenarios is None:
+        scenarios = list(SCENARIOS)
+    working_directory = tempfile.mkdtemp(prefix='configman_benchmarks_')
+    try:
+        results = []
+        for name in scenarios:
+            function = SCENARIOS[name](scale, working_directory)
+            function()  # warm up imports and caches
+            results.append(construction.summarize(
+                name,
+                _time(function, repeat, number)
+            ))
+        return results
+    finally:
+        shutil.rmtree(working_directory, ignore_errors=True)
+
+
+#------------------------------------------------------------------------------
+def compare(baseline_results, current_results, threshold=0.10):
+    """return a list of rows, one for each scenario in either list of results:
+
+        (name, baseline median, current median, change, status)
+
+    where the status is one of 'ok', 'faster', 'REGRESSED', 'new' or
+    'missing'."""
+    baseline_by_name = dict((x['name'], x) for x in baseline_results)
+    current_by_name = dict((x['name'], x) for x in current_results)
+    names = [x['name'] for x in current_results] + [
+        x['name'] for x in baseline_results if x['name'] not in current_by_name
+    ]
+    rows = []
+    for name in names:
+        baseline = baseline_by_name.get(name)
+        current = current_by_name.get(name)
+        if baseline is None:
+            rows.append((name, None, current['median'], None, 'new'))
+            continue
+        if current is None:
+            rows.append((name, baseline['median'], None, None, 'missing'))
+            continue
+        difference = current['median'] - baseline['median']
+        noise = max(baseline['iqr'], current['iqr'])
+        if baseline['median']:
+            change = difference / baseline['median']
+        else:
+            change = 0.0
+        if abs(difference) <= noise or abs(change) <= threshold:
+            status = 'ok'
+        elif difference > 0:
+            status = 'REGRESSED'
+        else:
+            status = 'faster'
+        rows.append(
+            (name, baseline['median'], current['median'], change, status)
+        )
+    return rows
+
+
+#------------------------------------------------------------------------------
+def regressions(rows):
+    return [x for x in rows if x[4] == 'REGRESSED']
+
+
+#------------------------------------------------------------------------------
+def print_comparison(rows, output_stream=sys.stdout):
+    def seconds(value):
+        return '-' if value is None else '%.6f' % value
+
+    def percent(value):
+        return '-' if value is None else '%+.1f%%' % (value * 100)
+
+    name_width = max([len(x[0]) for x in rows] + [len('scenario')])
+    line_format = '%-*s %12s %12s %9s  %s'
+    print(
+        line_format % (
+            name_width, 'scenario', 'baseline', 'current', 'change', 'status'
+        ),
+        file=output_stream
+    )
+    for name, baseline, current, change, status in rows:
+        print(
+            line_format % (
+                name_width,
+                name,
+                seconds(baseline),
+                seconds(current),
+                percent(change),
+                status
+            ),
+            file=output_stream
+        )
+
+
+#------------------------------------------------------------------------------
+def baseline_pathname(baseline, baseline_directory):
+    """a baseline is either the pathname of a results file or the name of a
+    commit with results in the baseline directory"""
+    if os.path.isfile(baseline):
+        return baseline
+    return os.path.join(baseline_directory, '%s.json' % baseline)
+
+
+#------------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.regression',
+        description='compare the performance of configman to a baseline'
+    )
+    parser.add_argument(
+        '--scenario',
+        action='append',
+        choices=list(SCENARIOS),
+        help='a scenario to run, may be repeated (default: all of them)'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=7,
+        help='the number of timings of each scenario'
+    )
+    parser.add_argument(
+        '--number',
+        type=int,
+        default=3,
+        help='the number of calls averaged in each timing'
+    )
+    parser.add_argument(
+        '--scale',
+        type=float,
+        default=0.1,
+        help='a multiplier for the size of each scenario'
+    )
+    parser.add_argument(
+        '--baseline-directory',
+        default=DEFAULT_BASELINE_DIRECTORY,
+        help='the directory of the stored baselines'
+    )
+    parser.add_argument(
+        '--save',
+        action='store_true',
+        help='store the results as the baseline of the current commit'
+    )
+    parser.add_argument(
+        '--baseline',
+        help='the commit or results file to compare against'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.10,
+        help='the fraction by which a median may grow before it is called '
+             'a regression'
+    )
+    arguments = parser.parse_args(argv)
+
+    baseline_document = None
+    if arguments.baseline:
+        # load the baseline first so that a bad name fails before the run
+        baseline_document = results_file.load(
+            baseline_pathname(arguments.baseline, arguments.baseline_directory)
+        )
+
+    current_results = run(
+        arguments.scenario,
+        arguments.repeat,
+        arguments.number,
+        arguments.scale
+    )
+    document = results_file.results_document(
+        current_results,
+        {
+            'suite': 'regression',
+            'repeat': arguments.repeat,
+            'number': arguments.number,
+            'scale': arguments.scale,
+        }
+    )
+    if arguments.save:
+        pathname = os.path.join(
+            arguments.baseline_directory,
+            '%s.json' % document['commit']
+        )
+        results_file.save(document, pathname)
+        print('saved %s' % pathname)
+
+    if baseline_document is None:
+        print_comparison(compare([], current_results))
+        return 0
+
+    if baseline_document['parameters'] != document['parameters']:
+        print(
+            'warning: the baseline was run with different parameters: %s'
+            % baseline_document['parameters'],
+            file=sys.stderr
+        )
+    rows = compare(
+        baseline_document['results'],
+        current_results,
+        arguments.threshold
+    )
+    print_comparison(rows)
+    regressed = regressions(rows)
+    if regressed:
+        print(
+            '%d of %d scenarios regressed by more than %.0f%% against %s' % (
+                len(regressed),
+                len(rows),
+                arguments.threshold * 100,
+                baseline_document['commit'],
+            )
+        )
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
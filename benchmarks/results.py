@@ -0,0 +1,82 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""reading and writing the json files of benchmark results"""
+from __future__ import absolute_import, division, print_function
+
+import datetime
+import json
+import os
+import platform
+import subprocess
+
+import configman
+
+RESULTS_FORMAT = 1
+
+# the root of the checkout that holds the benchmarks package
+REPOSITORY_ROOT = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))
+)
+
+
+#------------------------------------------------------------------------------
+def current_commit():
+    """the git commit of the checkout holding the benchmarks, whatever the
+    current directory, or 'unknown' when it can't be found.  A tree with uncommitted changes gets a '-dirty' suffix so that its results
+    are not mistaken for those of the commit itself."""
+    try:
+        with open(os.devnull, 'w') as devnull:
+            commit = subprocess.check_output(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                stderr=devnull,
+                cwd=REPOSITORY_ROOT
+            ).decode('ascii').strip()
+            status = subprocess.check_output(
+                ['git', 'status', '--porcelain', '--untracked-files=no'],
+                stderr=devnull,
+                cwd=REPOSITORY_ROOT
+            )
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    if status.strip():
+        commit += '-dirty'
+    return commit
+
+
+#------------------------------------------------------------------------------
+def results_document(results, parameters, commit=None):
+    """wrap the results of the benchmarks with a description of the
+    environment in which they were run"""
+    return {
+        'format': RESULTS_FORMAT,
+        'commit': commit if commit is not None else current_commit(),
+        'configman_version': configman.__version__,
+        'python_version': platform.python_version(),
+        'python_implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'timestamp': datetime.datetime.utcnow().isoformat(),
+        'parameters': parameters,
+        'results': results,
+    }
+
+
+#------------------------------------------------------------------------------
+def save(document, pathname):
+    directory = os.path.dirname(pathname)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(pathname, 'w') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+
+
+#------------------------------------------------------------------------------
+def load(pathname):
+    with open(pathname) as f:
+        document = json.load(f)
+    if document.get('format') != RESULTS_FORMAT:
+        raise ValueError(
+            '%s is not in results format %d' % (pathname, RESULTS_FORMAT)
+        )
+    return document
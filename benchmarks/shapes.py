@@ -0,0 +1,163 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""This module generates synthetic trees of option definitions in the shapes
+that stress the different parts of configman:
+
+    flat - one namespace holding thousands of options
+    deep - namespaces nested many levels down
+    class_chains - class options whose classes require more class options,
+                   in the manner of demo/data_store.py, so that each link of
+                   a chain is brought in by another pass of the expansion
+    reference_values - many namespaces with options that take their values
+                       from a shared namespace with 'reference_value_from'
+
+Each shape is a function that takes a 'scale', a multiplier for the number of
+options, and returns a Namespace.
+"""
+from __future__ import absolute_import, division, print_function
+
+import sys
+
+from configman import Namespace, RequiredConfig
+from configman.converters import class_converter
+
+
+#------------------------------------------------------------------------------
+def _scaled(number, scale):
+    return max(1, int(number * scale))
+
+
+#------------------------------------------------------------------------------
+def flat(scale=1.0, number_of_options=10000):
+    n = Namespace()
+    for i in range(_scaled(number_of_options, scale)):
+        n.add_option(
+            'option_%05d' % i,
+            default=i,
+            doc='option number %d' % i
+        )
+    return n
+
+
+#------------------------------------------------------------------------------
+def deep(scale=1.0, depth=10, fan_out=2, options_per_namespace=5):
+    """a binary tree of namespaces, 10 levels down by default, with a few
+    options in each namespace.  The scale applies to the options per
+    namespace."""
+    options_per_namespace = _scaled(options_per_namespace, scale)
+
+    def populate(a_namespace, level):
+        for i in range(options_per_namespace):
+            a_namespace.add_option(
+                'option_%d' % i,
+                default='level %d' % level,
+                doc='an option at level %d' % level
+            )
+        if level < depth:
+            for i in range(fan_out):
+                populate(a_namespace.namespace('ns_%d' % i), level + 1)
+
+    n = Namespace()
+    populate(n, 1)
+    return n
+
+
+#------------------------------------------------------------------------------
+def _chain_class_name(chain, link):
+    return 'ChainLink_%d_%d' % (chain, link)
+
+
+#------------------------------------------------------------------------------
+def _make_chain_classes(number_of_chains, chain_length, options_per_link):
+    """create the classes of the chains as attributes of this module so that
+    the class options can refer to them by name, as they would in a real
+    application"""
+    this_module = sys.modules[__name__]
+    for chain in range(number_of_chains):
+        for link in range(chain_length):
+            class_name = _chain_class_name(chain, link)
+            if hasattr(this_module, class_name):
+                continue
+            required_config = Namespace()
+            for i in range(options_per_link):
+                required_config.add_option(
+                    'link_%d_option_%d' % (link, i),
+                    default=i,
+                    doc='an option of link %d' % link
+                )
+            if link + 1 < chain_length:
+                required_config.add_option(
+                    'link_%d_class' % (link + 1),
+                    default='%s.%s' % (
+                        __name__,
+                        _chain_class_name(chain, link + 1)
+                    ),
+                    from_string_converter=class_converter
+                )
+            setattr(
+                this_module,
+                class_name,
+                type(
+                    class_name,
+                    (RequiredConfig,),
+                    {
+                        'required_config': required_config,
+                        '__module__': __name__,
+                    }
+                )
+            )
+
+
+#------------------------------------------------------------------------------
+def class_chains(scale=1.0, number_of_chains=50, chain_length=10,
+                 options_per_link=5):
+    number_of_chains = _scaled(number_of_chains, scale)
+    _make_chain_classes(number_of_chains, chain_length, options_per_link)
+    n = Namespace()
+    for chain in range(number_of_chains):
+        n.namespace('chain_%d' % chain)
+        n['chain_%d' % chain].add_option(
+            'link_0_class',
+            default='%s.%s' % (__name__, _chain_class_name(chain, 0)),
+            from_string_converter=class_converter
+        )
+    return n
+
+
+#------------------------------------------------------------------------------
+def reference_values(scale=1.0, number_of_consumers=1000,
+                     number_of_resources=5):
+    """many consumer namespaces whose connection options refer to one of a
+    few shared resource namespaces"""
+    n = Namespace()
+    n.namespace('resource')
+    for resource in range(number_of_resources):
+        n.resource.namespace('db_%d' % resource)
+    for consumer in range(_scaled(number_of_consumers, scale)):
+        a_namespace = n.namespace('consumer_%d' % consumer)
+        reference = 'resource.db_%d' % (consumer % number_of_resources)
+        for name, default in (
+            ('hostname', 'localhost'),
+            ('port', 5432),
+            ('username', 'fred'),
+            ('password', 'secrets'),
+        ):
+            a_namespace.add_option(
+                name,
+                default=default,
+                doc='the %s' % name,
+                reference_value_from=reference
+            )
+        a_namespace.add_option('batch_size', default=100)
+    return n
+
+
+# shape name -> function
+SHAPES = {
+    'flat': flat,
+    'deep': deep,
+    'class_chains': class_chains,
+    'reference_values': reference_values,
+}
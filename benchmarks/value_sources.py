@@ -0,0 +1,350 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""This module measures how the value sources that read files scale with the
+size of the file:
+
+    python -m benchmarks.value_sources --output=value_sources.json
+
+For each handler and each number of keys (1k to 1M by default), a tree of
+option definitions is written to a file with the handler's 'write' method.
+The file is then read back to measure:
+
+    write - the handler writing the definitions to a file
+    parse - creating the ValueSource from the file.  This is where the ini,
+            json and conf handlers read and parse.  For Python modules, it is
+            the compiling and executing of the module and the copying of its
+            symbols into a DotDict.
+    get_values - the ValueSource returning its values as a DotDict.  This is
+                 not measured for Python modules, their ValueSource returns
+                 the DotDict that it built when it was created.
+
+The peak memory of parse and get_values together is measured separately from
+the timings with tracemalloc, when it is available.
+
+The handlers are:
+
+    for_configobj - ini files read with ConfigObjWithIncludes.  With an
+                    '--include-depth' of N, the file is split into a chain of
+                    N + 1 files, each including the next.
+    for_conf - flat .conf files
+    for_json - json files
+    for_modules - Python modules
+"""
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+import types
+
+import six
+
+from configman import Namespace
+from configman.dotdict import DotDict
+
+try:
+    import tracemalloc
+except ImportError:
+    # tracemalloc arrived in Python 3.4, peak memory will not be measured
+    tracemalloc = None
+
+from benchmarks import construction, results as results_file
+
+HANDLERS = ('for_configobj', 'for_conf', 'for_json', 'for_modules')
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+MEASUREMENTS = ('write', 'parse', 'get_values')
+
+
+#------------------------------------------------------------------------------
+def _handler_module(handler_name):
+    return importlib.import_module(
+        'configman.value_sources.%s' % handler_name
+    )
+
+
+#------------------------------------------------------------------------------
+def _measurements(handler_name):
+    if handler_name == 'for_modules':
+        # there is nothing to measure in its get_values
+        return ('write', 'parse')
+    return MEASUREMENTS
+
+
+#------------------------------------------------------------------------------
+def definitions(number_of_keys, keys_per_namespace=100, value_length=20):
+    """a Namespace of 'number_of_keys' options, spread across namespaces of
+    'keys_per_namespace' options.  The options are marked as likely to be
+    changed so that the writers don't comment them out."""
+    n = Namespace()
+    value = 'v' * value_length
+    for i in range(0, number_of_keys, keys_per_namespace):
+        a_namespace = n.namespace('namespace_%d' % (i // keys_per_namespace))
+        for j in range(i, min(i + keys_per_namespace, number_of_keys)):
+            a_namespace.add_option(
+                'key_%d' % j,
+                default=value,
+                doc='key number %d' % j,
+                likely_to_be_changed=True
+            )
+    return n
+
+
+#------------------------------------------------------------------------------
+def _split_with_includes(pathname, include_depth):
+    """split an ini file at its top level sections into a chain of
+    'include_depth' + 1 files, each ending by including the next"""
+    with open(pathname) as f:
+        lines = f.readlines()
+    section_starts = [
+        i for i, a_line in enumerate(lines)
+        if a_line.startswith('[') and not a_line.startswith('[[')
+    ]
+    number_of_files = include_depth + 1
+    boundaries = [0] + [
+        section_starts[len(section_starts) * i // number_of_files]
+        for i in range(1, number_of_files)
+    ] + [len(lines)]
+    base, extension = os.path.splitext(pathname)
+    file_names = [pathname] + [
+        '%s_%d%s' % (base, i, extension) for i in range(1, number_of_files)
+    ]
+    for i, a_file_name in enumerate(file_names):
+        with open(a_file_name, 'w') as f:
+            f.writelines(lines[boundaries[i]:boundaries[i + 1]])
+            if i + 1 < number_of_files:
+                print(
+                    '+include ./%s' % os.path.basename(file_names[i + 1]),
+                    file=f
+                )
+
+
+#------------------------------------------------------------------------------
+def _write(handler_name, the_definitions, pathname):
+    a_module = _handler_module(handler_name)
+    with open(pathname, 'w') as f:
+        a_module.ValueSource.write(the_definitions, output_stream=f)
+
+
+#------------------------------------------------------------------------------
+def _parse(handler_name, pathname):
+    value_source_class = _handler_module(handler_name).ValueSource
+    if handler_name == 'for_modules':
+        with open(pathname) as f:
+            code = compile(f.read(), pathname, 'exec')
+        a_module = types.ModuleType('values')
+        six.exec_(code, a_module.__dict__)
+        return value_source_class(a_module)
+    return value_source_class(pathname)
+
+
+#------------------------------------------------------------------------------
+def _get_values(a_value_source):
+    return a_value_source.get_values(None, True, DotDict)
+
+
+#------------------------------------------------------------------------------
+def _timed(function, *args):
+    start = timeit.default_timer()
+    result = function(*args)
+    return timeit.default_timer() - start, result
+
+
+#------------------------------------------------------------------------------
+def _peak_memory(handler_name, pathname):
+    if tracemalloc is None:
+        return None
+    tracemalloc.start()
+    try:
+        _get_values(_parse(handler_name, pathname))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+#------------------------------------------------------------------------------
+def run(handlers=HANDLERS, sizes=DEFAULT_SIZES, repeat=3, include_depth=0,
+        keys_per_namespace=100, value_length=20):
+    """return a list of the results of each measurement of each handler at
+    each size"""
+    working_directory = tempfile.mkdtemp(prefix='configman_benchmarks_')
+    try:
+        results = []
+        for number_of_keys in sizes:
+            the_definitions = definitions(
+                number_of_keys,
+                keys_per_namespace,
+                value_length
+            )
+            for handler_name in handlers:
+                pathname = os.path.join(
+                    working_directory,
+                    'values.%s' % (
+                        _handler_module(handler_name).file_name_extension
+                    )
+                )
+                measurements = _measurements(handler_name)
+                times = dict((x, []) for x in measurements)
+                for i in range(repeat):
+                    seconds = _timed(
+                        _write,
+                        handler_name,
+                        the_definitions,
+                        pathname
+                    )[0]
+                    times['write'].append(seconds)
+                    if handler_name == 'for_configobj' and include_depth:
+                        _split_with_includes(pathname, include_depth)
+                    seconds, a_value_source = _timed(
+                        _parse,
+                        handler_name,
+                        pathname
+                    )
+                    times['parse'].append(seconds)
+                    if 'get_values' in times:
+                        seconds = _timed(_get_values, a_value_source)[0]
+                        times['get_values'].append(seconds)
+                    del a_value_source
+                extra = {
+                    'handler': handler_name,
+                    'number_of_keys': number_of_keys,
+                    'file_bytes': sum(
+                        os.path.getsize(os.path.join(working_directory, x))
+                        for x in os.listdir(working_directory)
+                    ),
+                    'peak_memory_bytes': _peak_memory(handler_name, pathname),
+                    'include_depth': (
+                        include_depth if handler_name == 'for_configobj'
+                        else 0
+                    ),
+                    'value_length': value_length,
+                }
+                for measurement in measurements:
+                    results.append(construction.summarize(
+                        '%s.%d.%s' % (handler_name, number_of_keys, measurement),
+                        times[measurement],
+                        measurement=measurement,
+                        **extra
+                    ))
+                for a_file_name in os.listdir(working_directory):
+                    os.unlink(os.path.join(working_directory, a_file_name))
+            del the_definitions
+        return results
+    finally:
+        shutil.rmtree(working_directory, ignore_errors=True)
+
+
+#------------------------------------------------------------------------------
+def print_table(results, output_stream=sys.stdout):
+    line_format = '%-14s %8s %12s %12s %12s %12s %12s'
+    print(
+        line_format % (
+            'handler', 'keys', 'bytes', 'write', 'parse', 'get_values',
+            'peak memory'
+        ),
+        file=output_stream
+    )
+    by_name = dict((x['name'], x) for x in results)
+    for a_result in results:
+        if a_result['measurement'] != 'write':
+            continue
+        prefix = a_result['name'][:-len('write')]
+        get_values = by_name.get(prefix + 'get_values')
+        peak = a_result['peak_memory_bytes']
+        print(
+            line_format % (
+                a_result['handler'],
+                a_result['number_of_keys'],
+                a_result['file_bytes'],
+                '%.6f' % by_name[prefix + 'write']['median'],
+                '%.6f' % by_name[prefix + 'parse']['median'],
+                '-' if get_values is None else '%.6f' % get_values['median'],
+                '-' if peak is None else peak,
+            ),
+            file=output_stream
+        )
+
+
+#------------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.value_sources',
+        description='measure the value sources reading and writing files'
+    )
+    parser.add_argument(
+        '--handler',
+        action='append',
+        choices=HANDLERS,
+        help='a handler to measure, may be repeated (default: all of them)'
+    )
+    parser.add_argument(
+        '--sizes',
+        default=','.join(str(x) for x in DEFAULT_SIZES),
+        help='a comma delimited list of the numbers of keys'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='the number of timings of each measurement'
+    )
+    parser.add_argument(
+        '--include-depth',
+        type=int,
+        default=0,
+        help='the length of the chain of included ini files'
+    )
+    parser.add_argument(
+        '--keys-per-namespace',
+        type=int,
+        default=100,
+        help='the number of keys in each namespace or ini section'
+    )
+    parser.add_argument(
+        '--value-length',
+        type=int,
+        default=20,
+        help='the number of characters in each value'
+    )
+    parser.add_argument(
+        '--output',
+        default='value_source_results.json',
+        help='the pathname of the json results file'
+    )
+    arguments = parser.parse_args(argv)
+
+    handlers = arguments.handler or HANDLERS
+    sizes = [int(x) for x in arguments.sizes.split(',') if x.strip()]
+    results = run(
+        handlers,
+        sizes,
+        arguments.repeat,
+        arguments.include_depth,
+        arguments.keys_per_namespace,
+        arguments.value_length
+    )
+    print_table(results)
+    results_file.save(
+        results_file.results_document(
+            results,
+            {
+                'suite': 'value_sources',
+                'handlers': list(handlers),
+                'sizes': sizes,
+                'repeat': arguments.repeat,
+                'include_depth': arguments.include_depth,
+                'keys_per_namespace': arguments.keys_per_namespace,
+                'value_length': arguments.value_length,
+            }
+        ),
+        arguments.output
+    )
+
+
+if __name__ == '__main__':
+    main()
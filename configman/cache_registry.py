@@ -0,0 +1,170 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""This module keeps a registry of the caches within configman, so that
+their footprint can be seen and so that they can all be cleared at once,
+for example after the files behind a configuration have been reloaded.
+
+Every function decorated with 'configman.memoize.memoize' registers itself.
+Any other cache can join with 'register', it must offer:
+
+    cache_info() - a CacheInfo, see 'configman.memoize'
+    cache_clear() - empty the cache
+    cache_bytes() - (optional) the approximate size of the cache in bytes
+
+The registry holds its caches with weak references, a cache that is no
+longer used elsewhere leaves the registry by itself.
+"""
+from __future__ import absolute_import, division, print_function
+
+import atexit
+import sys
+import threading
+import weakref
+
+# a lock for the list of registered caches
+_lock = threading.Lock()
+# tuples of (name, weakref to a cache) in the order of registration
+_registered_caches = []
+# True once the report has been arranged for the exit of the program
+_reporting_at_exit = False
+
+
+#------------------------------------------------------------------------------
+def register(a_cache, name=None):
+    """add a cache to the registry.  The name defaults to the qualified name
+    of the cache, the caches of the same name are reported together."""
+    if name is None:
+        name = '%s.%s' % (
+            getattr(a_cache, '__module__', None) or '?',
+            getattr(
+                a_cache,
+                '__qualname__',
+                getattr(a_cache, '__name__', a_cache.__class__.__name__)
+            )
+        )
+    with _lock:
+        _registered_caches.append((name, weakref.ref(a_cache)))
+
+
+#------------------------------------------------------------------------------
+def caches():
+    """return a list of the tuples (name, cache) of the live caches"""
+    live_caches = []
+    with _lock:
+        for name, a_reference in list(_registered_caches):
+            a_cache = a_reference()
+            if a_cache is None:
+                _registered_caches.remove((name, a_reference))
+            else:
+                live_caches.append((name, a_cache))
+    return live_caches
+
+
+#------------------------------------------------------------------------------
+def statistics():
+    """return a list of dicts, one for each name of cache, of the number of
+    caches of the name and the sums of their hits, misses, evictions, sizes
+    and bytes.  The bytes are an approximation, the values are not followed
+    beyond their own size."""
+    by_name = {}
+    names = []
+    for name, a_cache in caches():
+        info = a_cache.cache_info()
+        try:
+            cache_bytes = a_cache.cache_bytes()
+        except AttributeError:
+            cache_bytes = 0
+        try:
+            row = by_name[name]
+        except KeyError:
+            row = by_name[name] = {
+                'name': name,
+                'caches': 0,
+                'hits': 0,
+                'misses': 0,
+                'evictions': 0,
+                'size': 0,
+                'bytes': 0,
+            }
+            names.append(name)
+        row['caches'] += 1
+        row['hits'] += info.hits
+        row['misses'] += info.misses
+        row['evictions'] += info.evictions
+        row['size'] += info.size
+        row['bytes'] += cache_bytes
+    return [by_name[x] for x in names]
+
+
+#------------------------------------------------------------------------------
+def totals():
+    """return a dict of the hits, misses, evictions, sizes and bytes of all
+    the caches added together"""
+    return _add_up(statistics())
+
+
+#------------------------------------------------------------------------------
+def _add_up(rows):
+    result = dict(
+        (x, 0)
+        for x in ('caches', 'hits', 'misses', 'evictions', 'size', 'bytes')
+    )
+    for row in rows:
+        for key in result:
+            result[key] += row[key]
+    return result
+
+
+#------------------------------------------------------------------------------
+def clear_all():
+    """empty every registered cache"""
+    for name, a_cache in caches():
+        a_cache.cache_clear()
+
+
+#------------------------------------------------------------------------------
+def report(output_stream=None):
+    """write a table of the statistics of the caches, the largest first"""
+    if output_stream is None:
+        output_stream = sys.stderr
+    rows = statistics()
+    the_totals = _add_up(rows)
+    the_totals['name'] = 'total'
+    rows.sort(key=lambda x: (-x['bytes'], x['name']))
+    name_width = max([len(x['name']) for x in rows] + [len('cache')])
+    line_format = '%-*s %7s %10s %10s %10s %10s %12s'
+    print(
+        line_format % (
+            name_width, 'cache', 'caches', 'hits', 'misses', 'evictions',
+            'size', 'bytes'
+        ),
+        file=output_stream
+    )
+    for row in rows + [the_totals]:
+        print(
+            line_format % (
+                name_width,
+                row['name'],
+                row['caches'],
+                row['hits'],
+                row['misses'],
+                row['evictions'],
+                row['size'],
+                row['bytes'],
+            ),
+            file=output_stream
+        )
+
+
+#------------------------------------------------------------------------------
+def report_at_exit():
+    """arrange for the report to be written when the program exits, just
+    once no matter how many times this is called"""
+    global _reporting_at_exit
+    with _lock:
+        if _reporting_at_exit:
+            return
+        _reporting_at_exit = True
+    atexit.register(report)
@@ -11,6 +11,7 @@ import inspect
 import os.path
 import contextlib
 import functools
+import signal
 import warnings
 
 #==============================================================================
@@ -22,7 +23,9 @@ from configman.commandline import (
 )
 from configman.converters import (
     to_string_converters,
-    to_str
+    to_str,
+    str_to_python_object,
+    ChoiceConverter,
 )
 from configman.config_exceptions import (
     NotAnOptionError,
@@ -33,9 +36,13 @@ from configman.config_file_future_proxy import (
 from configman.def_sources import (
     setup_definitions,
 )
+from configman.diff import (
+    diff
+)
 from configman.dotdict import (
     DotDict,
     DotDictWithAcquisition,
+    iteritems_breadth_first,
 )
 from configman.environment import (
     environment
@@ -47,6 +54,7 @@ from configman.option import (
     Option,
     Aggregation
 )
+from configman.suffix_index import SuffixIndex
 
 # RequiredConfig is not used directly in this file, but made available as
 # a type to be imported from this module
@@ -54,12 +62,23 @@ from configman.required_config import (
     RequiredConfig
 )
 from configman.value_sources import (
+    admin_values_from_commandline,
     config_filename_from_commandline,
     wrap_with_value_source_api,
     dispatch_request_to_write,
     file_extension_dispatch,
     type_handler_dispatch
 )
+from configman.value_sources.merged_values import MergedValueSources
+from configman.value_sources import for_configobj
+from configman.startup_cache import StartupCache, UncacheableError
+from configman.source_files import stat_signature
+from configman import profiler
+from configman.profiler import Profiler
+from configman.preimport import preimport
+from configman.manifest import Manifest
+from configman import lazy_import
+from configman import cache_registry
 
 
 #==============================================================================
@@ -82,6 +101,13 @@ class ConfigurationManager(object):
         config_pathname='.',
         config_optional=True,
         value_source_object_hook=DotDict,
+        use_worklist_expansion=False,
+        startup_cache_pathname=None,
+        plan=None,
+        profile=None,
+        cache_report=None,
+        parallel_imports=0,
+        manifest=None,
     ):
         """create and initialize a configman object.
 
@@ -129,8 +155,65 @@ class ConfigurationManager(object):
                                      representation of a value source.
                                      This is used to enable any special
                                      processing, like key translations.
+          use_worklist_expansion - if True, the overlay/expansion phase only
+                                   revisits the options brought in by the
+                                   previous expansion rather than walking the
+                                   whole tree of options on each pass.  The
+                                   results are the same, but large nested
+                                   configurations start faster.
+          startup_cache_pathname - (optional) the pathname of a file in which
+                                   to save the resolved option definitions.
+                                   If nothing that went into their resolution
+                                   has changed, the next start loads them from
+                                   this file rather than resolving them again.
+                                   See the module 'startup_cache'.
+          plan - (optional) a ConfigurationPlan.  If given, the
+                 definition_source is ignored and the resolution starts from
+                 the option definitions already expanded by the plan.  See
+                 the module 'plan'.
+          profile - if True or one of the formats 'text' or 'json', record
+                    the time spent in each phase of the work of configman and
+                    write a report of it to stderr at the end of construction.
+                    Unless it is None, the default, this is the default of
+                    'admin.profile', which can turn the profile on or off and
+                    change its format; False offers the option with the
+                    profile off.  Profiling must be turned on by this
+                    parameter or the command line, it starts before the other
+                    value sources are read.  The report remains available
+                    from the 'profiler' attribute, the phases of get_config
+                    are recorded there after the report has been written.
+                    See the module 'profiler'.
+          cache_report - if True or 'startup', write a table of the
+                         statistics of configman's caches to stderr at the
+                         end of construction.  If 'exit', write it when the
+                         program exits.  Unless it is None, the default,
+                         this is the default of 'admin.cache_report', which
+                         can be set by any of the value sources; False
+                         offers the option with the report off.  See the
+                         module 'cache_registry'.
+          parallel_imports - the number of threads with which to import the
+                             modules named by the class options of the
+                             definitions, and of each pass of the
+                             overlay/expansion, before they are converted.
+                             0, the default, leaves each module to be
+                             imported in turn by the conversion of its
+                             option.  See the module 'preimport'.
+          manifest - a Manifest, or the pathname of a manifest file, of the
+                     required config of classes.  A class option that names
+                     a class in the manifest is expanded from the manifest
+                     and its value is a LazyImport that imports the class
+                     when it is used.  See the module 'manifest'.
                             """
 
+        if profile is True:
+            profile = 'text'
+        if cache_report is True:
+            cache_report = 'startup'
+        if profile:
+            self.profiler = Profiler()
+        else:
+            self.profiler = None
+
         # instead of allowing mutables as default keyword argument values...
         if definition_source is None:
             definition_source_list = []
@@ -157,6 +240,11 @@ class ConfigurationManager(object):
         self.use_auto_help = use_auto_help
 
         self.value_source_object_hook = value_source_object_hook
+        self.use_worklist_expansion = use_worklist_expansion
+        self.parallel_imports = parallel_imports
+        if isinstance(manifest, (six.binary_type, six.text_type)):
+            manifest = Manifest.load(to_str(manifest))
+        self.manifest = manifest
 
         self.app_name = app_name
         self.app_version = app_version
@@ -166,9 +254,34 @@ class ConfigurationManager(object):
                         # will be stored here.
 
         self._config = None  # eventual container for DOM-like config object
-
-        self.option_definitions = Namespace()
-        self.definition_source_list = definition_source_list
+        # the values fetched from each of the value sources on the final pass
+        # of the overlay/expansion phase
+        self._values_from_final_pass = None
+        self._merged_values_from_final_pass = None
+        # the state of the resolution of the options.  It is kept so that a
+        # reload can re-resolve just the options affected by the value sources
+        # that changed.
+        self._definition_defaults = {}
+        self._all_reference_values = {}
+        self._finished_keys = set()
+        # index of a wrapped value source -> (pathname, file signature) for
+        # the value sources that were read from files
+        self._value_source_files = {}
+        self._reload_subscribers = []
+        self._reload_requested = False
+
+        self._plan = plan
+        if plan is None:
+            self.option_definitions = Namespace()
+            self.definition_source_list = definition_source_list
+        else:
+            # the plan's definitions are never changed, the resolution works
+            # on a copy of them
+            self.option_definitions = plan.option_definitions.safe_copy()
+            self.definition_source_list = []
+        # the qualified keys, like 'a.b.c', are looked up over and over again
+        # during the resolution
+        self.option_definitions.enable_key_index()
 
         command_line_value_source = command_line
         if values_source_list is None:
@@ -221,50 +334,111 @@ class ConfigurationManager(object):
             'admin.print_conf',
             'admin.strict',
             'admin.expose_secrets',
+            'admin.startup_cache',
+            'admin.profile',
+            'admin.cache_report',
         ]
         self.options_banned_from_help = options_banned_from_help
 
         if use_admin_controls:
-            admin_options = self._setup_admin_options(values_source_list)
+            admin_options = self._setup_admin_options(
+                values_source_list,
+                startup_cache_pathname,
+                profile,
+                cache_report
+            )
             self.definition_source_list.append(admin_options)
 
+        if self.parallel_imports:
+            # the class options of the definitions are converted as they
+            # are set up
+            self._preimport_class_options(
+                [
+                    an_option
+                    for a_source in self.definition_source_list
+                    if isinstance(a_source, collections.Mapping)
+                    for key, an_option in iteritems_breadth_first(a_source)
+                ],
+                'setup_definitions preimport'
+            )
+
         # iterate through the option definitions to create the nested dict
         # hierarchy of all the options called 'option_definitions'
-        for a_definition_source in self.definition_source_list:
-            try:
-                safe_copy_of_def_source = a_definition_source.safe_copy()
-            except AttributeError:
-                # apparently, the definition source was not in the form of a
-                # Namespace object.  This isn't a show stopper, but we don't
-                # know how to make a copy of this object safely: we know from
-                # experience that the stock copy.copy method leads to grief
-                # as many sub-objects within an option definition source can
-                # not be copied that way (classes, for example).
-                # The only action we can take is to trust and continue with the
-                # original copy of the definition source.
-                safe_copy_of_def_source = a_definition_source
-            setup_definitions(
-                safe_copy_of_def_source,
-                self.option_definitions
+        with self._profile_phase('setup_definitions'):
+            self._setup_option_definitions(
+                self.definition_source_list,
+                self.option_definitions,
+                self.manifest
             )
 
         if use_admin_controls:
             # the name of the config file needs to be loaded from the command
             # line prior to processing the rest of the command line options.
-            config_filename = config_filename_from_commandline(self)
+            admin_values = admin_values_from_commandline(self)
+            config_filename = config_filename_from_commandline(
+                self,
+                admin_values
+            )
             if (
                 config_filename
                 and ConfigFileFutureProxy in values_source_list
             ):
                 self.option_definitions.admin.conf.default = config_filename
-
-        self.values_source_list = wrap_with_value_source_api(
-            values_source_list,
-            self
-        )
-
-        known_keys = self._overlay_expand()
-        self._check_for_mismatches(known_keys)
+            startup_cache_pathname = self._preliminary_admin_value(
+                admin_values,
+                'admin.startup_cache',
+                startup_cache_pathname
+            )
+            profile = self._preliminary_admin_value(
+                admin_values,
+                'admin.profile',
+                profile
+            )
+            if profile and self.profiler is None:
+                # turned on from the command line, the phases from here on
+                # are recorded
+                self.profiler = Profiler()
+
+        with self._profile_phase('wrap_with_value_source_api'):
+            self._wrap_value_sources(values_source_list)
+
+        startup_cache = None
+        snapshot = None
+        if startup_cache_pathname:
+            startup_cache = StartupCache(startup_cache_pathname)
+            try:
+                fingerprint = startup_cache.fingerprint(
+                    self,
+                    values_source_list
+                )
+                snapshot = startup_cache.load(fingerprint, values_source_list)
+            except UncacheableError:
+                startup_cache = None
+        if snapshot is not None:
+            # nothing that went into the resolution of the option definitions
+            # has changed since the snapshot was saved.
+            self.option_definitions = snapshot['option_definitions']
+            self.option_definitions.enable_key_index()
+            self.args = snapshot['args']
+            self._definition_defaults = snapshot['definition_defaults']
+            self._all_reference_values = snapshot['all_reference_values']
+            self._finished_keys = set(snapshot['known_keys'])
+        else:
+            if plan is None:
+                known_keys = self._overlay_expand()
+            else:
+                known_keys = self._overlay_expand_from_plan()
+            with self._profile_phase('_check_for_mismatches'):
+                unmatched_keys = self._check_for_mismatches(known_keys)
+            if startup_cache is not None and not unmatched_keys:
+                # a resolution that produced warnings is not saved, so that
+                # the warnings are repeated on the next start
+                startup_cache.save(
+                    self,
+                    values_source_list,
+                    fingerprint,
+                    known_keys
+                )
 
         # the app_name, app_version and app_description are to come from
         # if 'application' option if it is present. If it is not present,
@@ -312,30 +486,219 @@ class ConfigurationManager(object):
             self.dump_conf()
             admin_tasks_done = True
 
+        if use_admin_controls:
+            # the final values from all of the value sources
+            if profile is not None:
+                profile = self._get_option('admin.profile').value
+            if cache_report is not None:
+                cache_report = self._get_option('admin.cache_report').value
+
+        if self.profiler is not None and profile:
+            self.profiler.report(profile)
+
+        if cache_report == 'exit':
+            cache_registry.report_at_exit()
+        elif cache_report == 'startup':
+            cache_registry.report()
+
         if quit_after_admin and admin_tasks_done:
             sys.exit()
 
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _setup_option_definitions(
+        definition_source_list,
+        option_definitions,
+        manifest=None
+    ):
+        """copy the definitions from each of the definition sources into the
+        nested hierarchy of Namespaces and Options 'option_definitions'.  A
+        class known from the manifest isn't imported, see 'lazy_import'."""
+        for a_definition_source in definition_source_list:
+            try:
+                safe_copy_of_def_source = a_definition_source.safe_copy()
+            except AttributeError:
+                # apparently, the definition source was not in the form of a
+                # Namespace object.  This isn't a show stopper, but we don't
+                # know how to make a copy of this object safely: we know from
+                # experience that the stock copy.copy method leads to grief
+                # as many sub-objects within an option definition source can
+                # not be copied that way (classes, for example).
+                # The only action we can take is to trust and continue with the
+                # original copy of the definition source.
+                safe_copy_of_def_source = a_definition_source
+            setup_definitions(
+                safe_copy_of_def_source,
+                option_definitions,
+                manifest
+            )
+        return option_definitions
+
     #--------------------------------------------------------------------------
     @contextlib.contextmanager
-    def context(self, mapping_class=DotDictWithAcquisition):
+    def context(
+        self,
+        mapping_class=DotDictWithAcquisition,
+        flatten_acquisition=False
+    ):
         """return a config as a context that calls close on every item when
         it goes out of scope"""
         config = None
         try:
-            config = self.get_config(mapping_class=mapping_class)
+            config = self.get_config(
+                mapping_class=mapping_class,
+                flatten_acquisition=flatten_acquisition
+            )
             yield config
         finally:
             if config:
                 self._walk_and_close(config)
 
     #--------------------------------------------------------------------------
-    def get_config(self, mapping_class=DotDictWithAcquisition):
+    def get_config(
+        self,
+        mapping_class=DotDictWithAcquisition,
+        flatten_acquisition=False
+    ):
+        """return a new config, a tree of mappings of the values of the
+        options.
+
+        parameters:
+            mapping_class - the class of mapping to use for the config
+            flatten_acquisition - if True and the mapping class acquires
+                                  values from its parents, the config
+                                  remembers where each acquired value was
+                                  found, so that reading it again doesn't
+                                  climb through the parents
+
+        An immutable mapping class, like FrozenDotDict, names the class to
+        build the config with as its 'mutable_counterpart'.  The config is
+        frozen once it is complete."""
+        frozen_mapping_class = None
+        if hasattr(mapping_class, 'mutable_counterpart'):
+            frozen_mapping_class = mapping_class
+            mapping_class = mapping_class.mutable_counterpart
         config = self._generate_config(mapping_class)
-        if self._aggregate(self.option_definitions, config, config):
+        with self._profile_phase('get_config aggregation'):
+            aggregates_found = self._aggregate(
+                self.option_definitions,
+                config,
+                config
+            )
+        if aggregates_found:
             # state changed, must regenerate
-            return self._generate_config(mapping_class)
-        else:
-            return config
+            config = self._generate_config(mapping_class)
+        if flatten_acquisition and isinstance(config, DotDictWithAcquisition):
+            config.flatten_acquisition()
+        if frozen_mapping_class is not None:
+            config = frozen_mapping_class.freeze(config)
+        return config
+
+    #--------------------------------------------------------------------------
+    def reload(self, mapping_class=DotDictWithAcquisition, force=False):
+        """re-read the value sources that were read from files that have
+        changed since and re-resolve just the options whose values changed.
+        The files included by ini files are watched along with them.  Only
+        files that existed when the value sources were first read are
+        watched: a config file that was missing then, and so contributed no
+        value source, is not read by a reload even once it exists.
+        Options brought in by the expansion of a class that is replaced by
+        the reload are left in place.  The subscribers to the namespaces
+        of the changed options are notified.
+
+        parameters:
+            mapping_class - the class of mapping to use for the new config
+            force - if True, re-read all the value sources read from files
+                    whether or not their files appear to have changed
+
+        returns:
+            a tuple of the new config and a mapping of the names of the
+            options that changed to tuples of their old and new values"""
+        changed_indexes = self._find_changed_value_sources(force)
+        changes = {}
+        if changed_indexes:
+            # all the files are read before anything is replaced so that a
+            # file that cannot be read leaves the configuration untouched
+            new_value_sources = dict(
+                (index, self._wrap_value_sources_from_file(index))
+                for index in changed_indexes
+            )
+            old_definitions = self.option_definitions.safe_copy()
+            # a reload that fails, in strict mode by a mismatch, leaves the
+            # configuration as it was before the reload
+            previous_state = self._get_reload_state()
+            try:
+                for index, (a_value_source, signature) in six.iteritems(
+                    new_value_sources
+                ):
+                    self.values_source_list[index] = a_value_source
+                    pathname = self._value_source_files[index][0]
+                    self._value_source_files[index] = (pathname, signature)
+                self._overlay_expand_changed_values()
+                self._check_for_mismatches(self._finished_keys)
+            except Exception:
+                self._restore_reload_state(previous_state)
+                raise
+            # options are never taken out by a reload, they may be added.
+            # the copied aggregations have no values, so they are skipped
+            added, removed, changed = diff(
+                old_definitions,
+                self.option_definitions
+            )
+            for key in added + changed:
+                an_option = self.option_definitions[key]
+                if not isinstance(an_option, Option):
+                    continue
+                try:
+                    old_value = old_definitions[key].value
+                except KeyError:
+                    old_value = None
+                changes[key] = (old_value, an_option.value)
+        new_config = self.get_config(mapping_class)
+        if changes:
+            self._notify_reload_subscribers(new_config, changes)
+        return new_config, changes
+
+    #--------------------------------------------------------------------------
+    def poll_for_reload(self, mapping_class=DotDictWithAcquisition):
+        """reload if the files of any of the value sources have changed or if
+        a reload has been requested by a signal.  This is meant to be called
+        periodically from the main loop of a long running application.
+
+        returns:
+            None if there was no reload, otherwise the same tuple as the
+            'reload' method"""
+        force = self._reload_requested
+        self._reload_requested = False
+        if not force and not self._find_changed_value_sources():
+            return None
+        return self.reload(mapping_class, force=force)
+
+    #--------------------------------------------------------------------------
+    def install_reload_signal_handler(self, signal_number=None):
+        """arrange for a signal, SIGHUP by default, to request a reload.  The
+        reload itself happens on the next call to 'poll_for_reload' as it is
+        not safe to do that work within a signal handler."""
+        if signal_number is None:
+            signal_number = signal.SIGHUP
+
+        def request_reload(signal_number, frame):
+            self._reload_requested = True
+
+        signal.signal(signal_number, request_reload)
+
+    #--------------------------------------------------------------------------
+    def subscribe(self, namespace, callback):
+        """register a callback to be called when a reload changes any option
+        within a namespace.  The callback is called with the new config and a
+        mapping of the names of the options that changed within the namespace
+        to tuples of their old and new values.
+
+        parameters:
+            namespace - the qualified name of a namespace or an option, use
+                        '' for all the options
+            callback - a function of two parameters"""
+        self._reload_subscribers.append((namespace, callback))
 
     #--------------------------------------------------------------------------
     def output_summary(self, output_stream=sys.stdout):
@@ -371,6 +734,7 @@ class ConfigurationManager(object):
                 elif (
                     inspect.isclass(an_option.value)
                     or inspect.ismodule(an_option.value)
+                    or isinstance(an_option.value, lazy_import.LazyImport)
                 ):
                     # this is already set and it could have expanded, most
                     # likely this is a case where a sub-command has been
@@ -562,10 +926,24 @@ class ConfigurationManager(object):
                 if isinstance(self.option_definitions[x], Option)]
 
     #--------------------------------------------------------------------------
-    def _create_reference_value_options(self, keys, finished_keys):
+    def _create_reference_value_options(
+        self,
+        keys,
+        finished_keys,
+        known_option_keys=None
+    ):
         """this method steps through the option definitions looking for
         alt paths.  On finding one, it creates the 'reference_value_from' links
-        within the option definitions and populates it with copied options."""
+        within the option definitions and populates it with copied options.
+
+        parameters:
+            keys - the option names to examine
+            finished_keys - option names that have already been expanded
+            known_option_keys - (optional) a container of the names of all
+                                the existing options.  When not given,
+                                'keys' must list every existing option."""
+        if known_option_keys is None:
+            known_option_keys = keys
         # a set of known reference_value_from_links
         set_of_reference_value_option_names = set()
         for key in keys:
@@ -578,7 +956,7 @@ class ConfigurationManager(object):
                     an_option.reference_value_from,
                     an_option.name
                 ))
-                if fully_qualified_reference_name in keys:
+                if fully_qualified_reference_name in known_option_keys:
                     continue  # this referenced value has already been defined
                               # no need to repeat it - skip on to the next key
                 reference_option = an_option.copy()
@@ -602,6 +980,388 @@ class ConfigurationManager(object):
 
         return set_of_reference_value_option_names
 
+    #--------------------------------------------------------------------------
+    def _get_values_from_all_sources(self):
+        """fetch the current values from each of the value sources.  Previous
+        versions of the overlay pulled the values from the values sources
+        deeper within nested loops.  That was not necessary and caused a lot
+        of redundant work."""
+        if self.profiler is None:
+            return [
+                a_value_source.get_values(
+                    self,  # pass in the config_manager itself
+                    True,  # ignore mismatches
+                    self.value_source_object_hook  # build with this class
+                )
+                for a_value_source in self.values_source_list
+            ]
+        values_from_all_sources = []
+        for index, a_value_source in enumerate(self.values_source_list):
+            with self._profile_phase('get_values[%d] %s' % (
+                index,
+                type(a_value_source).__module__.rsplit('.', 1)[-1]
+            )):
+                values_from_all_sources.append(a_value_source.get_values(
+                    self,
+                    True,
+                    self.value_source_object_hook
+                ))
+        return values_from_all_sources
+
+    #--------------------------------------------------------------------------
+    @contextlib.contextmanager
+    def _profile_phase(self, name):
+        """a context manager that records a phase with the profiler, if
+        there is one"""
+        with profiler.phase(self.profiler, name):
+            yield
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _value_source_file_signature(pathname):
+        """return the stat signatures of the file of a value source and of
+        the files that it includes, or None if the file is missing"""
+        signature = stat_signature(pathname)
+        if signature == 'missing':
+            return None
+        signatures = [signature]
+        if pathname.endswith(for_configobj.file_name_extension):
+            try:
+                included_pathnames = for_configobj.included_files(pathname)
+            except (OSError, IOError):
+                # gone since the stat, the next poll will see it
+                return None
+            signatures.extend(
+                (included_pathname, stat_signature(included_pathname))
+                for included_pathname in included_pathnames
+            )
+        return tuple(signatures)
+
+    #--------------------------------------------------------------------------
+    def _wrap_value_sources(self, values_source_list):
+        """wrap each of the value sources with the value source api, noting
+        which of them were read from files so that they can be reloaded"""
+        self.values_source_list = []
+        self._value_source_files = {}
+        for a_source in values_source_list:
+            pathname = a_source
+            if pathname is ConfigFileFutureProxy:
+                pathname = self._get_option('admin.conf').default
+            if isinstance(pathname, (six.binary_type, six.text_type)):
+                pathname = to_str(pathname)
+                # the file is examined before it is read so that a change
+                # made while it is being read is seen by the next poll
+                signature = self._value_source_file_signature(pathname)
+            else:
+                signature = None
+            wrapped_sources = wrap_with_value_source_api([a_source], self)
+            if wrapped_sources and signature is not None:
+                self._value_source_files[len(self.values_source_list)] = (
+                    pathname,
+                    signature
+                )
+            self.values_source_list.extend(wrapped_sources)
+
+    #--------------------------------------------------------------------------
+    def _wrap_value_sources_from_file(self, index):
+        """read the file of a value source again returning a tuple of the
+        new value source and the signature of the file"""
+        pathname = self._value_source_files[index][0]
+        signature = self._value_source_file_signature(pathname)
+        return wrap_with_value_source_api([pathname], self)[0], signature
+
+    #--------------------------------------------------------------------------
+    def _find_changed_value_sources(self, force=False):
+        """return the indexes of the value sources read from files that have
+        changed.  A file that has gone missing is ignored, it may be in the
+        process of being replaced."""
+        changed_indexes = []
+        for index, (pathname, signature) in sorted(
+            six.iteritems(self._value_source_files)
+        ):
+            new_signature = self._value_source_file_signature(pathname)
+            if new_signature is None:
+                continue
+            if force or new_signature != signature:
+                changed_indexes.append(index)
+        return changed_indexes
+
+    #--------------------------------------------------------------------------
+    def _get_reload_state(self):
+        """return what a reload may change: the keys of the option
+        definitions, the attributes of each Option and the bookkeeping of the
+        overlay/expansion"""
+        return {
+            'keys': set(
+                self.option_definitions.keys_breadth_first(include_dicts=True)
+            ),
+            'options': [
+                (an_option, dict(an_option.__dict__))
+                for key, an_option in iteritems_breadth_first(
+                    self.option_definitions
+                )
+                if isinstance(an_option, Option)
+            ],
+            'values_source_list': list(self.values_source_list),
+            'value_source_files': dict(self._value_source_files),
+            'finished_keys': set(self._finished_keys),
+            'all_reference_values': dict(
+                (key, list(referencing_keys))
+                for key, referencing_keys in six.iteritems(
+                    self._all_reference_values
+                )
+            ),
+            'definition_defaults': dict(self._definition_defaults),
+            'values_from_final_pass': self._values_from_final_pass,
+            'merged_values_from_final_pass':
+                self._merged_values_from_final_pass,
+        }
+
+    #--------------------------------------------------------------------------
+    def _restore_reload_state(self, state):
+        """put back the state returned by '_get_reload_state'.  The options
+        brought in by expansion since are removed."""
+        for key in list(self.option_definitions.keys_breadth_first(
+            include_dicts=True
+        )):
+            parent_key = key.rpartition('.')[0]
+            if key not in state['keys'] and (
+                not parent_key or parent_key in state['keys']
+            ):
+                del self.option_definitions[key]
+        for an_option, attributes in state['options']:
+            an_option.__dict__.clear()
+            an_option.__dict__.update(attributes)
+        self.values_source_list[:] = state['values_source_list']
+        self._value_source_files = state['value_source_files']
+        self._finished_keys = state['finished_keys']
+        self._all_reference_values = state['all_reference_values']
+        self._definition_defaults = state['definition_defaults']
+        self._values_from_final_pass = state['values_from_final_pass']
+        self._merged_values_from_final_pass = \
+            state['merged_values_from_final_pass']
+
+    #--------------------------------------------------------------------------
+    def _notify_reload_subscribers(self, new_config, changes):
+        for namespace, callback in self._reload_subscribers:
+            if namespace:
+                prefix = namespace + '.'
+                changes_for_namespace = dict(
+                    (key, a_change)
+                    for key, a_change in six.iteritems(changes)
+                    if key == namespace or key.startswith(prefix)
+                )
+            else:
+                changes_for_namespace = changes
+            if changes_for_namespace:
+                callback(new_config, changes_for_namespace)
+
+    #--------------------------------------------------------------------------
+    def _overlay_option(
+        self,
+        key,
+        merged_values,
+        all_reference_values,
+        finished_keys
+    ):
+        """copy the value for a single option from the merged value sources
+        into the 'default' member of the option.  Options that take their
+        value from a referenced option get that default first.
+
+        returns:
+            a list of the names of options that had already been finished, but
+            must be overlaid again because they refer to this option"""
+        reopened_keys = []
+        an_option = self.option_definitions[key]
+        # an option overlaid again starts over from its defined default
+        try:
+            an_option.default = self._definition_defaults[key]
+        except KeyError:
+            self._definition_defaults[key] = an_option.default
+        if an_option.reference_value_from:
+            reference_value_from = an_option.reference_value_from
+            top_key = key.split('.')[-1]
+            an_option.default = (
+                self.option_definitions[reference_value_from][top_key].default
+            )
+            all_reference_values[
+                '.'.join((reference_value_from, top_key))
+            ].append(
+                key
+            )
+
+        if key in all_reference_values:
+            # make sure that this value gets propagated to keys
+            # even if the keys have already been overlaid
+            reopened_keys.extend(
+                self._reopen_keys(all_reference_values[key], finished_keys)
+            )
+
+        # find the value from the value source with the highest precedence
+        # that has a value for this key.  This may come via acquisition, so
+        # the key given may not have been an exact match for what was
+        # returned.
+        try:
+            new_default, index = merged_values.lookup(key)
+        except KeyError:
+            pass  # okay, none of the sources have this value
+        else:
+            # an option has changed if its value differs from the value
+            # that it had before the last value source that offers it
+            try:
+                previous_default = merged_values.lookup(key, below=index)[0]
+            except KeyError:
+                previous_default = an_option.default
+            # overlay the default with the new value from the value source.
+            an_option.has_changed = previous_default != new_default
+            an_option.default = new_default
+            if key in all_reference_values:
+                # make sure that this value gets propagated to keys
+                # even if the keys have already been overlaid
+                reopened_keys.extend(self._reopen_keys(
+                    all_reference_values[key],
+                    finished_keys
+                ))
+        return reopened_keys
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _reopen_keys(keys, finished_keys):
+        """remove the keys from the set of finished keys, returning those that
+        were actually there in the order that they were given."""
+        reopened_keys = [k for k in keys if k in finished_keys]
+        finished_keys.difference_update(reopened_keys)
+        return reopened_keys
+
+    #--------------------------------------------------------------------------
+    def _expand_option(self, key, finished_keys):
+        """convert the default of a single option into its real value.  If
+        the resultant value has its own required config, bring those options
+        into the current namespace.
+
+        returns:
+            a tuple of two lists: the names of the Options that were added
+            to the option definitions and the names of the options that had
+            been finished, but must be overlaid and expanded again."""
+        new_option_keys = []
+        reopened_keys = []
+        an_option = self.option_definitions[key]
+        # apply the from string conversion to make the real value
+        an_option.set_value(
+            an_option.default,
+            self.manifest,
+            self.profiler
+        )
+        try:
+            try:
+                # try to fetch new requirements from this value
+                new_requirements = an_option.value.get_required_config()
+            except (AttributeError, KeyError):
+                new_requirements = getattr(
+                    an_option.value,
+                    'required_config',
+                    None
+                )
+            # make sure what we got as new_req is actually a
+            # Mapping of some sort
+            if not isinstance(new_requirements, collections.Mapping):
+                # we didn't get a mapping, perhaps the option value
+                # was a Mock object - in any case we can't try to
+                # interpret 'new_req' as a configman requirement
+                # collection.  We must abandon processing this
+                # option further
+                return new_option_keys, reopened_keys
+            if not isinstance(new_requirements, Namespace):
+                new_requirements = Namespace(
+                    initializer=new_requirements
+                )
+            # get the parent namespace
+            current_namespace = self.option_definitions.parent(key)
+            if current_namespace is None:
+                # we're at the top level, use the base namespace
+                current_namespace = self.option_definitions
+            if current_namespace._reference_value_from:
+                # don't expand things that are in reference value
+                # namespaces, they will be populated by expanding the
+                # targets
+                return new_option_keys, reopened_keys
+            # some new Options to be brought in may have already been
+            # seen and in the finished_keys set.  They must be reset
+            # as unfinished so that a new default doesn't permanently
+            # overwrite any of the values already placed by the
+            # overlays.  So we've got to remove those keys from the
+            # finished keys list.
+            # Before we can do that however, we need the fully
+            # qualified names for the new keys.
+            qualified_parent_name_list = key.rsplit('.', 1)
+            if len(qualified_parent_name_list) > 1:
+                qualified_parent_name = qualified_parent_name_list[0]
+            else:
+                qualified_parent_name = ''
+
+            reopened_keys.extend(self._reopen_keys(
+                [
+                    '.'.join((qualified_parent_name, ref_option_name))
+                    for ref_option_name in new_requirements
+                ],
+                finished_keys
+            ))
+            # add the new Options to the namespace
+            new_namespace = new_requirements.safe_copy(
+                an_option.reference_value_from
+            )
+
+            for new_key in new_namespace.keys_breadth_first():
+                if new_key not in current_namespace:
+                    new_value = new_namespace[new_key]
+                    current_namespace[new_key] = new_value
+                    if isinstance(new_value, Option):
+                        if qualified_parent_name:
+                            new_option_keys.append(
+                                '.'.join((qualified_parent_name, new_key))
+                            )
+                        else:
+                            new_option_keys.append(new_key)
+        except AttributeError:
+            # there are apparently no new Options to bring in from
+            # this option's value
+            pass
+        return new_option_keys, reopened_keys
+
+    #--------------------------------------------------------------------------
+    def _preimport_class_options(self, options, phase_name):
+        """if parallel imports were requested, import the modules named by
+        the defaults of the class options before they are converted"""
+        if not self.parallel_imports:
+            return
+        dotted_names = [
+            x.default for x in options
+            if isinstance(x, Option)
+            and x.from_string_converter is str_to_python_object
+        ]
+        if self.manifest is not None:
+            # the classes known from the manifest are imported when used
+            dotted_names = [
+                x for x in dotted_names if not self.manifest.knows(x)
+            ]
+        with self._profile_phase(phase_name):
+            preimport(dotted_names, self.parallel_imports)
+
+    #--------------------------------------------------------------------------
+    def _preimport_for_pass(self, keys, finished_keys, pass_number):
+        options = []
+        for key in keys:
+            if key in finished_keys:
+                continue
+            try:
+                options.append(self.option_definitions[key])
+            except KeyError:
+                continue
+        self._preimport_class_options(
+            options,
+            'overlay_expand pass %d preimport' % pass_number
+        )
+
     #--------------------------------------------------------------------------
     def _overlay_expand(self):
         """This method overlays each of the value sources onto the default
@@ -618,11 +1378,17 @@ class ConfigurationManager(object):
         own configuration options, bring those into the current namespace and
         then proceed to overlay/expand those.
         """
+        if self.use_worklist_expansion:
+            return self._overlay_expand_worklist()
+
         new_keys_have_been_discovered = True  # loop control, False breaks loop
         finished_keys = set()
         all_reference_values = {}
+        merged_values = None
 
+        pass_number = 0
         while new_keys_have_been_discovered:  # loop until nothing more is done
+            pass_number += 1
             # names_of_all_exsting_options holds a list of all keys in the
             # option definitons in breadth first order using this form:
             # [ 'x', 'y', 'z', 'x.a', 'x.b', 'z.a', 'z.b', 'x.a.j', 'x.a.k',
@@ -648,159 +1414,294 @@ class ConfigurationManager(object):
             all_keys = list(set_of_reference_value_option_names) \
                 + names_of_all_exsting_options
 
-            # previous versions of this method pulled the values from the
-            # values sources deeper within the following nested loops.
-            # that was not necessary and caused a lot of redundant work.
-            # the 'values_from_all_sources' now holds all the the values
-            # from each of the value sources.
-            values_from_all_sources = [
-                a_value_source.get_values(
-                    self,  # pass in the config_manager itself
-                    True,  # ignore mismatches
-                    self.value_source_object_hook  # build with this class
-                )
-                for a_value_source in self.values_source_list
-            ]
+            # the values from all the value sources are merged into a single
+            # flat index of qualified keys, honoring the precedence order
+            merged_values = MergedValueSources(
+                self._get_values_from_all_sources(),
+                merged_values
+            )
 
             # overlay process:
             # fetch all the default values from the value sources before
             # applying the from string conversions
-
-            for key in all_keys:
-                if key in finished_keys:
-                    continue
-                #if not isinstance(an_option, Option):
-                #   continue  # aggregations and other types are ignored
-                # loop through all the value sources looking for values
-                # that match this current key.
-                if self.option_definitions[key].reference_value_from:
-                    reference_value_from = (
-                        self.option_definitions[key].reference_value_from
-                    )
-                    top_key = key.split('.')[-1]
-                    self.option_definitions[key].default = (
-                        self.option_definitions[reference_value_from]
-                        [top_key].default
-                    )
-                    all_reference_values[
-                        '.'.join((reference_value_from, top_key))
-                    ].append(
-                        key
-                    )
-
-                an_option = self.option_definitions[key]
-                if key in all_reference_values:
-                    # make sure that this value gets propagated to keys
-                    # even if the keys have already been overlaid
-                    finished_keys -= set(
-                        all_reference_values[key]
+            with self._profile_phase(
+                'overlay_expand pass %d overlay' % pass_number
+            ):
+                for key in all_keys:
+                    if key in finished_keys:
+                        continue
+                    self._overlay_option(
+                        key,
+                        merged_values,
+                        all_reference_values,
+                        finished_keys
                     )
 
-                for val_src_dict in values_from_all_sources:
-                    try:
-
-                        # overlay the default with the new value from
-                        # the value source.  This assignment may come
-                        # via acquisition, so the key given may not have
-                        # been an exact match for what was returned.
-                        an_option.has_changed = (
-                            an_option.default != val_src_dict[key]
-                        )
-                        an_option.default = val_src_dict[key]
-                        if key in all_reference_values:
-                            # make sure that this value gets propagated to keys
-                            # even if the keys have already been overlaid
-                            finished_keys -= set(
-                                all_reference_values[key]
-                            )
-                    except KeyError as x:
-                        pass  # okay, that source doesn't have this value
+            self._preimport_for_pass(all_keys, finished_keys, pass_number)
 
             # expansion process:
             # step through all the keys converting them to their proper
             # types and bringing in any new keys in the process
-            for key in all_keys:
-                if key in finished_keys:
-                    continue
-                # mark this key as having been seen and processed
-                finished_keys.add(key)
-                an_option = self.option_definitions[key]
-                #if not isinstance(an_option, Option):
-                #    continue  # aggregations, namespaces are ignored
-                # apply the from string conversion to make the real value
-                an_option.set_value(an_option.default)
-                # new values have been seen, don't let loop break
-                new_keys_have_been_discovered = True
-                try:
-                    try:
-                        # try to fetch new requirements from this value
-                        new_requirements = \
-                            an_option.value.get_required_config()
-                    except (AttributeError, KeyError):
-                        new_requirements = getattr(
-                            an_option.value,
-                            'required_config',
-                            None
-                        )
-                    # make sure what we got as new_req is actually a
-                    # Mapping of some sort
-                    if not isinstance(new_requirements, collections.Mapping):
-                        # we didn't get a mapping, perhaps the option value
-                        # was a Mock object - in any case we can't try to
-                        # interpret 'new_req' as a configman requirement
-                        # collection.  We must abandon processing this
-                        # option further
-                        continue
-                    if not isinstance(new_requirements, Namespace):
-                        new_requirements = Namespace(
-                            initializer=new_requirements
-                        )
-                    # get the parent namespace
-                    current_namespace = self.option_definitions.parent(key)
-                    if current_namespace is None:
-                        # we're at the top level, use the base namespace
-                        current_namespace = self.option_definitions
-                    if current_namespace._reference_value_from:
-                        # don't expand things that are in reference value
-                        # namespaces, they will be populated by expanding the
-                        # targets
+            with self._profile_phase(
+                'overlay_expand pass %d expansion' % pass_number
+            ):
+                for key in all_keys:
+                    if key in finished_keys:
                         continue
-                    # some new Options to be brought in may have already been
-                    # seen and in the finished_keys set.  They must be reset
-                    # as unfinished so that a new default doesn't permanently
-                    # overwrite any of the values already placed by the
-                    # overlays.  So we've got to remove those keys from the
-                    # finished keys list.
-                    # Before we can do that however, we need the fully
-                    # qualified names for the new keys.
-                    qualified_parent_name_list = key.rsplit('.', 1)
-                    if len(qualified_parent_name_list) > 1:
-                        qualified_parent_name = qualified_parent_name_list[0]
-                    else:
-                        qualified_parent_name = ''
-
-                    finished_keys = finished_keys.difference(
-                        '.'.join((qualified_parent_name, ref_option_name))
-                        for ref_option_name in new_requirements
-                    )
-                    # add the new Options to the namespace
-                    new_namespace = new_requirements.safe_copy(
-                        an_option.reference_value_from
-                    )
+                    # mark this key as having been seen and processed
+                    finished_keys.add(key)
+                    self._expand_option(key, finished_keys)
+                    # new values have been seen, don't let loop break
+                    new_keys_have_been_discovered = True
+        if merged_values is not None:
+            self._values_from_final_pass = \
+                merged_values.values_from_all_sources
+            self._merged_values_from_final_pass = merged_values
+        self._finished_keys = finished_keys
+        self._all_reference_values = all_reference_values
+        return finished_keys
 
-                    for new_key in new_namespace.keys_breadth_first():
-                        if new_key not in current_namespace:
-                            current_namespace[new_key] = new_namespace[new_key]
-                except AttributeError as x:
-                    # there are apparently no new Options to bring in from
-                    # this option's value
-                    pass
+    #--------------------------------------------------------------------------
+    def _overlay_expand_worklist(self):
+        """This is an alternative implementation of '_overlay_expand' that
+        gives the same results.  Rather than walking the entire tree of option
+        definitions on each pass, it keeps a worklist of the options that
+        still need to be overlaid and expanded.  Each pass only visits the
+        options brought in or reset by the previous pass, so every option is
+        visited a constant number of times regardless of how deeply the
+        expansion of classes nests."""
+        finished_keys = set()
+        all_reference_values = {}
+
+        # every option, in breadth first order, starts out as pending
+        pending_keys = [
+            x for x
+            in self.option_definitions.keys_breadth_first()
+            if isinstance(self.option_definitions[x], Option)
+        ]
+        self._overlay_expand_pending(
+            pending_keys,
+            finished_keys,
+            all_reference_values,
+            set(pending_keys)
+        )
+        return finished_keys
+
+    #--------------------------------------------------------------------------
+    def _overlay_expand_changed_values(self):
+        """overlay and expand again just the options whose values from the
+        value sources have changed since the final pass of the last
+        overlay/expansion"""
+        previous_merged_values = self._merged_values_from_final_pass
+        merged_values = MergedValueSources(
+            self._get_values_from_all_sources(),
+            previous_merged_values
+        )
+        option_keys = [
+            x for x
+            in self.option_definitions.keys_breadth_first()
+            if isinstance(self.option_definitions[x], Option)
+        ]
+        if previous_merged_values is None:
+            # the options were loaded from the startup cache, there is no
+            # record of the values they were resolved from.
+            changed_keys = option_keys
+        else:
+            added, removed, changed = diff(
+                self._values_of_options(previous_merged_values, option_keys),
+                self._values_of_options(merged_values, option_keys)
+            )
+            changed_keys = set(added + removed + changed)
+            changed_keys = [x for x in option_keys if x in changed_keys]
+        self._finished_keys.difference_update(changed_keys)
+        self._overlay_expand_pending(
+            changed_keys,
+            self._finished_keys,
+            self._all_reference_values,
+            set(option_keys),
+            merged_values
+        )
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _values_of_options(merged_values, option_keys):
+        """return a flat mapping of the keys of the options that have a
+        value in the merged values to those values"""
+        values = {}
+        for key in option_keys:
+            try:
+                values[key] = merged_values[key]
+            except KeyError:
+                pass
+        return values
+
+    #--------------------------------------------------------------------------
+    def _overlay_expand_from_plan(self):
+        """an alternative to '_overlay_expand' for the case where the option
+        definitions came from a ConfigurationPlan.  They have already been
+        expanded with their defaults, so only the options that get a value
+        from a value source and the options that are not part of the plan
+        need to be overlaid and expanded."""
+        plan = self._plan
+        self._definition_defaults = dict(plan.definition_defaults)
+        self._all_reference_values = dict(
+            (key, list(referencing_keys))
+            for key, referencing_keys in six.iteritems(
+                plan.all_reference_values
+            )
+        )
+        finished_keys = set(plan.finished_keys)
+        merged_values = MergedValueSources(
+            self._get_values_from_all_sources()
+        )
+        option_keys = [
+            x for x
+            in self.option_definitions.keys_breadth_first()
+            if isinstance(self.option_definitions[x], Option)
+        ]
+        pending_keys = [
+            key for key in option_keys
+            if key not in finished_keys or key in merged_values
+        ]
+        finished_keys.difference_update(pending_keys)
+        self._overlay_expand_pending(
+            pending_keys,
+            finished_keys,
+            self._all_reference_values,
+            set(option_keys),
+            merged_values
+        )
+        for key, plan_value in plan.expanded_class_values:
+            if self.option_definitions[key].value != plan_value:
+                # a class that was expanded in the plan has been replaced.
+                # The options that it brought in may not belong in this
+                # configuration, the resolution must start over from the
+                # definitions before expansion.
+                return self._overlay_expand_from_base_definitions()
         return finished_keys
 
+    #--------------------------------------------------------------------------
+    def _overlay_expand_from_base_definitions(self):
+        """abandon the expanded option definitions from the plan and resolve
+        its definitions before expansion instead.  The definitions that are
+        not from the plan, like the admin options, are kept."""
+        for key, default in six.iteritems(self._definition_defaults):
+            # undo the overlay of the definitions that are kept
+            try:
+                self.option_definitions[key].default = default
+            except KeyError:
+                pass
+        option_definitions = self._plan.base_definitions.safe_copy()
+        for key, value in six.iteritems(self.option_definitions):
+            if key not in self._plan.option_definitions:
+                option_definitions[key] = value
+        option_definitions.enable_key_index()
+        self.option_definitions = option_definitions
+        self._definition_defaults = {}
+        return self._overlay_expand()
+
+    #--------------------------------------------------------------------------
+    def _overlay_expand_pending(
+        self,
+        pending_keys,
+        finished_keys,
+        all_reference_values,
+        known_option_keys,
+        merged_values=None
+    ):
+        """the worklist loop of the overlay/expansion phase.  The options
+        named in 'pending_keys' are overlaid and expanded along with all the
+        options that they bring in or reset, until there are none left.
+        'merged_values' may be the MergedValueSources from a previous pass,
+        its flattened value sources are reused where possible."""
+        pass_number = 0
+        while pending_keys:
+            pass_number += 1
+            # create alternate paths options
+            set_of_reference_value_option_names = \
+                self._create_reference_value_options(
+                    pending_keys,
+                    finished_keys,
+                    known_option_keys
+                )
+            known_option_keys.update(set_of_reference_value_option_names)
+
+            for a_ref_option_name in set_of_reference_value_option_names:
+                if a_ref_option_name not in all_reference_values:
+                    all_reference_values[a_ref_option_name] = []
+
+            all_keys = list(set_of_reference_value_option_names) \
+                + pending_keys
+
+            # the values from all the value sources are merged into a single
+            # flat index of qualified keys, honoring the precedence order
+            merged_values = MergedValueSources(
+                self._get_values_from_all_sources(),
+                merged_values
+            )
+
+            # the keys that must be visited on the next pass in the order
+            # in which they were discovered
+            next_keys = []
+
+            # overlay process
+            with self._profile_phase(
+                'overlay_expand pass %d overlay' % pass_number
+            ):
+                for key in all_keys:
+                    if key in finished_keys:
+                        continue
+                    next_keys.extend(self._overlay_option(
+                        key,
+                        merged_values,
+                        all_reference_values,
+                        finished_keys
+                    ))
+
+            self._preimport_for_pass(all_keys, finished_keys, pass_number)
+
+            # expansion process
+            with self._profile_phase(
+                'overlay_expand pass %d expansion' % pass_number
+            ):
+                for key in all_keys:
+                    if key in finished_keys:
+                        continue
+                    finished_keys.add(key)
+                    new_option_keys, reopened_keys = self._expand_option(
+                        key,
+                        finished_keys
+                    )
+                    known_option_keys.update(new_option_keys)
+                    next_keys.extend(new_option_keys)
+                    next_keys.extend(reopened_keys)
+
+            pending_keys = []
+            seen_keys = set()
+            for key in next_keys:
+                if key not in finished_keys and key not in seen_keys:
+                    seen_keys.add(key)
+                    pending_keys.append(key)
+        if merged_values is not None:
+            self._values_from_final_pass = \
+                merged_values.values_from_all_sources
+            self._merged_values_from_final_pass = merged_values
+        self._finished_keys = finished_keys
+        self._all_reference_values = all_reference_values
+
     #--------------------------------------------------------------------------
     def _check_for_mismatches(self, known_keys):
-        """check for bad options from value sources"""
-        for a_value_source in self.values_source_list:
+        """check for bad options from value sources and return the set of
+        keys that matched no option"""
+        # the values that the overlay/expansion phase fetched on its final
+        # pass were fetched with the final set of option definitions.  They
+        # are reused here rather than fetched again.
+        values_from_all_sources = self._values_from_final_pass
+        # an index to find the known keys that end with a given key.  It is
+        # only built if there turn out to be unmatched keys.
+        known_keys_suffix_index = None
+        all_unmatched_keys = set()
+        for index, a_value_source in enumerate(self.values_source_list):
             try:
                 if a_value_source.always_ignore_mismatches:
                     continue
@@ -808,28 +1709,55 @@ class ConfigurationManager(object):
                 # ok, this values source doesn't have the concept
                 # always igoring mismatches, we won't tolerate mismatches
                 pass
+            if values_from_all_sources is not None:
+                previous_values = values_from_all_sources[index]
+            else:
+                previous_values = None
             # we want to fetch the keys from the value sources so that we can
             # check for mismatches.  Commandline value sources, are different,
             # we never want to allow unmatched keys from the command line.
             # By detecting if this value source is a command line source, we
-            # can employ the command line's own mismatch detection.  The
-            # boolean 'allow_mismatches' controls application of the tollerance
-            # for mismatches.
+            # can employ the command line's own mismatch detection.
             if hasattr(a_value_source, 'command_line_value_source'):
-                allow_mismatches = False
+                # a command line value source may offer a way to validate
+                # the command line strictly that reuses the values that it
+                # returned on the final pass.  Otherwise, its values have to
+                # be fetched again without tolerance for mismatches.
+                revalidate_values = getattr(
+                    a_value_source,
+                    'revalidate_values',
+                    None
+                )
+                if (
+                    revalidate_values is not None
+                    and previous_values is not None
+                ):
+                    value_source_mapping = revalidate_values(
+                        self,
+                        previous_values,
+                        self.value_source_object_hook
+                    )
+                else:
+                    value_source_mapping = a_value_source.get_values(
+                        self,
+                        False,  # don't ignore mismatches
+                        self.value_source_object_hook
+                    )
+            elif previous_values is not None:
+                value_source_mapping = previous_values
             else:
-                allow_mismatches = True
+                value_source_mapping = a_value_source.get_values(
+                    self,
+                    True,  # allow mismatches
+                    self.value_source_object_hook
+                )
             # make a set of all the keys from a value source in the form
             # of strings like this: 'x.y.z'
-            value_source_mapping = a_value_source.get_values(
-                self,
-                allow_mismatches,
-                self.value_source_object_hook
+            if not isinstance(value_source_mapping, DotDict):
+                value_source_mapping = DotDict(value_source_mapping)
+            value_source_keys_set = set(
+                value_source_mapping.keys_breadth_first()
             )
-            value_source_keys_set = set([
-                k for k in
-                DotDict(value_source_mapping).keys_breadth_first()
-            ])
             # make a set of the keys that didn't match any of the known
             # keys in the requirements
             unmatched_keys = value_source_keys_set.difference(known_keys)
@@ -837,15 +1765,14 @@ class ConfigurationManager(object):
             # used during acquisition.
             # remove keys of the form 'y.z' if they match a known key of the
             # form 'x.y.z'
+            if unmatched_keys and known_keys_suffix_index is None:
+                known_keys_suffix_index = SuffixIndex(known_keys)
             for key in unmatched_keys.copy():
-                key_is_okay = six.moves.reduce(
-                    lambda x, y: x or y,
-                    (known_key.endswith(key) for known_key in known_keys)
-                )
-                if key_is_okay:
+                if known_keys_suffix_index.has_string_ending_with(key):
                     unmatched_keys.remove(key)
             # anything left in the unmatched_key set is a badly formed key.
             # issue a warning
+            all_unmatched_keys.update(unmatched_keys)
             if unmatched_keys:
                 if self.option_definitions.admin.strict.default:
                     # raise hell...
@@ -861,6 +1788,7 @@ class ConfigurationManager(object):
                     warnings.warn(
                         'Invalid options: %s' % ', '.join(sorted(unmatched_keys))
                     )
+        return all_unmatched_keys
 
     #--------------------------------------------------------------------------
     @staticmethod
@@ -909,7 +1837,13 @@ class ConfigurationManager(object):
         return self.config_pathname
 
     #--------------------------------------------------------------------------
-    def _setup_admin_options(self, values_source_list):
+    def _setup_admin_options(
+        self,
+        values_source_list,
+        startup_cache_pathname=None,
+        profile=None,
+        cache_report=None
+    ):
         base_namespace = Namespace()
         base_namespace.admin = admin = Namespace()
         admin.add_option(
@@ -934,6 +1868,29 @@ class ConfigurationManager(object):
             default=False,
             doc='should options marked secret get written out or hidden?'
         )
+        # only offer the startup cache admin option if the cache has been
+        # requested
+        if startup_cache_pathname:
+            admin.add_option(
+                name='startup_cache',
+                default=startup_cache_pathname,
+                doc='a pathname in which to cache the resolved options '
+                    'between runs',
+            )
+        self._add_admin_choice_option(
+            admin,
+            'profile',
+            profile,
+            ('text', 'json'),
+            "write a profile of configman's work to stderr"
+        )
+        self._add_admin_choice_option(
+            admin,
+            'cache_report',
+            cache_report,
+            ('startup', 'exit'),
+            "write a report of configman's caches to stderr"
+        )
         # only offer the config file admin options if they've been requested in
         # the values source list
         if ConfigFileFutureProxy in values_source_list:
@@ -945,6 +1902,34 @@ class ConfigurationManager(object):
             )
         return base_namespace
 
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _add_admin_choice_option(admin, name, default, choices, doc):
+        """add an admin option whose value is one of the choices or '' for
+        off.  It is only offered if it has been requested, when the default
+        is not None"""
+        if default is None:
+            return
+        admin.add_option(
+            name=name,
+            default=default or '',
+            doc='%s (%s)' % (doc, ' or '.join("'%s'" % x for x in choices)),
+            from_string_converter=ChoiceConverter(('',) + tuple(choices)),
+        )
+
+    #--------------------------------------------------------------------------
+    def _preliminary_admin_value(self, admin_values, name, default):
+        """return the value of an admin option from the preliminary pass
+        over the command line, converted and validated by its option, or the
+        default if it wasn't on the command line"""
+        try:
+            a_value = admin_values[name]
+        except KeyError:
+            return default
+        an_option = self._get_option(name)
+        an_option.set_value(a_value)
+        return an_option.value
+
     #--------------------------------------------------------------------------
     def _walk_config_copy_values(self, source, destination, mapping_class):
         for key, val in source.items():
@@ -952,7 +1937,8 @@ class ConfigurationManager(object):
                 continue
             value_type = type(val)
             if isinstance(val, Option) or isinstance(val, Aggregation):
-                destination[key] = val.value
+                # a class known from a manifest is imported for the config
+                destination[key] = lazy_import.resolve(val.value)
             elif value_type == Namespace:
                 destination[key] = d = mapping_class()
                 self._walk_config_copy_values(val, d, mapping_class)
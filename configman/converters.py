@@ -6,8 +6,10 @@ from __future__ import absolute_import, division, print_function
 import sys
 import re
 import datetime
+import threading
 import types
 import json
+import collections
 import six
 
 from configman.datetime_util import (
@@ -22,6 +24,10 @@ datetime_converter = datetime_from_ISO_string
 date_converter = date_from_ISO_string
 
 from configman.config_exceptions import CannotConvertError
+from configman import cache_registry
+from configman.memoize import CacheInfo
+from configman.orderedset import OrderedDict
+from configman.source_files import stat_signature
 
 #------------------------------------------------------------------------------
 #  Utility section
@@ -135,9 +141,216 @@ def str_to_boolean(input_str):
 boolean_converter = str_to_boolean  # for backward compatiblity
 
 
+#==============================================================================
+class _ImportCache(object):
+    """remembers how str_to_python_object resolved each dotted name: the
+    top level module that was imported and the attributes followed from it.
+    A name is found again by following the attributes from the module in
+    sys.modules, without the import machinery.  If the module in sys.modules
+    is not the one remembered, or an attribute has gone, the name is resolved
+    from scratch.
+
+    A name that could not be found is remembered along with what the import
+    search for it depended upon: sys.path, the import hooks, the modules
+    already imported for the leading parts of the name and the stat
+    signatures of the directories a new module would have to appear in.
+    While all of those are unchanged, and the attribute that was missing is
+    still missing, the failure is repeated without trying the import again.
+    Like the finders of the import system itself, a module written within
+    the same mtime tick as the failure may go unnoticed; call cache_clear,
+    as one would call importlib.invalidate_caches, after writing modules at
+    run time.  Failures other than a missing module or attribute, a broken
+    module for example, are not remembered.
+
+    The lock guards only the entries and the statistics.  The attributes are
+    followed outside of it, as following one may convert another name."""
+
+    #--------------------------------------------------------------------------
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        # dotted name -> (module name, attribute names, module) for a name
+        # that was found, or (None, name parts, error message, import
+        # signature, attribute check) for a name that was not
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _import_signature(parts):
+        """return what the search for the module of the dotted name parts
+        depends upon"""
+        prefixes = [
+            '.'.join(parts[:index]) for index in range(1, len(parts) + 1)
+        ]
+        modules = tuple(sys.modules.get(prefix) for prefix in prefixes)
+        directories = sys.path
+        for module in modules:
+            if module is None:
+                break
+            directories = getattr(module, '__path__', directories)
+        return (
+            tuple(sys.path),
+            tuple(sys.meta_path),
+            tuple(sys.path_hooks),
+            modules,
+            tuple(
+                (directory, stat_signature(directory or '.'))
+                for directory in directories
+            )
+        )
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _attribute_is_missing(module_name, attribute_names, module):
+        if sys.modules.get(module_name) is not module:
+            return False
+        an_object = module
+        try:
+            for name in attribute_names:
+                an_object = getattr(an_object, name)
+        except AttributeError:
+            return True
+        return False
+
+    #--------------------------------------------------------------------------
+    def get(self, dotted_name):
+        """return the object of the dotted name, raise CannotConvertError if
+        the name is known not to be found or raise KeyError if the name must
+        be resolved"""
+        with self.lock:
+            entry = self.entries.get(dotted_name)
+        found = failed = False
+        if entry is None:
+            pass
+        elif entry[0] is None:
+            parts, error_message, signature, attribute_check = entry[1:]
+            failed = (
+                self._import_signature(parts) == signature
+                and (
+                    attribute_check is None
+                    or self._attribute_is_missing(*attribute_check)
+                )
+            )
+        else:
+            module_name, attribute_names, module = entry
+            try:
+                if sys.modules.get(module_name) is module:
+                    an_object = module
+                    for name in attribute_names:
+                        an_object = getattr(an_object, name)
+                    found = True
+            except AttributeError:
+                pass
+        with self.lock:
+            if not found and not failed:
+                # forget the entry unless another thread has replaced it
+                if (
+                    entry is not None
+                    and self.entries.get(dotted_name) is entry
+                ):
+                    del self.entries[dotted_name]
+                self.misses += 1
+                raise KeyError(dotted_name)
+            self.hits += 1
+        if failed:
+            raise CannotConvertError(error_message)
+        return an_object
+
+    #--------------------------------------------------------------------------
+    def _put(self, dotted_name, entry):
+        with self.lock:
+            self.entries[dotted_name] = entry
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    #--------------------------------------------------------------------------
+    def found(self, dotted_name, module_name, attribute_names):
+        self._put(
+            dotted_name,
+            (module_name, tuple(attribute_names), sys.modules[module_name])
+        )
+
+    #--------------------------------------------------------------------------
+    def not_found(
+        self,
+        dotted_name,
+        parts,
+        error_message,
+        attribute_check=None
+    ):
+        """remember that the dotted name could not be found.  If it was an
+        attribute that was missing, attribute_check is the (module name,
+        attribute names, module) that failed to reach it."""
+        self._put(
+            dotted_name,
+            (
+                None,
+                tuple(parts),
+                error_message,
+                self._import_signature(parts),
+                attribute_check
+            )
+        )
+
+    #--------------------------------------------------------------------------
+    def cache_info(self):
+        with self.lock:
+            return CacheInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                self.max_size,
+                len(self.entries)
+            )
+
+    #--------------------------------------------------------------------------
+    def cache_clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    #--------------------------------------------------------------------------
+    def cache_bytes(self):
+        with self.lock:
+            entries = list(self.entries.items())
+            total = sys.getsizeof(self.entries)
+        for key, entry in entries:
+            total += sys.getsizeof(key) + sys.getsizeof(entry)
+        return total
+
+_import_cache = _ImportCache()
+cache_registry.register(
+    _import_cache,
+    'configman.converters.str_to_python_object'
+)
+
+
+#------------------------------------------------------------------------------
+def _is_missing_module(import_error, dotted_name):
+    """return True if the import of the dotted name failed because a module
+    of the name itself does not exist rather than because of something that
+    the module imports or does"""
+    missing = getattr(import_error, 'name', None)
+    if missing is not None:
+        # Python 3 names the missing module in full
+        return dotted_name == missing or dotted_name.startswith(missing + '.')
+    message = str(import_error)
+    if not message.startswith('No module named '):
+        return False
+    # Python 2 names only the part of the dotted name that it couldn't find
+    missing = message[len('No module named '):].strip("'")
+    return dotted_name == missing or dotted_name.endswith('.' + missing)
+
+
 #------------------------------------------------------------------------------
 def str_to_python_object(input_str):
-    """ a conversion that will import a module and class name
+    """ a conversion that will import a module and class name.  How each
+    name was resolved, or that it could not be, is remembered, see
+    _ImportCache.
     """
     if not input_str:
         return None
@@ -152,24 +365,51 @@ def str_to_python_object(input_str):
     if '.' not in input_str and input_str in known_mapping_str_to_type:
         return known_mapping_str_to_type[input_str]
     parts = [x.strip() for x in input_str.split('.') if x.strip()]
+    dotted_name = '.'.join(parts)
+    name_parts = parts
+    try:
+        return _import_cache.get(dotted_name)
+    except KeyError:
+        pass  # not known yet, it must be imported
+    # only a failure to find the name is remembered
+    missing = False
     try:
         try:
             # first try as a complete module
             package = __import__(input_str)
-        except ImportError:
+        except ImportError as x:
+            missing = _is_missing_module(x, dotted_name)
             # it must be a class from a module
             if len(parts) == 1:
-                # since it has only one part, it must be a class from __main__
+                # since it has only one part, it must be a class from
+                # __main__
                 parts = ('__main__', input_str)
-            package = __import__('.'.join(parts[:-1]), globals(), locals(), [])
+            module_name = '.'.join(parts[:-1])
+            try:
+                package = __import__(module_name, globals(), locals(), [])
+            except ImportError as x:
+                missing = missing and _is_missing_module(x, module_name)
+                raise
         obj = package
         for name in parts[1:]:
             obj = getattr(obj, name)
-        return obj
     except AttributeError as x:
-        raise CannotConvertError("%s cannot be found" % input_str)
+        error_message = "%s cannot be found" % input_str
+        if missing and sys.modules.get(parts[0]) is package:
+            _import_cache.not_found(
+                dotted_name,
+                name_parts,
+                error_message,
+                (parts[0], tuple(parts[1:]), package)
+            )
+        raise CannotConvertError(error_message)
     except ImportError as x:
+        if missing:
+            _import_cache.not_found(dotted_name, name_parts, str(x))
         raise CannotConvertError(str(x))
+    if sys.modules.get(parts[0]) is package:
+        _import_cache.found(dotted_name, parts[0], parts[1:])
+    return obj
 
 class_converter = str_to_python_object  # for backward compatibility
 
@@ -336,6 +576,48 @@ def str_to_list(
 list_converter = str_to_list  # for backward compatibility
 
 
+#==============================================================================
+class ChoiceConverter(object):
+    """a from string converter that accepts only one of a fixed set of
+    strings.  It is a class rather than a closure so that the options that
+    use it can be pickled and fingerprinted by the startup cache."""
+
+    #--------------------------------------------------------------------------
+    def __init__(self, choices):
+        self.choices = tuple(choices)
+
+    #--------------------------------------------------------------------------
+    def __call__(self, input_str):
+        a_choice = to_str(input_str).strip()
+        if a_choice not in self.choices:
+            raise ValueError(
+                '%r is not one of %s' % (
+                    input_str,
+                    ', '.join(repr(x) for x in self.choices)
+                )
+            )
+        return a_choice
+
+    #--------------------------------------------------------------------------
+    def __eq__(self, other):
+        return (
+            isinstance(other, ChoiceConverter)
+            and self.choices == other.choices
+        )
+
+    #--------------------------------------------------------------------------
+    def __ne__(self, other):
+        return not self == other
+
+    #--------------------------------------------------------------------------
+    def __hash__(self):
+        return hash(self.choices)
+
+    #--------------------------------------------------------------------------
+    def __repr__(self):
+        return 'ChoiceConverter(%r)' % (self.choices,)
+
+
 #------------------------------------------------------------------------------
 #
 #   To string section
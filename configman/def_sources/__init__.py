@@ -35,7 +35,10 @@ class UnknownDefinitionTypeException(Exception):
     pass
 
 
-def setup_definitions(source, destination):
+def setup_definitions(source, destination, manifest=None):
+    """copy the definitions from the source into the destination.  The
+    manifest, if any, is used to convert the defaults of class options, see
+    the module 'lazy_import'."""
     target_setup_func = None
     try:
         target_setup_func = definition_dispatch[type(source)]
@@ -46,4 +49,7 @@ def setup_definitions(source, destination):
                 break
         if not target_setup_func:
             raise UnknownDefinitionTypeException(repr(type(source)))
-    target_setup_func(source, destination)
+    if manifest is None:
+        target_setup_func(source, destination)
+    else:
+        target_setup_func(source, destination, manifest=manifest)
@@ -659,9 +659,10 @@ class ArgumentParser(argparse.ArgumentParser):
 
 
 #------------------------------------------------------------------------------
-def setup_definitions(source, destination):
+def setup_definitions(source, destination, manifest=None):
     """this method stars the process of configman reading and using an argparse
-    instance as a source of configuration definitions."""
+    instance as a source of configuration definitions.  The manifest is not
+    used, the options of a parser are converted later."""
     #"""assume that source is of type argparse
     try:
         destination.update(source.get_required_config())
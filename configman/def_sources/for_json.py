@@ -6,10 +6,10 @@ import json
 from configman.def_sources import for_mappings
 
 
-def setup_definitions(source, destination):
+def setup_definitions(source, destination, manifest=None):
     try:
         json_dict = json.loads(source)
     except ValueError:
         with open(source) as j:
             json_dict = json.load(j)
-    for_mappings.setup_definitions(json_dict, destination)
+    for_mappings.setup_definitions(json_dict, destination, manifest)
@@ -14,7 +14,7 @@ from configman.option import (
 
 
 #------------------------------------------------------------------------------
-def setup_definitions(source, destination):
+def setup_definitions(source, destination, manifest=None):
     for key, val in source.items():
         if key.startswith('__'):
             continue  # ignore these
@@ -22,7 +22,7 @@ def setup_definitions(source, destination):
             destination[key] = val
             if not val.name:
                 val.name = key
-            val.set_value(val.default)
+            val.set_value(val.default, manifest)
         elif isinstance(val, Aggregation):
             destination[key] = val
         elif isinstance(val, collections.Mapping):
@@ -43,7 +43,7 @@ def setup_definitions(source, destination):
                     except AttributeError:
                         destination[key] = Namespace()
                 # recurse!
-                setup_definitions(val, destination[key])
+                setup_definitions(val, destination[key], manifest)
         else:
             destination[key] = Option(name=key,
                                       doc=key,
@@ -6,7 +6,7 @@ from configman.def_sources.for_mappings import  \
     setup_definitions as setup_definitions_for_mappings
 
 
-def setup_definitions(source, destination):
+def setup_definitions(source, destination, manifest=None):
     module_dict = source.__dict__.copy()
     del module_dict['__builtins__']
-    setup_definitions_for_mappings(module_dict, destination)
+    setup_definitions_for_mappings(module_dict, destination, manifest)
@@ -0,0 +1,70 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+import six
+
+from configman.dotdict import DotDict, iteritems_breadth_first
+from configman.option import Option, Aggregation
+
+
+#------------------------------------------------------------------------------
+def _leaf_keys(prefix, a_value):
+    if isinstance(a_value, DotDict):
+        return [
+            '%s.%s' % (prefix, key)
+            for key, value in iteritems_breadth_first(a_value)
+        ]
+    return [prefix]
+
+
+#------------------------------------------------------------------------------
+def diff(a_mapping, another_mapping):
+    """compare two trees of nested DotDicts, like two configs or two sets of
+    option definitions, with a single walk through both of them.  Subtrees
+    that are the very same object in both trees are not walked at all.
+    Options and Aggregations are compared by their values, so are values
+    that are mappings but not DotDicts.  The two mappings at the top may be
+    any mappings, a pair of flat dicts of qualified keys is compared key by
+    key.
+
+    returns:
+        a tuple of three lists of qualified keys: the keys only in the second
+        tree (added), the keys only in the first tree (removed) and the keys
+        with different values (changed)"""
+    added = []
+    removed = []
+    changed = []
+    pending = [('', a_mapping, another_mapping)]
+    while pending:
+        prefix, a_subtree, another_subtree = pending.pop()
+        # the items are copied into plain dicts so that lookups never find
+        # values via acquisition
+        another_items = dict(six.iteritems(another_subtree))
+        for key, a_value in six.iteritems(a_subtree):
+            qualified_key = prefix + key
+            try:
+                another_value = another_items.pop(key)
+            except KeyError:
+                removed.extend(_leaf_keys(qualified_key, a_value))
+                continue
+            if a_value is another_value:
+                continue
+            a_value_is_a_subtree = isinstance(a_value, DotDict)
+            if a_value_is_a_subtree and isinstance(another_value, DotDict):
+                pending.append(
+                    (qualified_key + '.', a_value, another_value)
+                )
+                continue
+            if isinstance(a_value, (Option, Aggregation)):
+                a_value = a_value.value
+            if isinstance(another_value, (Option, Aggregation)):
+                another_value = another_value.value
+            if a_value_is_a_subtree or a_value != another_value:
+                changed.append(qualified_key)
+        for key, another_value in six.iteritems(another_subtree):
+            if key in another_items:
+                # it wasn't removed above, so it's not in the first tree
+                added.extend(_leaf_keys(prefix + key, another_value))
+    return added, removed, changed
@@ -4,28 +4,64 @@
 from __future__ import absolute_import, division, print_function
 
 import collections
+import re
+import sys
 import weakref
 import six
 
-from configman.orderedset import OrderedSet
 from configman.memoize import memoize
+from configman.orderedset import OrderedDict, OrderedSet
+
+if sys.version_info >= (3, 7):
+    # plain dicts, including the __dict__ of an instance, keep the order of
+    # insertion
+    _ordered_dict = dict
+else:
+    _ordered_dict = OrderedDict
+
+if hasattr(collections.MutableMapping, '__weakref__'):
+    # the Python 2 abstract base classes have no __slots__, so their
+    # derived classes always get a __dict__ and a __weakref__
+    _dot_dict_slots = ()
+else:
+    _dot_dict_slots = ('__dict__', '__weakref__')
+
+# attributes in the __slots__ of the DotDict classes that are not part of the
+# pickled state
+_unpickled_attributes = frozenset((
+    '__dict__',
+    '__weakref__',
+    '_parent',
+    '_key_index',
+    '_key_index_memberships',
+    '_parents',
+    '_modification_count',
+    '_keys_breadth_first',
+    '_acquired',
+    '_hash',
+))
 
 
 #------------------------------------------------------------------------------
 def iteritems_breadth_first(a_mapping, include_dicts=False):
     """a generator that returns all the keys in a set of nested
     Mapping instances.  The keys take the form X.Y.Z"""
-    subordinate_mappings = []
-    for key, value in six.iteritems(a_mapping):
-        if isinstance(value, collections.Mapping):
-            subordinate_mappings.append((key, value))
-            if include_dicts:
+    # a stack of (prefix, mapping), each prefix is formatted just once
+    pending = [(None, a_mapping)]
+    while pending:
+        prefix, a_mapping = pending.pop()
+        subordinate_mappings = []
+        for key, value in six.iteritems(a_mapping):
+            if prefix is not None:
+                key = '%s%s' % (prefix, key)
+            if isinstance(value, collections.Mapping):
+                subordinate_mappings.append(('%s.' % key, value))
+                if include_dicts:
+                    yield key, value
+            else:
                 yield key, value
-        else:
-            yield key, value
-    for key, a_map in subordinate_mappings:
-        for sub_key, value in iteritems_breadth_first(a_map, include_dicts):
-            yield '%s.%s' % (key, sub_key), value
+        # reversed so that the first subordinate mapping is next off the stack
+        pending.extend(reversed(subordinate_mappings))
 
 
 #------------------------------------------------------------------------------
@@ -50,6 +86,127 @@ def configman_keys(a_mapping):
     return configmanized_keys_dict
 
 
+#==============================================================================
+class _QualifiedKeyIndex(object):
+    """a flat index of the qualified keys of a tree of DotDicts, from the
+    root that enabled it.  The index is built by the first lookup of a
+    qualified key, so a tree that is only being filled doesn't pay for it.
+    From then on, every DotDict in the tree lists the index among its
+    memberships, along with its own key prefix within the tree, and the
+    DotDicts update the index as they change."""
+
+    __slots__ = ('entries', 'root', '__weakref__')
+
+    #--------------------------------------------------------------------------
+    def __init__(self, root):
+        # None until the index is built
+        self.entries = None
+        self.root = weakref.ref(root)
+
+    #--------------------------------------------------------------------------
+    def get(self, key):
+        """return the value of a key of the tree or raise KeyError"""
+        entries = self.entries
+        if entries is None:
+            if not isinstance(key, six.string_types) or '.' not in key:
+                # a plain key is found as fast without the index
+                raise KeyError(key)
+            entries = self.entries = {}
+            self._add_members('', self.root())
+        return entries[key]
+
+    #--------------------------------------------------------------------------
+    def _add_members(self, prefix, a_dot_dict):
+        """index all the keys of 'a_dot_dict' under the 'prefix' and make it
+        and its nested DotDicts members of the index"""
+        if a_dot_dict._key_index_memberships is None:
+            _set_attribute(a_dot_dict, '_key_index_memberships', [])
+        a_dot_dict._key_index_memberships.append(
+            (weakref.ref(self), prefix)
+        )
+        namespaces = []
+        for key, value in six.iteritems(a_dot_dict.__dict__):
+            self.entries[prefix + key] = value
+            if isinstance(value, DotDict):
+                namespaces.append((key, value))
+        for key, value in namespaces:
+            self._add_members('%s%s.' % (prefix, key), value)
+
+    #--------------------------------------------------------------------------
+    def _remove_members(self, prefix, a_dot_dict):
+        memberships = a_dot_dict._key_index_memberships
+        for i, (a_reference, a_prefix) in enumerate(memberships):
+            if a_reference() is self and a_prefix == prefix:
+                del memberships[i]
+                break
+        for key, value in six.iteritems(a_dot_dict.__dict__):
+            self.entries.pop(prefix + key, None)
+            if isinstance(value, DotDict):
+                self._remove_members('%s%s.' % (prefix, key), value)
+
+    #--------------------------------------------------------------------------
+    def set(self, prefix, key, old_value, new_value):
+        qualified_key = prefix + key
+        if isinstance(old_value, DotDict):
+            self._remove_members(qualified_key + '.', old_value)
+        self.entries[qualified_key] = new_value
+        if isinstance(new_value, DotDict):
+            self._add_members(qualified_key + '.', new_value)
+
+    #--------------------------------------------------------------------------
+    def delete(self, prefix, key, old_value):
+        qualified_key = prefix + key
+        if isinstance(old_value, DotDict):
+            self._remove_members(qualified_key + '.', old_value)
+        self.entries.pop(qualified_key, None)
+
+    #--------------------------------------------------------------------------
+    def close(self, root):
+        """stop being an index, leave all the members"""
+        if self.entries is None:
+            # never built, there are no members
+            return
+        for a_dot_dict in [root] + [
+            x for x in self.entries.values() if isinstance(x, DotDict)
+        ]:
+            a_dot_dict._key_index_memberships[:] = [
+                x for x in a_dot_dict._key_index_memberships
+                if x[0]() is not self
+            ]
+        self.entries = {}
+
+
+#------------------------------------------------------------------------------
+# the value of a key that was not in a DotDict before
+_not_present = object()
+
+# a chain of parents longer than this could be a cycle
+_longest_chain_of_parents = 100
+
+# sets the attributes in __slots__ past the __setattr__ of the DotDicts
+_set_attribute = object.__setattr__
+
+
+#------------------------------------------------------------------------------
+def _count_modifications(pending, counted):
+    """the general case of DotDict._count_modification for DotDicts held in
+    more than one place, visiting each of the ancestors once"""
+    while pending:
+        a_dot_dict = pending.pop()
+        if id(a_dot_dict) in counted:
+            continue
+        counted.add(id(a_dot_dict))
+        _set_attribute(
+            a_dot_dict,
+            '_modification_count',
+            a_dot_dict._modification_count + 1
+        )
+        for a_reference in a_dot_dict._parents or ():
+            a_parent = a_reference()
+            if a_parent is not None:
+                pending.append(a_parent)
+
+
 #==============================================================================
 class DotDict(collections.MutableMapping):
     """This class is a mapping that stores its items within the __dict__
@@ -91,8 +248,20 @@ class DotDict(collections.MutableMapping):
             print('yep, we got a KeyError')
         except AttributeError:
             print('nope, this will never happen')
+
+    The __dict__ holds nothing but the items and it keeps them in the order
+    of insertion.  Any other attributes of this class or derived classes must
+    be declared in __slots__.
     """
 
+    __slots__ = _dot_dict_slots + (
+        '_key_index',
+        '_key_index_memberships',
+        '_parents',
+        '_modification_count',
+        '_keys_breadth_first',
+    )
+
     #--------------------------------------------------------------------------
     def __init__(self, initializer=None):
         """the constructor allows for initialization from another mapping.
@@ -100,7 +269,9 @@ class DotDict(collections.MutableMapping):
         parameters:
             initializer - a mapping of keys and values to be added to this
                           mapping."""
-        self.__dict__['_key_order'] = OrderedSet()
+        if _ordered_dict is not dict:
+            _set_attribute(self, '__dict__', _ordered_dict())
+        self._reset_private_attributes()
         if isinstance(initializer, collections.Mapping):
             for key, value in iteritems_breadth_first(
                 initializer,
@@ -113,11 +284,102 @@ class DotDict(collections.MutableMapping):
         elif initializer is not None:
             raise TypeError('can only initialize with a Mapping')
 
+    #--------------------------------------------------------------------------
+    def _reset_private_attributes(self):
+        _set_attribute(self, '_key_index', None)
+        # None until the DotDict is in an index that has been built
+        _set_attribute(self, '_key_index_memberships', None)
+        # weakrefs to the DotDicts that hold this one, None until a cache
+        # depends on the changes to this DotDict, see '_track_changes'
+        _set_attribute(self, '_parents', None)
+        # counts the changes to the keys of this DotDict and of all the
+        # DotDicts nested within it, once they're tracked
+        _set_attribute(self, '_modification_count', 0)
+        # (modification count, keys with dicts, keys without dicts)
+        _set_attribute(self, '_keys_breadth_first', None)
+
     #--------------------------------------------------------------------------
     def __setattr__(self, key, value):
         """this function saves keys into the mapping's __dict__."""
-        self._key_order.add(key)
-        self.__dict__[key] = value
+        a_dict = self.__dict__
+        if self._parents is None and self._key_index_memberships is None:
+            # neither a cache nor an index depends on this DotDict yet
+            a_dict[key] = value
+            return
+        old_value = a_dict.get(key, _not_present)
+        a_dict[key] = value
+        if self._parents is not None and old_value is not value:
+            # the __mro__ is searched rather than calling isinstance, which
+            # is slow for the abstract base classes
+            old_value_is_a_dot_dict = DotDict in type(old_value).__mro__
+            if old_value_is_a_dot_dict:
+                old_value._remove_parent(self)
+            if DotDict in type(value).__mro__:
+                value._add_parent(self)
+                self._count_modification()
+            elif old_value is _not_present or old_value_is_a_dot_dict:
+                self._count_modification()
+        if self._key_index_memberships:
+            self._update_key_indexes('set', key, old_value, value)
+
+    #--------------------------------------------------------------------------
+    def _track_changes(self):
+        """start counting the changes to this DotDict and to the DotDicts
+        nested within it.  Until a cache depends on the counts, building a
+        tree of DotDicts costs no more than filling its __dict__s."""
+        _set_attribute(self, '_parents', [])
+        pending = [self]
+        while pending:
+            a_dot_dict = pending.pop()
+            for value in six.itervalues(a_dot_dict.__dict__):
+                if DotDict in type(value).__mro__:
+                    if value._parents is None:
+                        _set_attribute(value, '_parents', [])
+                        pending.append(value)
+                    value._parents.append(weakref.ref(a_dot_dict))
+
+    #--------------------------------------------------------------------------
+    def _add_parent(self, a_parent):
+        if self._parents is None:
+            # a parent that is tracked tracks all that it holds
+            self._track_changes()
+        self._parents.append(weakref.ref(a_parent))
+
+    #--------------------------------------------------------------------------
+    def _remove_parent(self, a_parent):
+        for i, a_reference in enumerate(self._parents or ()):
+            if a_reference() is a_parent:
+                del self._parents[i]
+                return
+
+    #--------------------------------------------------------------------------
+    def _count_modification(self):
+        """count a change to this DotDict in it and in all the DotDicts that
+        hold it, directly or indirectly"""
+        a_dot_dict = self
+        # the usual case is a chain of DotDicts, each held in one place
+        hops = _longest_chain_of_parents
+        while hops:
+            _set_attribute(
+                a_dot_dict,
+                '_modification_count',
+                a_dot_dict._modification_count + 1
+            )
+            parents = a_dot_dict._parents
+            if not parents:
+                return
+            if len(parents) > 1:
+                _count_modifications(
+                    [x() for x in parents if x() is not None],
+                    set([id(a_dot_dict)])
+                )
+                return
+            a_dot_dict = parents[0]()
+            if a_dot_dict is None or a_dot_dict is self:
+                return
+            hops -= 1
+        # a long chain, it may be a cycle
+        _count_modifications([a_dot_dict], set())
 
     #--------------------------------------------------------------------------
     def __getattr__(self, key):
@@ -136,17 +398,87 @@ class DotDict(collections.MutableMapping):
     #--------------------------------------------------------------------------
     def __delattr__(self, key):
         try:
-            self._key_order.discard(key)
-        except ValueError:
+            # the __dict__ may be an OrderedDict, it must not be changed
+            # behind its back by object.__delattr__
+            old_value = self.__dict__.pop(key)
+        except KeyError:
             # we must be trying to delete something that wasn't a key
             # the next line will catch the error if it still is one
-            pass
-        super(DotDict, self).__delattr__(key)
+            object.__delattr__(self, key)
+        else:
+            if self._parents is not None:
+                if isinstance(old_value, DotDict):
+                    old_value._remove_parent(self)
+                self._count_modification()
+            if self._key_index_memberships:
+                self._update_key_indexes('delete', key, old_value)
+
+    #--------------------------------------------------------------------------
+    def _update_key_indexes(self, action, key, *values):
+        for a_reference, prefix in list(self._key_index_memberships):
+            an_index = a_reference()
+            if an_index is None:
+                # the root that enabled the index is gone
+                self._key_index_memberships.remove((a_reference, prefix))
+                continue
+            getattr(an_index, action)(prefix, key, *values)
+
+    #--------------------------------------------------------------------------
+    def enable_key_index(self):
+        """keep a flat index of all the qualified keys in the tree of nested
+        DotDicts rooted here, so that a dotted key, like 'a.b.c', is found
+        with one lookup.  The index follows the changes made to any DotDict
+        in the tree through the mapping or attribute interfaces.  It is built
+        by the first lookup of a dotted key."""
+        if self._key_index is None:
+            _set_attribute(self, '_key_index', _QualifiedKeyIndex(self))
+
+    #--------------------------------------------------------------------------
+    def disable_key_index(self):
+        if self._key_index is not None:
+            self._key_index.close(self)
+            _set_attribute(self, '_key_index', None)
+
+    #--------------------------------------------------------------------------
+    def __getstate__(self):
+        """the state for pickling and copying: the items in order and the
+        values of the slots of derived classes.  A '_parent' is left out, it
+        is a weakref proxy that gets restored by the parent.  So is the key
+        index, a copy starts without one."""
+        slot_values = {}
+        for a_class in type(self).__mro__:
+            for an_attribute in a_class.__dict__.get('__slots__', ()):
+                if an_attribute in _unpickled_attributes:
+                    continue
+                try:
+                    slot_values[an_attribute] = object.__getattribute__(
+                        self,
+                        an_attribute
+                    )
+                except AttributeError:
+                    # the slot was never set
+                    pass
+        return list(six.iteritems(self.__dict__)), slot_values
+
+    #--------------------------------------------------------------------------
+    def __setstate__(self, state):
+        items, slot_values = state
+        _set_attribute(self, '__dict__', _ordered_dict(items))
+        self._reset_private_attributes()
+        for an_attribute, value in six.iteritems(slot_values):
+            _set_attribute(self, an_attribute, value)
 
     #--------------------------------------------------------------------------
     def __getitem__(self, key):
         """define the square bracket operator to refer to the object's __dict__
         for fetching values.  It accepts keys in the form X.Y.Z"""
+        if self._key_index is not None:
+            try:
+                return self._key_index.get(key)
+            except (KeyError, TypeError):
+                # not indexed, the key may still be found by translation or
+                # acquisition in derived classes
+                pass
         try:
             key_split = key.split('.')
         except AttributeError:
@@ -193,31 +525,56 @@ class DotDict(collections.MutableMapping):
     #--------------------------------------------------------------------------
     def __iter__(self):
         """redirect the default iterator to iterate over the object's __dict__
-        making sure that it ignores the special '_' keys.  We want those items
-        ignored or we risk infinite recursion, not with this function, but
-        with the clients of this class deep within configman"""
-        return iter(self._key_order)
+        which holds nothing but the keys in order of insertion"""
+        return iter(self.__dict__)
 
     #--------------------------------------------------------------------------
     def __len__(self):
-        """makes the len function also ignore the '_' keys"""
-        return len(self._key_order)
+        return len(self.__dict__)
+
+    #--------------------------------------------------------------------------
+    @property
+    def _key_order(self):
+        """the keys in order of insertion.  The __dict__ keeps that order
+        itself now, this copy is kept for the code that used to read it."""
+        return OrderedSet(self.__dict__)
 
     #--------------------------------------------------------------------------
     def keys_breadth_first(self, include_dicts=False):
-        """a generator that returns all the keys in a set of nested
-        DotDict instances.  The keys take the form X.Y.Z"""
-        namespaces = []
-        for key in self._key_order:
-            if isinstance(getattr(self, key), DotDict):
-                namespaces.append(key)
-                if include_dicts:
-                    yield key
-            else:
-                yield key
-        for a_namespace in namespaces:
-            for key in self[a_namespace].keys_breadth_first(include_dicts):
-                yield '%s.%s' % (a_namespace, key)
+        """return an iterator of all the keys in a set of nested DotDict
+        instances.  The keys take the form X.Y.Z.  The lists of keys are
+        cached until this DotDict or one nested within it changes."""
+        if self._parents is None:
+            self._track_changes()
+        cached = self._keys_breadth_first
+        if cached is None or cached[0] != self._modification_count:
+            cached = (self._modification_count,) + self._list_keys()
+            _set_attribute(self, '_keys_breadth_first', cached)
+        if include_dicts:
+            return iter(cached[1])
+        return iter(cached[2])
+
+    #--------------------------------------------------------------------------
+    def _list_keys(self):
+        """return the lists of all the qualified keys with and without the
+        keys of the nested DotDicts"""
+        keys_with_dicts = []
+        keys = []
+        # a stack of (prefix, DotDict), each prefix is formatted just once
+        pending = [('', self)]
+        while pending:
+            prefix, a_dot_dict = pending.pop()
+            namespaces = []
+            for key, value in six.iteritems(a_dot_dict.__dict__):
+                qualified_key = prefix + key
+                keys_with_dicts.append(qualified_key)
+                if DotDict in type(value).__mro__:
+                    namespaces.append((qualified_key + '.', value))
+                else:
+                    keys.append(qualified_key)
+            # reversed so that the first namespace is next off the stack
+            pending.extend(reversed(namespaces))
+        return keys_with_dicts, keys
 
     #--------------------------------------------------------------------------
     def assign(self, key, value):
@@ -308,12 +665,85 @@ class DotDictWithAcquisition(DotDict):
     Contrarily, the form d['x.y.z.a'] is a single lookup operation that reveals
     that our goal is to get a value for 'a'.  Since this class has acquisition,
     and 'a' is defined in the base, it is perfectly allowable.
+
+    Each acquired value is found by climbing the chain of parents.  For trees
+    that are read far more often than they are changed, 'flatten_acquisition'
+    remembers where each acquired key was found, so that later reads of it go
+    straight there.
     """
 
+    __slots__ = ('_parent', '_acquired')
+
+    #--------------------------------------------------------------------------
+    def _reset_private_attributes(self):
+        super(DotDictWithAcquisition, self)._reset_private_attributes()
+        # None or a list: [a weakref to the root of the flattened tree, the
+        # modification count of the root, a mapping of the acquired keys to
+        # the DotDicts that hold them]
+        _set_attribute(self, '_acquired', None)
+
+    #--------------------------------------------------------------------------
+    def flatten_acquisition(self):
+        """remember, for this mapping and all the DotDictWithAcquisition
+        instances nested within it, the ancestor from which each acquired key
+        is taken, so that reading an acquired value costs a single lookup
+        rather than a climb through the parents.  The value itself is always
+        read from the ancestor, so replacing it is seen right away.  Adding
+        or removing keys anywhere in this tree forgets all that was
+        remembered.  The ancestors of this mapping are not watched, this is
+        meant for the root of a config.  Mappings that translate their keys
+        are left as they are."""
+        if self._parents is None:
+            self._track_changes()
+        self._set_acquisition_root(weakref.ref(self))
+
+    #--------------------------------------------------------------------------
+    def _set_acquisition_root(self, root_reference):
+        pending = [self]
+        while pending:
+            a_dot_dict = pending.pop()
+            if root_reference is None or hasattr(
+                type(a_dot_dict),
+                '_translation_tuples'
+            ):
+                acquired = None
+            else:
+                acquired = [root_reference, None, {}]
+            _set_attribute(a_dot_dict, '_acquired', acquired)
+            pending.extend(
+                x for x in six.itervalues(a_dot_dict.__dict__)
+                if isinstance(x, DotDictWithAcquisition)
+            )
+
+    #--------------------------------------------------------------------------
+    def _find_acquisition_holder(self, key, root):
+        """return the nearest ancestor, up to the root of the flattened tree,
+        that holds the key.  None means that no mapping in the tree holds it,
+        _not_present that the answer can't be remembered."""
+        a_dot_dict = self
+        root_dict = root.__dict__
+        try:
+            while a_dot_dict.__dict__ is not root_dict:
+                a_dot_dict = a_dot_dict._parent
+                if key in a_dot_dict.__dict__:
+                    return a_dot_dict
+            # the root has a parent of its own, its changes aren't watched
+            root._parent
+        except AttributeError:
+            # the top of the chain of parents
+            return None
+        return _not_present
+
     #--------------------------------------------------------------------------
     def __getitem__(self, key):
         """define the square bracket operator to refer to the object's __dict__
         for fetching values.  It accepts keys in the form 'x.y.z'"""
+        if self._key_index is not None:
+            try:
+                return self._key_index.get(key)
+            except KeyError:
+                # not in this tree, it may yet be acquired
+                pass
         key_split = key.split('.')
         last_index = len(key_split) - 1
         current = self
@@ -324,18 +754,27 @@ class DotDictWithAcquisition(DotDict):
                 if i == last_index:
                     raise
                 temp_dict = DotDictWithAcquisition()
-                temp_dict.__dict__['_parent'] = weakref.proxy(current)
+                _set_attribute(
+                    temp_dict,
+                    '_parent',
+                    weakref.proxy(current)
+                )
                 current = temp_dict
         return current
 
     #--------------------------------------------------------------------------
     def __setattr__(self, key, value):
         """this function saves keys into the mapping's __dict__.  If the
-        item being added is another instance of DotDict, it makes a weakref
-        proxy object of itself and assigns it to '_parent' in the incoming
-        DotDict."""
-        if isinstance(value, DotDict) and key != '_parent':
-            value.__dict__['_parent'] = weakref.proxy(self)
+        item being added is another instance of DotDictWithAcquisition, it
+        makes a weakref proxy object of itself and assigns it to '_parent' in
+        the incoming DotDict."""
+        if isinstance(value, DotDictWithAcquisition):
+            _set_attribute(value, '_parent', weakref.proxy(self))
+            if self._acquired is not None or value._acquired is not None:
+                # the nested mapping joins this tree's flattening, if any
+                value._set_acquisition_root(
+                    self._acquired[0] if self._acquired is not None else None
+                )
         super(DotDictWithAcquisition, self).__setattr__(key, value)
 
     #--------------------------------------------------------------------------
@@ -345,12 +784,25 @@ class DotDictWithAcquisition(DotDict):
         parent class."""
         if key == '_parent':
             raise AttributeError('_parent')
+        acquired = self._acquired
+        if acquired is not None and not key.startswith('__'):
+            root = acquired[0]()
+            if root is not None:
+                if acquired[1] != root._modification_count:
+                    acquired[1] = root._modification_count
+                    acquired[2].clear()
+                try:
+                    holder = acquired[2][key]
+                except KeyError:
+                    holder = self._find_acquisition_holder(key, root)
+                    if holder is not _not_present:
+                        acquired[2][key] = holder
+                if holder is None:
+                    raise KeyError(key)
+                if holder is not _not_present:
+                    return holder.__dict__[key]
         try:
-            if six.PY2:
-                _parent = self._parent
-            else:
-                _parent = object.__getattribute__(self, '_parent')
-            return getattr(_parent, key)
+            return getattr(self._parent, key)
         except AttributeError:  # no parent attribute
             # the copy.deepcopy function will try to probe this class for an
             # instance of __deepcopy__.  If an AttributeError is raised, then
@@ -362,6 +814,257 @@ class DotDictWithAcquisition(DotDict):
                 raise
             raise KeyError(key)
 
+    #--------------------------------------------------------------------------
+    def __setstate__(self, state):
+        """restore the '_parent' of the nested mappings, it isn't part of
+        the pickled state"""
+        super(DotDictWithAcquisition, self).__setstate__(state)
+        for value in six.itervalues(self.__dict__):
+            if isinstance(value, DotDictWithAcquisition):
+                _set_attribute(value, '_parent', weakref.proxy(self))
+
+
+#==============================================================================
+class FrozenDotDict(DotDict):
+    """An immutable DotDict.  Once constructed, neither it nor the mappings
+    nested within it can be changed, so a single instance can be shared by
+    any number of threads without locks or copies:
+
+        d = FrozenDotDict({'a': 1, 'b': {'c': 2}})
+        assert d.b.c == 2
+        try:
+            d.a = 3
+        except TypeError:
+            print('FrozenDotDict instances cannot be changed')
+
+    It compares equal to any mapping with the same items and, as long as all
+    the values are hashable, it can be hashed.  Both copy.copy and
+    copy.deepcopy return the instance itself.  The values are not copied or
+    frozen, so a mutable value, like a list, stays mutable.
+
+    A changed tree is made with 'evolve', which shares every nested mapping
+    that it doesn't change with the original:
+
+        d2 = d.evolve(a=3, b__c=4)
+        assert d2.b.c == 4 and d.b.c == 2
+
+    As a 'mapping_class' for 'ConfigurationManager.get_config', the config
+    is built as a 'mutable_counterpart' and then frozen.
+    """
+
+    __slots__ = ('_hash',)
+
+    # the class of mapping that is built and then frozen
+    mutable_counterpart = DotDict
+
+    #--------------------------------------------------------------------------
+    def __init__(self, initializer=None):
+        super(FrozenDotDict, self).__init__()
+        if initializer is None:
+            return
+        if not isinstance(initializer, DotDict):
+            # expands keys of the form 'x.y.z' into nested mappings
+            initializer = self.mutable_counterpart(initializer)
+        a_dict = self.__dict__
+        for key, value in six.iteritems(initializer.__dict__):
+            a_dict[key] = self._frozen(value)
+
+    #--------------------------------------------------------------------------
+    @classmethod
+    def freeze(cls, a_mapping):
+        """return a frozen copy of a mapping.  An instance of this class is
+        returned as it is."""
+        if type(a_mapping) is cls:
+            return a_mapping
+        return cls(a_mapping)
+
+    #--------------------------------------------------------------------------
+    def _frozen(self, value):
+        if isinstance(value, collections.Mapping):
+            return self.freeze(value)
+        return value
+
+    #--------------------------------------------------------------------------
+    def _reset_private_attributes(self):
+        super(FrozenDotDict, self)._reset_private_attributes()
+        _set_attribute(self, '_hash', None)
+
+    #--------------------------------------------------------------------------
+    def __setattr__(self, key, value):
+        raise TypeError(
+            "'%s' object cannot be changed, use 'evolve'"
+            % self.__class__.__name__
+        )
+
+    #--------------------------------------------------------------------------
+    def __delattr__(self, key):
+        raise TypeError(
+            "'%s' object cannot be changed, use 'evolve'"
+            % self.__class__.__name__
+        )
+
+    #--------------------------------------------------------------------------
+    def __hash__(self):
+        if self._hash is None:
+            _set_attribute(
+                self,
+                '_hash',
+                hash(frozenset(six.iteritems(self.__dict__)))
+            )
+        return self._hash
+
+    #--------------------------------------------------------------------------
+    def __copy__(self):
+        return self
+
+    #--------------------------------------------------------------------------
+    def __deepcopy__(self, memo):
+        return self
+
+    #--------------------------------------------------------------------------
+    def evolve(self, **changes):
+        """return a new instance with the changes applied.  A doubled
+        underscore in the name of a change stands for the '.' of a key of the
+        form 'x.y.z', nested mappings that don't exist are created.  Changes
+        are applied in the order of their sorted keys, so 'a' is replaced
+        before 'a__b'.  The mappings on the paths to the changed keys are
+        copied, all the others are shared with this instance."""
+        evolved = self
+        for key in sorted(changes):
+            evolved = evolved._replace(
+                key.replace('__', '.').split('.'),
+                changes[key]
+            )
+        return evolved
+
+    #--------------------------------------------------------------------------
+    def _replace(self, key_split, value):
+        """return a copy of this mapping with the value at the path of keys
+        replaced"""
+        items = _ordered_dict(self.__dict__)
+        key = key_split[0]
+        if len(key_split) == 1:
+            items[key] = self._frozen(value)
+        else:
+            try:
+                nested_mapping = items[key]
+            except KeyError:
+                nested_mapping = self.__class__()
+            if not isinstance(nested_mapping, FrozenDotDict):
+                raise TypeError(
+                    "'%s' is not a mapping that can hold '%s'"
+                    % (key, '.'.join(key_split[1:]))
+                )
+            items[key] = nested_mapping._replace(key_split[1:], value)
+        return self._from_items(items)
+
+    #--------------------------------------------------------------------------
+    def _from_items(self, items):
+        """a new instance of this class that takes the ordered mapping of
+        'items' as its own"""
+        new_instance = self.__class__()
+        _set_attribute(new_instance, '__dict__', items)
+        return new_instance
+
+
+#==============================================================================
+class PersistentDotDict(FrozenDotDict):
+    """A FrozenDotDict that is changed by making new versions of itself.
+    Setting or deleting a key, including a key of the form 'x.y.z', returns
+    a new tree that shares every mapping off the path to the key with the
+    old one, so deriving a slightly different config costs the copying of a
+    few mappings rather than of the whole tree:
+
+        base = PersistentDotDict({'timeout': 10, 'database.port': 5432})
+        tenant = base.set('timeout', 30)
+        assert base.timeout == 10 and tenant.timeout == 30
+        assert tenant.database is base.database
+    """
+
+    __slots__ = ()
+
+    #--------------------------------------------------------------------------
+    def set(self, key, value):
+        """return a new tree with the key set to the value.  Nested mappings
+        that don't exist are created."""
+        return self._replace(key.split('.'), value)
+
+    #--------------------------------------------------------------------------
+    def delete(self, key):
+        """return a new tree without the key"""
+        try:
+            return self._without(key.split('.'))
+        except KeyError:
+            raise KeyError(key)
+
+    #--------------------------------------------------------------------------
+    def _without(self, key_split):
+        items = _ordered_dict(self.__dict__)
+        key = key_split[0]
+        if len(key_split) == 1:
+            del items[key]
+        else:
+            nested_mapping = items[key]
+            if not isinstance(nested_mapping, PersistentDotDict):
+                raise KeyError(key)
+            items[key] = nested_mapping._without(key_split[1:])
+        return self._from_items(items)
+
+
+#------------------------------------------------------------------------------
+def _translations_are_independent(translation_tuples):
+    """True if applying the translations all at once gives the same result
+    as applying them one after the other: no original substring shares a
+    character with another, or with any substitution, so no translation
+    can make or break a match of another"""
+    originals = [x[0] for x in translation_tuples]
+    original_characters = set(''.join(originals))
+    return (
+        all(originals)
+        and len(original_characters) == sum(len(x) for x in originals)
+        and not original_characters.intersection(
+            ''.join(x[1] for x in translation_tuples)
+        )
+    )
+
+
+#------------------------------------------------------------------------------
+@memoize()
+def _compile_key_translation(translation_tuples):
+    """return a function that applies the translations to a key.  Tables of
+    independent translations are applied in one pass, with str.translate if
+    every original substring is a single character and with a compiled
+    regular expression otherwise.  The translated keys are cached by the
+    returned function, the translations of keys are shared by all the
+    classes with the same translation tuples."""
+    translation_tuples = tuple(translation_tuples)
+    if not _translations_are_independent(translation_tuples):
+        def translate_key(key):
+            for original, replacement in translation_tuples:
+                key = key.replace(original, replacement)
+            return key
+        return memoize()(translate_key)
+
+    if six.PY3 and all(len(x[0]) == 1 for x in translation_tuples):
+        table = dict((ord(x[0]), x[1]) for x in translation_tuples)
+
+        def translate_key(key):
+            return key.translate(table)
+        # a translation this cheap costs less than looking it up in a cache
+        return translate_key
+
+    replacements = dict(translation_tuples)
+    pattern = re.compile('|'.join(
+        re.escape(x) for x in sorted(replacements, key=len, reverse=True)
+    ))
+
+    def replace(match):
+        return replacements[match.group(0)]
+
+    def translate_key(key):
+        return pattern.sub(replace, key)
+    return memoize()(translate_key)
+
 
 #------------------------------------------------------------------------------
 def create_key_translating_dot_dict(
@@ -384,16 +1087,14 @@ def create_key_translating_dot_dict(
     #==========================================================================
     class DotDictWithKeyTranslations(base_class):
 
-        def __init__(self, *args, **kwargs):
-            self.__dict__['_translation_tuples'] = translation_tuples
-            super(DotDictWithKeyTranslations, self).__init__(*args, **kwargs)
+        __slots__ = ()
 
-        #----------------------------------------------------------------------
-        @memoize()
-        def _translate_key(self, key):
-            for original, replacement in self._translation_tuples:
-                key = key.replace(original, replacement)
-            return key
+        _translation_tuples = translation_tuples
+
+        # compiled once for the class, it holds no instances
+        _translate_key = staticmethod(
+            _compile_key_translation(tuple(translation_tuples))
+        )
 
         #----------------------------------------------------------------------
         def assign(self, key, value):
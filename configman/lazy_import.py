@@ -0,0 +1,139 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""This module implements the stand-ins for classes that are known from a
+manifest, see the module 'manifest'.  While a ConfigurationManager with a
+manifest is at work, a class option whose value names a class in the
+manifest gets a LazyImport rather than the class itself.  The LazyImport
+offers the class's required config from the manifest, so the overlay and
+expansion can proceed without importing the class's module.  The module is
+imported the first time the value is actually used: called, or asked for an
+attribute.
+
+The manifest is passed explicitly, to Option.set_value and on to
+'lazy_object', so that ConfigurationManagers at work in different threads
+don't see each other's manifests.
+
+A LazyImport is not the class: identity and isinstance checks see the
+stand-in.  Code that needs the class itself should use 'resolve'.
+"""
+from __future__ import absolute_import, division, print_function
+
+import threading
+
+from configman.converters import str_to_python_object, to_string_converters
+
+
+#==============================================================================
+class LazyImport(object):
+    """a stand-in for the class, or function, of a dotted name that imports
+    it on first use"""
+
+    __slots__ = ('dotted_name', '_required_config', '_resolved', '_lock')
+
+    #--------------------------------------------------------------------------
+    def __init__(self, dotted_name, required_config=None):
+        """parameters:
+            dotted_name - the name of the class or function
+            required_config - the required config of the class, a Namespace,
+                              None if it has none"""
+        object.__setattr__(self, 'dotted_name', dotted_name)
+        object.__setattr__(self, '_required_config', required_config)
+        object.__setattr__(self, '_resolved', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    #--------------------------------------------------------------------------
+    def resolve(self):
+        """import and return the object of the dotted name"""
+        resolved = self._resolved
+        if resolved is None:
+            with self._lock:
+                resolved = self._resolved
+                if resolved is None:
+                    resolved = str_to_python_object(self.dotted_name)
+                    object.__setattr__(self, '_resolved', resolved)
+        return resolved
+
+    #--------------------------------------------------------------------------
+    @property
+    def is_resolved(self):
+        return self._resolved is not None
+
+    #--------------------------------------------------------------------------
+    def get_required_config(self):
+        if self._required_config is None:
+            raise AttributeError('get_required_config')
+        return self._required_config
+
+    #--------------------------------------------------------------------------
+    def to_str(self):
+        """used by 'converters.to_str', the name is written without
+        importing anything"""
+        return self.dotted_name
+
+    #--------------------------------------------------------------------------
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    #--------------------------------------------------------------------------
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
+    #--------------------------------------------------------------------------
+    def __setattr__(self, name, value):
+        setattr(self.resolve(), name, value)
+
+    #--------------------------------------------------------------------------
+    def __eq__(self, other):
+        if isinstance(other, LazyImport):
+            return self.dotted_name == other.dotted_name
+        return self._resolved is not None and self._resolved is other
+
+    #--------------------------------------------------------------------------
+    def __ne__(self, other):
+        return not self == other
+
+    #--------------------------------------------------------------------------
+    def __hash__(self):
+        return hash(self.dotted_name)
+
+    #--------------------------------------------------------------------------
+    def __copy__(self):
+        return self
+
+    #--------------------------------------------------------------------------
+    def __deepcopy__(self, memo):
+        return self
+
+    #--------------------------------------------------------------------------
+    def __reduce__(self):
+        # pickled as the object itself, it is imported when unpickled
+        return str_to_python_object, (self.dotted_name,)
+
+    #--------------------------------------------------------------------------
+    def __repr__(self):
+        return '<LazyImport: %r>' % self.dotted_name
+
+
+# the help and the config files name the class without importing it
+to_string_converters[LazyImport] = LazyImport.to_str
+
+
+#------------------------------------------------------------------------------
+def lazy_object(dotted_name, a_manifest):
+    """return a LazyImport for the dotted name if the manifest knows its
+    class and the class's module has not been imported yet, otherwise
+    return None"""
+    if a_manifest is None:
+        return None
+    return a_manifest.lazy_object(dotted_name)
+
+
+#------------------------------------------------------------------------------
+def resolve(a_value):
+    """return the object that a value stands for, importing it if the value
+    is a LazyImport"""
+    if isinstance(a_value, LazyImport):
+        return a_value.resolve()
+    return a_value
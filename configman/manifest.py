@@ -0,0 +1,505 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""This module implements manifests of the required config of classes.  To
+expand a class option, a ConfigurationManager must import the class to ask
+it for its required config.  For applications with many plugins, printing
+the help or dumping the configuration imports every one of them, even though
+none of them are used.
+
+A manifest records, for each class, its required config: the names,
+defaults, docs and converters of its options, its namespaces and
+aggregations.  The classes named by the class options within a required
+config are recorded too.  Given a manifest, a ConfigurationManager reads the
+required config of a class from the manifest rather than importing the
+class.  The value of the class option becomes a LazyImport that imports the
+class when it is used, see the module 'lazy_import'.
+
+A manifest is written by a program that has imported the classes, usually
+with 'generate' from a ConfigurationManager that resolved the application's
+configuration.  It is a JSON file:
+
+    {
+        "format": 1,
+        "configman": "<the version of configman>",
+        "classes": {
+            "<dotted name of a class>": {
+                "dependencies": {"<pathname>": "<modification signature>"},
+                "required_config": [
+                    {"key": "a_namespace", "type": "namespace", ...},
+                    {"key": "a_namespace.an_option", "type": "option", ...},
+                    ...
+                ]
+            }
+        }
+    }
+
+The dependencies are the source files of the class and of its base classes.
+If any of them has changed since the manifest was written, the class is
+imported as usual.  Classes whose required config can't be written, those
+with options that use lambdas or defaults that can't be converted from a
+string and back, are left out of the manifest, they are imported as usual.
+"""
+from __future__ import absolute_import, division, print_function
+
+import collections
+import inspect
+import json
+import os
+import sys
+import tempfile
+
+import six
+
+import configman
+from configman.config_exceptions import CannotConvertError
+from configman.converters import (
+    known_mapping_type_to_str,
+    str_quote_stripper,
+    str_to_python_object,
+    to_str,
+)
+from configman.dotdict import iteritems_breadth_first
+from configman.lazy_import import LazyImport, resolve
+from configman.namespace import Namespace
+from configman.option import Option, Aggregation
+from configman.source_files import source_file_of, stat_signature
+
+# increment this if the layout of the manifest changes
+MANIFEST_FORMAT = 1
+
+# the attributes of an Option that are written as they are
+_option_attributes = (
+    'doc',
+    'short_form',
+    'is_argument',
+    'exclude_from_print_conf',
+    'exclude_from_dump_conf',
+    'likely_to_be_changed',
+    'not_for_definition',
+    'reference_value_from',
+    'secret',
+)
+
+
+#==============================================================================
+class ManifestError(Exception):
+    """raised when something in a required config cannot be written to a
+    manifest"""
+    pass
+
+
+#------------------------------------------------------------------------------
+def _normalized_name(dotted_name):
+    """return the dotted name in the form that str_to_python_object resolves
+    it or None if it isn't a string"""
+    if not isinstance(dotted_name, six.string_types):
+        return None
+    return '.'.join(
+        x.strip() for x in str_quote_stripper(dotted_name).split('.')
+        if x.strip()
+    )
+
+
+#------------------------------------------------------------------------------
+def _dotted_name(an_object):
+    """return the name by which str_to_python_object finds the object, raise
+    ManifestError if there isn't one"""
+    try:
+        return known_mapping_type_to_str[an_object]
+    except (KeyError, TypeError):
+        pass
+    if inspect.ismodule(an_object):
+        dotted_name = an_object.__name__
+    else:
+        module_name = getattr(an_object, '__module__', None)
+        name = getattr(
+            an_object,
+            '__qualname__',
+            getattr(an_object, '__name__', None)
+        )
+        if not module_name or module_name == '__main__' or not name:
+            raise ManifestError(repr(an_object))
+        dotted_name = '%s.%s' % (module_name, name)
+    try:
+        if str_to_python_object(dotted_name) is an_object:
+            return dotted_name
+    except CannotConvertError:
+        pass
+    # a lambda, a locally defined class or something that was replaced
+    raise ManifestError(repr(an_object))
+
+
+#------------------------------------------------------------------------------
+def _required_config_of(a_class):
+    """return the required config of a class the way that the expansion of
+    a class option finds it, or None if it has none"""
+    try:
+        required_config = a_class.get_required_config()
+    except (AttributeError, KeyError):
+        required_config = getattr(a_class, 'required_config', None)
+    if not isinstance(required_config, collections.Mapping):
+        return None
+    if not isinstance(required_config, Namespace):
+        required_config = Namespace(initializer=required_config)
+    return required_config
+
+
+#------------------------------------------------------------------------------
+def _class_named_by(an_option):
+    """return the class that is the default of a class option, or None"""
+    if an_option.from_string_converter is not str_to_python_object:
+        return None
+    default = an_option.default
+    if isinstance(default, six.string_types):
+        try:
+            default = str_to_python_object(default)
+        except CannotConvertError:
+            return None
+    if inspect.isclass(default):
+        return default
+    return None
+
+
+#------------------------------------------------------------------------------
+def _encode_default(an_option):
+    default = an_option.default
+    if default is None or isinstance(
+        default,
+        (bool, float) + six.integer_types + six.string_types
+    ):
+        return {'value': default}
+    if (
+        inspect.isclass(default)
+        or inspect.isroutine(default)
+        or inspect.ismodule(default)
+    ):
+        if an_option.from_string_converter is not str_to_python_object:
+            raise ManifestError(repr(default))
+        return {'object': _dotted_name(default)}
+    # anything else is written as a string, if it survives the round trip
+    try:
+        if an_option.to_string_converter is not None:
+            a_string = an_option.to_string_converter(default)
+        else:
+            a_string = to_str(default)
+        survives = an_option.from_string_converter(a_string) == default
+    except Exception:
+        survives = False
+    if not survives:
+        raise ManifestError(repr(default))
+    return {'string': a_string}
+
+
+#------------------------------------------------------------------------------
+def _decode_default(encoded_default, from_string_converter, a_manifest):
+    """return the default as the option had it"""
+    if 'value' in encoded_default:
+        return encoded_default['value']
+    if 'object' in encoded_default:
+        dotted_name = encoded_default['object']
+        if a_manifest.knows(dotted_name):
+            lazy_object = a_manifest.lazy_object(dotted_name)
+            if lazy_object is not None:
+                return lazy_object
+        # it may have a required config that must be expanded
+        return str_to_python_object(dotted_name)
+    return from_string_converter(encoded_default['string'])
+
+
+#------------------------------------------------------------------------------
+def _encode_required_config(required_config, nested_classes):
+    """return the list of entries for a required config, appending the
+    classes named by its class options to 'nested_classes'"""
+    entries = []
+    for key, value in iteritems_breadth_first(
+        required_config,
+        include_dicts=True
+    ):
+        if isinstance(value, Option):
+            if value.foreign_data is not None:
+                raise ManifestError(key)
+            entry = {
+                'key': key,
+                'type': 'option',
+                'default': _encode_default(value),
+                'from_string_converter': None,
+                'to_string_converter': None,
+            }
+            for converter_name in (
+                'from_string_converter',
+                'to_string_converter'
+            ):
+                converter = getattr(value, converter_name)
+                if converter is not None:
+                    entry[converter_name] = _dotted_name(converter)
+            for attribute in _option_attributes:
+                entry[attribute] = getattr(value, attribute)
+            a_class = _class_named_by(value)
+            if a_class is not None:
+                nested_classes.append(a_class)
+        elif isinstance(value, Aggregation):
+            entry = {
+                'key': key,
+                'type': 'aggregation',
+                'function': _dotted_name(value.function),
+                'secret': value.secret,
+            }
+        elif isinstance(value, Namespace):
+            entry = {
+                'key': key,
+                'type': 'namespace',
+                'doc': value._doc,
+                'reference_value_from': value._reference_value_from,
+            }
+        else:
+            raise ManifestError(key)
+        entries.append(entry)
+    return entries
+
+
+#------------------------------------------------------------------------------
+def _decode_required_config(entries, a_manifest):
+    required_config = Namespace()
+    for entry in entries:
+        parent_key, _, name = entry['key'].rpartition('.')
+        if parent_key:
+            parent = required_config[parent_key]
+        else:
+            parent = required_config
+        if entry['type'] == 'namespace':
+            a_namespace = Namespace(doc=entry['doc'])
+            if entry['reference_value_from']:
+                a_namespace.ref_value_namespace()
+            setattr(parent, name, a_namespace)
+        elif entry['type'] == 'aggregation':
+            # the function is imported when the aggregation is made
+            parent.add_aggregation(
+                name,
+                LazyImport(entry['function']),
+                entry['secret']
+            )
+        else:
+            converters = {}
+            for converter_name in (
+                'from_string_converter',
+                'to_string_converter'
+            ):
+                converters[str(converter_name)] = (
+                    str_to_python_object(entry[converter_name])
+                    if entry[converter_name] is not None else None
+                )
+            kwargs = dict(
+                (str(x), entry[x]) for x in _option_attributes
+            )
+            kwargs.update(converters)
+            parent.add_option(
+                name,
+                default=_decode_default(
+                    entry['default'],
+                    converters['from_string_converter'],
+                    a_manifest
+                ),
+                **kwargs
+            )
+    return required_config
+
+
+#------------------------------------------------------------------------------
+def _dependencies_of(a_class):
+    """return a mapping of the source files of the class and its bases to
+    their modification signatures"""
+    dependencies = {}
+    for a_base in inspect.getmro(a_class):
+        pathname = source_file_of(a_base)
+        if pathname and pathname not in dependencies:
+            dependencies[pathname] = stat_signature(pathname)
+    return dependencies
+
+
+#==============================================================================
+class Manifest(object):
+
+    #--------------------------------------------------------------------------
+    def __init__(self, classes=None):
+        # the dotted names of classes -> their entries in the manifest
+        self.classes = {} if classes is None else classes
+        # the dotted names of classes -> whether their source files are
+        # unchanged, each class is checked once
+        self._up_to_date = {}
+
+    #--------------------------------------------------------------------------
+    @classmethod
+    def load(cls, pathname):
+        """return the manifest in a file.  A missing, unreadable or outdated
+        manifest file gives an empty manifest, every class is then imported
+        as usual."""
+        try:
+            with open(pathname) as f:
+                document = json.load(f)
+            if document['format'] != MANIFEST_FORMAT:
+                return cls()
+            return cls(dict(document['classes']))
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return cls()
+
+    #--------------------------------------------------------------------------
+    def save(self, pathname):
+        document = json.dumps(
+            {
+                'format': MANIFEST_FORMAT,
+                'configman': configman.__version__,
+                'classes': self.classes,
+            },
+            indent=1,
+            sort_keys=True
+        )
+        # write to a temporary file and rename it so that a concurrently
+        # starting application never sees a partially written manifest
+        file_descriptor, temporary_pathname = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(pathname)),
+            prefix='.configman_manifest_'
+        )
+        with os.fdopen(file_descriptor, 'w') as f:
+            f.write(document)
+        os.rename(temporary_pathname, pathname)
+
+    #--------------------------------------------------------------------------
+    def add_class(self, a_class):
+        """add a class, and the classes named by the class options of its
+        required config, to the manifest.  The class may be given by its
+        dotted name.
+
+        returns:
+            True if the class is in the manifest, False if it has no
+            required config or its required config cannot be written"""
+        if isinstance(a_class, six.string_types):
+            a_class = str_to_python_object(a_class)
+        a_class = resolve(a_class)
+        try:
+            dotted_name = _dotted_name(a_class)
+        except ManifestError:
+            return False
+        pending_classes = [a_class]
+        seen = set()
+        while pending_classes:
+            a_pending_class = pending_classes.pop()
+            if a_pending_class in seen:
+                continue
+            seen.add(a_pending_class)
+            required_config = _required_config_of(a_pending_class)
+            if required_config is None:
+                continue
+            nested_classes = []
+            try:
+                name = _dotted_name(a_pending_class)
+                entries = _encode_required_config(
+                    required_config,
+                    nested_classes
+                )
+                json.dumps(entries)
+            except (ManifestError, TypeError, ValueError):
+                continue
+            self.classes[name] = {
+                'dependencies': _dependencies_of(a_pending_class),
+                'required_config': entries,
+            }
+            self._up_to_date[name] = True
+            pending_classes.extend(nested_classes)
+        return dotted_name in self.classes
+
+    #--------------------------------------------------------------------------
+    def add_classes_of(self, option_definitions):
+        """add the classes that are the values of the class options of a
+        resolved set of option definitions"""
+        for key, an_option in iteritems_breadth_first(option_definitions):
+            if (
+                isinstance(an_option, Option)
+                and an_option.from_string_converter is str_to_python_object
+            ):
+                a_value = resolve(an_option.value)
+                if inspect.isclass(a_value):
+                    self.add_class(a_value)
+
+    #--------------------------------------------------------------------------
+    def _is_up_to_date(self, dotted_name):
+        try:
+            return self._up_to_date[dotted_name]
+        except KeyError:
+            pass
+        try:
+            up_to_date = all(
+                stat_signature(pathname) == signature
+                for pathname, signature in six.iteritems(
+                    self.classes[dotted_name]['dependencies']
+                )
+            )
+        except (KeyError, TypeError, AttributeError):
+            up_to_date = False
+        self._up_to_date[dotted_name] = up_to_date
+        return up_to_date
+
+    #--------------------------------------------------------------------------
+    def knows(self, dotted_name):
+        """return True if the manifest has an up to date entry for the class
+        of the dotted name"""
+        dotted_name = _normalized_name(dotted_name)
+        return (
+            dotted_name in self.classes
+            and self._is_up_to_date(dotted_name)
+        )
+
+    #--------------------------------------------------------------------------
+    def required_config(self, dotted_name):
+        """return the required config of a class as a new Namespace, or None
+        if the manifest doesn't know the class or the class has changed
+        since the manifest was written"""
+        if not self.knows(dotted_name):
+            return None
+        dotted_name = _normalized_name(dotted_name)
+        try:
+            return _decode_required_config(
+                self.classes[dotted_name]['required_config'],
+                self
+            )
+        except (
+            KeyError,
+            TypeError,
+            ValueError,
+            AttributeError,
+            CannotConvertError
+        ):
+            # a damaged entry, the class is imported as usual
+            return None
+
+    #--------------------------------------------------------------------------
+    def lazy_object(self, dotted_name):
+        """return a LazyImport for a class of the manifest whose module has
+        not been imported yet, otherwise None"""
+        dotted_name = _normalized_name(dotted_name)
+        if dotted_name not in self.classes:
+            return None
+        if dotted_name.rsplit('.', 1)[0] in sys.modules:
+            # there is nothing to be saved
+            return None
+        required_config = self.required_config(dotted_name)
+        if required_config is None:
+            return None
+        return LazyImport(dotted_name, required_config)
+
+
+#------------------------------------------------------------------------------
+def generate(pathname, config_manager, classes=()):
+    """write a manifest of the classes that are the values of the class
+    options of a ConfigurationManager, and of any other classes given, such
+    as the alternatives to the classes that the configuration chose.
+
+    returns:
+        the Manifest"""
+    a_manifest = Manifest()
+    a_manifest.add_classes_of(config_manager.option_definitions)
+    for a_class in classes:
+        a_manifest.add_class(a_class)
+    a_manifest.save(pathname)
+    return a_manifest
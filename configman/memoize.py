@@ -2,39 +2,329 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 from __future__ import absolute_import, division, print_function
-from functools import wraps
+
+import collections
+import functools
+import sys
+import threading
+import time
+import weakref
+
+from configman import cache_registry
+from configman.orderedset import OrderedDict
+
+# the clock for the time to live of the cached results
+_now = getattr(time, 'monotonic', time.time)
+
+CacheInfo = collections.namedtuple(
+    'CacheInfo',
+    ('hits', 'misses', 'evictions', 'max_size', 'size')
+)
+
+
+#==============================================================================
+class _LRUCache(object):
+    """a thread safe mapping of keys to results that evicts the least
+    recently used result when it is full and forgets results that are older
+    than their time to live"""
+
+    #--------------------------------------------------------------------------
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        # keys to tuples of (result, expiry time)
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    #--------------------------------------------------------------------------
+    def get(self, key):
+        """return the result for the key or raise KeyError"""
+        with self.lock:
+            try:
+                result, expiry = self.entries.pop(key)
+            except KeyError:
+                self.misses += 1
+                raise
+            if expiry is not None and expiry <= _now():
+                self.misses += 1
+                self.evictions += 1
+                raise KeyError(key)
+            # reinserted as the most recently used
+            self.entries[key] = (result, expiry)
+            self.hits += 1
+            return result
+
+    #--------------------------------------------------------------------------
+    def put(self, key, result):
+        expiry = _now() + self.ttl if self.ttl is not None else None
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = (result, expiry)
+            while (
+                self.max_size is not None
+                and len(self.entries) > self.max_size
+            ):
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    #--------------------------------------------------------------------------
+    def bytes(self):
+        """the approximate size of the cache, the results are not followed
+        beyond their own size"""
+        with self.lock:
+            entries = list(self.entries.items())
+            total = sys.getsizeof(self.entries)
+        for key, (result, expiry) in entries:
+            total += sys.getsizeof(key) + sys.getsizeof(result)
+        return total
+
+    #--------------------------------------------------------------------------
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    #--------------------------------------------------------------------------
+    def info(self):
+        with self.lock:
+            return CacheInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                self.max_size,
+                len(self.entries)
+            )
+
+
+#==============================================================================
+class _WeakArgument(object):
+    """an argument in a cache key that is held by a weak reference.  It is
+    equal to another only while both refer to the same living object, so an
+    entry of an object that has gone is never found again and waits to be
+    evicted."""
+
+    __slots__ = ('reference', 'hash')
+
+    #--------------------------------------------------------------------------
+    def __init__(self, an_object):
+        self.reference = weakref.ref(an_object)
+        self.hash = id(an_object)
+
+    #--------------------------------------------------------------------------
+    def __hash__(self):
+        return self.hash
+
+    #--------------------------------------------------------------------------
+    def __eq__(self, other):
+        if not isinstance(other, _WeakArgument):
+            return False
+        an_object = self.reference()
+        return an_object is not None and an_object is other.reference()
+
+    #--------------------------------------------------------------------------
+    def __ne__(self, other):
+        return not self == other
+
+
+# types -> whether their instances are held weakly in the cache keys
+_held_weakly_by_type = weakref.WeakKeyDictionary()
+
+
+#------------------------------------------------------------------------------
+def _is_held_weakly(an_argument):
+    """an argument is held weakly if it compares by identity, as a class or
+    a ConfigurationManager does, and it can be weakly referenced.  Keeping
+    such arguments alive in a cache would pin them, and everything that they
+    refer to, for nothing: an equal argument can only be the same object."""
+    a_type = type(an_argument)
+    try:
+        return _held_weakly_by_type[a_type]
+    except KeyError:
+        pass
+    except TypeError:
+        # a type that can't be weakly referenced itself
+        return False
+    compares_by_identity = not any(
+        '__eq__' in a_class.__dict__ or '__hash__' in a_class.__dict__
+        for a_class in a_type.__mro__
+        if a_class is not object
+    )
+    held_weakly = False
+    if compares_by_identity:
+        try:
+            weakref.ref(an_argument)
+            held_weakly = True
+        except TypeError:
+            pass
+    _held_weakly_by_type[a_type] = held_weakly
+    return held_weakly
 
 
 #------------------------------------------------------------------------------
-def memoize(max_cache_size=1000):
-    """Python 2.4 compatible memoize decorator.
-    It creates a cache that has a maximum size.  If the cache exceeds the max,
-    it is thrown out and a new one made.  With such behavior, it is wise to set
-    the cache just a little larger that the maximum expected need.
+def _key_part(an_argument):
+    if _is_held_weakly(an_argument):
+        return _WeakArgument(an_argument)
+    return an_argument
+
+
+#==============================================================================
+class _MemoizedFunction(object):
+    """the callable made by the memoize decorator.  Called as a function, it
+    keeps its results in its own cache.  Fetched as the attribute of an
+    instance, it binds to that instance and keeps the results in a cache of
+    the instance's own.  The instance caches are held in a weakly keyed
+    mapping, so memoizing a method doesn't keep its instances alive."""
+
+    #--------------------------------------------------------------------------
+    def __init__(self, function, max_cache_size, ttl):
+        functools.update_wrapper(self, function)
+        self._function = function
+        self._max_cache_size = max_cache_size
+        self._ttl = ttl
+        self._cache = _LRUCache(max_cache_size, ttl)
+        self._instance_caches = weakref.WeakKeyDictionary()
+        self._instance_caches_lock = threading.Lock()
+        cache_registry.register(self)
+
+    #--------------------------------------------------------------------------
+    def __call__(self, *args, **kwargs):
+        return _call_with_cache(self._cache, self._function, args, kwargs)
+
+    #--------------------------------------------------------------------------
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            with self._instance_caches_lock:
+                try:
+                    cache = self._instance_caches[instance]
+                except KeyError:
+                    cache = _LRUCache(self._max_cache_size, self._ttl)
+                    self._instance_caches[instance] = cache
+        except TypeError:
+            # an instance that can't be weakly referenced or hashed
+            # doesn't get a cache
+            cache = None
+        return _BoundMemoizedFunction(self._function, instance, cache)
+
+    #--------------------------------------------------------------------------
+    def _caches(self):
+        with self._instance_caches_lock:
+            return [self._cache] + list(self._instance_caches.values())
+
+    #--------------------------------------------------------------------------
+    def cache_info(self):
+        """the statistics of the function's cache and the caches of all the
+        instances that are still alive, added together.  The max_size is
+        the limit of all of these caches together, the limit of each cache
+        times the number of caches, so the size never exceeds it."""
+        infos = [x.info() for x in self._caches()]
+        if self._max_cache_size is None:
+            max_size = None
+        else:
+            max_size = self._max_cache_size * len(infos)
+        return CacheInfo(
+            sum(x.hits for x in infos),
+            sum(x.misses for x in infos),
+            sum(x.evictions for x in infos),
+            max_size,
+            sum(x.size for x in infos)
+        )
+
+    #--------------------------------------------------------------------------
+    def cache_clear(self):
+        for a_cache in self._caches():
+            a_cache.clear()
+
+    #--------------------------------------------------------------------------
+    def cache_bytes(self):
+        return sum(x.bytes() for x in self._caches())
+
+
+#==============================================================================
+class _BoundMemoizedFunction(object):
+    """a memoized method bound to an instance and to the instance's cache"""
+
+    __slots__ = ('_function', '_instance', '_cache')
+
+    #--------------------------------------------------------------------------
+    def __init__(self, function, instance, cache):
+        self._function = function
+        self._instance = instance
+        self._cache = cache
+
+    #--------------------------------------------------------------------------
+    def __call__(self, *args, **kwargs):
+        if self._cache is None:
+            return self._function(self._instance, *args, **kwargs)
+        return _call_with_cache(
+            self._cache,
+            functools.partial(self._function, self._instance),
+            args,
+            kwargs
+        )
+
+    #--------------------------------------------------------------------------
+    def cache_info(self):
+        if self._cache is None:
+            return CacheInfo(0, 0, 0, None, 0)
+        return self._cache.info()
+
+    #--------------------------------------------------------------------------
+    def cache_clear(self):
+        if self._cache is not None:
+            self._cache.clear()
+
+
+#------------------------------------------------------------------------------
+def _call_with_cache(cache, function, args, kwargs):
+    key = tuple(_key_part(x) for x in args)
+    if kwargs:
+        key = (
+            key,
+            tuple(sorted((k, _key_part(v)) for k, v in kwargs.items()))
+        )
+    try:
+        return cache.get(key)
+    except KeyError:
+        result = function(*args, **kwargs)
+        cache.put(key, result)
+        return result
+    except TypeError:
+        # unhashable arguments can't be cached
+        return function(*args, **kwargs)
+
+
+#------------------------------------------------------------------------------
+def memoize(max_cache_size=1000, ttl=None):
+    """a memoize decorator with a thread safe, least recently used cache.
+    When the cache is full, the result that was used the longest time ago is
+    evicted to make room for a new one.  A function called with arguments
+    that can't be hashed is called without the cache.
+
+    A memoized method keeps a separate cache for each instance in a weakly
+    keyed mapping, so the cache doesn't keep the instances alive.  Arguments
+    that compare by identity, like a ConfigurationManager passed to
+    'get_values', are held by weak references in the cache keys, so the
+    cache doesn't keep them, or the instances that they refer to, alive
+    either.
+
+    The memoized function, and a memoized method fetched from an instance,
+    offer 'cache_info()', a CacheInfo of the hits, misses, evictions,
+    maximum size and current size, and 'cache_clear()'.  Fetched from its
+    class, a memoized method's statistics are those of all of its caches
+    added together, the maximum size included.  The memoized function is
+    listed in the registry of caches, see 'cache_registry'.
 
     Parameters:
-      max_cache_size - the size to which a cache can grow
+      max_cache_size - the number of results a cache can hold, None for no
+                       limit
+      ttl - the number of seconds a result is kept, None to keep it until it
+            is evicted
     """
     def wrapper(f):
-        @wraps(f)
-        def fn(*args, **kwargs):
-            if kwargs:
-                key = (args, tuple(kwargs.items()))
-            else:
-                key = args
-            try:
-                return fn.cache[key]
-            except KeyError:
-                if fn.count >= max_cache_size:
-                    fn.cache = {}
-                    fn.count = 0
-                result = f(*args, **kwargs)
-                fn.cache[key] = result
-                fn.count += 1
-                return result
-            except TypeError:
-                return f(*args, **kwargs)
-        fn.cache = {}
-        fn.count = 0
-        return fn
+        return _MemoizedFunction(f, max_cache_size, ttl)
     return wrapper
@@ -12,6 +12,8 @@ from configman.option import Option, Aggregation
 #==============================================================================
 class Namespace(DotDict):
 
+    __slots__ = ('_doc', '_reference_value_from')
+
     #--------------------------------------------------------------------------
     def __init__(self, doc='', initializer=None):
         super(Namespace, self).__init__(initializer=initializer)
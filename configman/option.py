@@ -6,6 +6,7 @@ from __future__ import absolute_import, division, print_function
 import collections
 import six
 
+from configman import profiler, lazy_import
 from configman.converters import (
     str_to_python_object,
     from_string_converters,
@@ -115,13 +116,30 @@ class Option(object):
         )
 
     #--------------------------------------------------------------------------
-    def set_value(self, val=None):
+    def set_value(self, val=None, manifest=None, a_profiler=None):
+        """convert and set the value.  With a manifest, a class that it
+        knows becomes a LazyImport, see the module 'lazy_import'.  With a
+        profiler, the conversion is recorded as a phase, see the module
+        'profiler'."""
         if val is None:
             val = self.default
         if isinstance(val, (six.binary_type, six.text_type)):
             val = to_str(val)
             try:
-                new_value = self.from_string_converter(val)
+                with profiler.phase(a_profiler, 'from_string_converter'):
+                    new_value = None
+                    if self.from_string_converter is str_to_python_object:
+                        # a class known from the manifest is only
+                        # imported when it is used
+                        new_value = lazy_import.lazy_object(val, manifest)
+                        if new_value is None:
+                            with profiler.phase(
+                                a_profiler,
+                                'str_to_python_object'
+                            ):
+                                new_value = str_to_python_object(val)
+                    else:
+                        new_value = self.from_string_converter(val)
                 self.has_changed = new_value != self.value
                 self.value = new_value
             except TypeError:
@@ -138,7 +156,7 @@ class Option(object):
             self.has_changed = val.default != self.value
             self.value = val.default
         elif isinstance(val, collections.Mapping) and 'default' in val:
-            self.set_value(val["default"])
+            self.set_value(val["default"], manifest, a_profiler)
         else:
             self.has_changed = val != self.value
             self.value = val
@@ -79,3 +79,98 @@ class OrderedSet(collections.MutableSet):
         if isinstance(other, OrderedSet):
             return len(self) == len(other) and list(self) == list(other)
         return set(self) == set(other)
+
+
+class DictWithKeyList(dict):
+    """a dict that remembers the order in which its keys were inserted in an
+    OrderedSet.  It stands in for collections.OrderedDict on Python 2.6."""
+
+    def __init__(self, *args, **kwargs):
+        super(DictWithKeyList, self).__init__()
+        self._keys = OrderedSet()
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key, value):
+        super(DictWithKeyList, self).__setitem__(key, value)
+        self._keys.add(key)
+
+    def __delitem__(self, key):
+        super(DictWithKeyList, self).__delitem__(key)
+        self._keys.discard(key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __reversed__(self):
+        return reversed(self._keys)
+
+    def keys(self):
+        return list(self._keys)
+
+    def values(self):
+        return [self[key] for key in self._keys]
+
+    def items(self):
+        return [(key, self[key]) for key in self._keys]
+
+    def iterkeys(self):
+        return iter(self._keys)
+
+    def itervalues(self):
+        for key in self._keys:
+            yield self[key]
+
+    def iteritems(self):
+        for key in self._keys:
+            yield key, self[key]
+
+    def update(self, *args, **kwargs):
+        if args:
+            other = args[0]
+            if hasattr(other, 'keys'):
+                other = [(key, other[key]) for key in other.keys()]
+            for key, value in other:
+                self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    _missing = object()
+
+    def pop(self, key, default=_missing):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default is self._missing:
+            raise KeyError(key)
+        return default
+
+    def popitem(self, last=True):
+        if not self:
+            raise KeyError('dictionary is empty')
+        key = next(reversed(self._keys)) if last else next(iter(self._keys))
+        return key, self.pop(key)
+
+    def clear(self):
+        super(DictWithKeyList, self).clear()
+        self._keys = OrderedSet()
+
+    def copy(self):
+        return self.__class__(self)
+
+    def __reduce__(self):
+        return self.__class__, (self.items(),)
+
+    def __repr__(self):
+        if not self:
+            return '%s()' % (self.__class__.__name__,)
+        return '%s(%r)' % (self.__class__.__name__, self.items())
+
+
+# collections.OrderedDict arrived in Python 2.7
+OrderedDict = getattr(collections, 'OrderedDict', DictWithKeyList)
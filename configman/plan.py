@@ -0,0 +1,260 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""This module implements a plan for the resolution of a configuration.  An
+application that creates a ConfigurationManager for every job that it runs,
+each with different value sources or command line but with the very same
+option definitions, pays for the copying of the definitions and for the
+expansion of all of their class options every time.
+
+A ConfigurationPlan does that work once: it copies the definitions and expands
+them with their defaults.  Each call to 'resolve' then creates a
+ConfigurationManager that starts from a copy of the expanded definitions and
+only overlays and expands the options that get a value from a value source.
+If a value source replaces a class option that had been expanded by the plan,
+the options brought in by the original class may not belong in the
+configuration.  In that case, that one resolution starts over from the
+definitions before expansion.
+
+        plan = ConfigurationPlan(
+            definition_source=required_config,
+            app_name='my_job_runner',
+        )
+        for argv in job_command_lines:
+            config = plan.resolve(argv_source=argv).get_config()
+
+A plan is never changed once it has been compiled, so it may be shared by
+many resolutions.
+
+The function 'resolve_many' resolves a plan against many lists of value
+sources, fanning them out over a pool of processes.
+"""
+from __future__ import absolute_import, division, print_function
+
+import collections
+import itertools
+import multiprocessing
+
+import six
+
+try:
+    # concurrent.futures is in the standard library from Python 3.2, for
+    # Python 2 it is the optional 'futures' package
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:
+    ProcessPoolExecutor = None
+
+from configman.config_manager import ConfigurationManager
+from configman.converters import to_str
+from configman.dotdict import DotDict
+from configman.namespace import Namespace
+from configman.option import Option
+
+
+#==============================================================================
+class ConfigurationPlan(object):
+
+    #--------------------------------------------------------------------------
+    def __init__(self, definition_source=None, **kwargs):
+        """parameters:
+            definition_source - a namespace or list of namespaces from which
+                                to fetch the definitions of the
+                                configuration parameters.
+            kwargs - any of the other parameters of the constructor of the
+                     ConfigurationManager.  They're used for every
+                     resolution of the plan."""
+        for a_parameter in ('values_source_list', 'argv_source', 'plan'):
+            if a_parameter in kwargs:
+                raise TypeError(
+                    "'%s' is given to 'resolve' rather than to the plan"
+                    % a_parameter
+                )
+        self.config_manager_kwargs = kwargs
+
+        if definition_source is None:
+            definition_source_list = []
+        elif (
+            isinstance(definition_source, collections.Sequence) and
+            not isinstance(definition_source, (six.binary_type, six.text_type))
+        ):
+            definition_source_list = list(definition_source)
+        else:
+            if isinstance(definition_source, (six.binary_type, six.text_type)):
+                definition_source = to_str(definition_source)
+            definition_source_list = [definition_source]
+        # the option definitions before expansion
+        self.base_definitions = \
+            ConfigurationManager._setup_option_definitions(
+                definition_source_list,
+                Namespace()
+            )
+        # resolve the definitions with no value sources at all to expand
+        # them with their defaults
+        compiler = ConfigurationManager(
+            self.base_definitions,
+            values_source_list=[],
+            argv_source=[],
+            use_auto_help=False,
+            use_admin_controls=False,
+            quit_after_admin=False,
+            use_worklist_expansion=kwargs.get(
+                'use_worklist_expansion',
+                False
+            ),
+            parallel_imports=kwargs.get('parallel_imports', 0),
+            manifest=kwargs.get('manifest'),
+        )
+        self.option_definitions = compiler.option_definitions
+        self.definition_defaults = compiler._definition_defaults
+        self.all_reference_values = compiler._all_reference_values
+        self.finished_keys = frozenset(compiler._finished_keys)
+        # the options whose values were expanded into more options
+        expanded_class_values = []
+        for key in self.option_definitions.keys_breadth_first():
+            an_option = self.option_definitions[key]
+            if (
+                isinstance(an_option, Option)
+                and self._has_required_config(an_option.value)
+            ):
+                expanded_class_values.append((key, an_option.value))
+        self.expanded_class_values = tuple(expanded_class_values)
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _has_required_config(a_value):
+        if hasattr(a_value, 'get_required_config'):
+            return True
+        return isinstance(
+            getattr(a_value, 'required_config', None),
+            collections.Mapping
+        )
+
+    #--------------------------------------------------------------------------
+    def resolve(self, values_source_list=None, argv_source=None):
+        """return a ConfigurationManager for the plan resolved against the
+        value sources.  The parameters have the same meaning as they do for
+        the constructor of the ConfigurationManager."""
+        return ConfigurationManager(
+            values_source_list=values_source_list,
+            argv_source=argv_source,
+            plan=self,
+            **self.config_manager_kwargs
+        )
+
+
+# the plan used by the worker processes of 'resolve_many'.  It is set in the
+# parent process before the workers are started, so workers that are forked
+# inherit it.  Where the pool supports an initializer, the plan is also passed
+# to the workers that way.
+_worker_plan = None
+
+
+#------------------------------------------------------------------------------
+def _set_worker_plan(plan):
+    global _worker_plan
+    _worker_plan = plan
+
+
+#------------------------------------------------------------------------------
+def _resolve_chunk(chunk, argv_source, mapping_class, plan=None):
+    if plan is None:
+        plan = _worker_plan
+    return [
+        plan.resolve(
+            values_source_list,
+            list(argv_source)
+        ).get_config(mapping_class)
+        for values_source_list in chunk
+    ]
+
+
+#------------------------------------------------------------------------------
+def resolve_many(
+    definition_source,
+    values_source_lists,
+    argv_source=(),
+    mapping_class=DotDict,
+    max_workers=None,
+    chunk_size=100,
+    **kwargs
+):
+    """a generator of the configs resolved from one set of definitions against
+    each of many lists of value sources.  The definitions are compiled into a
+    ConfigurationPlan once.  The resolutions are fanned out in chunks over a
+    pool of processes and the configs are yielded in the order of the lists of
+    value sources.  No more than two chunks per worker are in flight at any
+    time, so the memory used does not depend on the number of lists.
+
+    If concurrent.futures is not available or 'max_workers' is 1, the
+    resolutions are done serially in this process.
+
+    parameters:
+        definition_source - as for the ConfigurationManager
+        values_source_lists - an iterable of lists of value sources.  A value
+                              source shared by all of them, like a base ini
+                              file, is best read into a mapping once.
+        argv_source - the command line used for every resolution.  Unlike the
+                      ConfigurationManager, this defaults to an empty command
+                      line rather than sys.argv.
+        mapping_class - the class of mapping for the configs.  It must be
+                        possible to pickle them to return them from the
+                        workers, so mappings with acquisition won't do.
+        max_workers - the number of worker processes, by default the number
+                      of processors
+        chunk_size - the number of resolutions in each task for the workers
+        kwargs - any of the other parameters of the ConfigurationManager"""
+    plan = ConfigurationPlan(definition_source, **kwargs)
+    values_source_lists = iter(values_source_lists)
+    argv_source = tuple(argv_source)
+
+    def chunks():
+        while True:
+            chunk = list(itertools.islice(values_source_lists, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    if ProcessPoolExecutor is None or max_workers == 1:
+        for a_chunk in chunks():
+            for a_config in _resolve_chunk(
+                a_chunk,
+                argv_source,
+                mapping_class,
+                plan
+            ):
+                yield a_config
+        return
+
+    if max_workers is None:
+        max_workers = multiprocessing.cpu_count()
+    _set_worker_plan(plan)
+    try:
+        try:
+            executor = ProcessPoolExecutor(
+                max_workers,
+                initializer=_set_worker_plan,
+                initargs=(plan,)
+            )
+        except TypeError:
+            # this version of the pool has no initializer, the workers
+            # must be forked to get the plan
+            executor = ProcessPoolExecutor(max_workers)
+        with executor:
+            max_in_flight = 2 * max_workers
+            in_flight = collections.deque()
+            for a_chunk in chunks():
+                if len(in_flight) >= max_in_flight:
+                    for a_config in in_flight.popleft().result():
+                        yield a_config
+                in_flight.append(executor.submit(
+                    _resolve_chunk,
+                    a_chunk,
+                    argv_source,
+                    mapping_class
+                ))
+            while in_flight:
+                for a_config in in_flight.popleft().result():
+                    yield a_config
+    finally:
+        _set_worker_plan(None)
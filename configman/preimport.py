@@ -0,0 +1,95 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""This module imports modules with a pool of threads.  The modules of
+plugins named by class options can take a long time to import, each is
+otherwise imported in turn as its option is converted from a string.  The
+ConfigurationManager, when asked to, uses this module to import the
+modules named by the class options of the definitions, and then those of
+each pass of the overlay/expansion, in parallel before the options are
+converted.
+
+Python's own locks keep the imports safe: a module is only ever imported by
+one thread at a time.  Under Python 2 the global import lock allows only one
+import at a time, so the imports don't overlap there.  Errors are ignored
+here, an import that failed is tried again by the conversion that follows,
+which reports the error as usual.
+"""
+from __future__ import absolute_import, division, print_function
+
+import importlib
+import sys
+import threading
+
+import six
+from six.moves import queue
+
+
+#------------------------------------------------------------------------------
+def _import_quietly(dotted_name):
+    """import the module of a dotted name, either the module that it names
+    or the module of the class or function that it names"""
+    try:
+        importlib.import_module(dotted_name)
+    except ImportError:
+        # it may name something within a module, that module is imported
+        # by now if it could be
+        pass
+    except Exception:
+        # the conversion that follows will report it
+        pass
+
+
+#------------------------------------------------------------------------------
+def _is_imported(dotted_name):
+    modules = sys.modules
+    return (
+        dotted_name in modules
+        or dotted_name.rsplit('.', 1)[0] in modules
+    )
+
+
+#------------------------------------------------------------------------------
+def preimport(dotted_names, number_of_threads):
+    """import the modules of the dotted names, that haven't been imported
+    already, with a pool of threads.  Names that are not strings or don't
+    have a '.' are skipped, the latter are builtins or refer to __main__.
+
+    returns:
+        the number of dotted names whose modules were imported"""
+    names = []
+    seen = set()
+    for a_name in dotted_names:
+        if not isinstance(a_name, six.string_types):
+            continue
+        a_name = a_name.strip()
+        if '.' not in a_name or a_name in seen or _is_imported(a_name):
+            continue
+        seen.add(a_name)
+        names.append(a_name)
+    if not names:
+        return 0
+
+    pending = queue.Queue()
+    for a_name in names:
+        pending.put(a_name)
+
+    def worker():
+        while True:
+            try:
+                a_name = pending.get_nowait()
+            except queue.Empty:
+                return
+            _import_quietly(a_name)
+
+    threads = [
+        threading.Thread(target=worker, name='configman-preimport-%d' % i)
+        for i in range(min(number_of_threads, len(names)))
+    ]
+    for a_thread in threads:
+        a_thread.daemon = True
+        a_thread.start()
+    for a_thread in threads:
+        a_thread.join()
+    return len(names)
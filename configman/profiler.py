@@ -0,0 +1,117 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""This module implements a simple profiler for the phases of the work done
+by a ConfigurationManager: the setup of the definitions, the wrapping and
+reading of the value sources, each pass of the overlay and expansion, the
+conversions from strings, the imports of classes, the check for mismatched
+options and the aggregations of get_config.  Each phase is recorded with the
+number of times it ran and the total wall clock time that it took.
+
+Each ConfigurationManager holds its own profiler and passes it down to the
+code that records phases for it, like Option.set_value.  The module level
+function 'phase' records with a profiler that may be None, in which case it
+does nothing.
+"""
+from __future__ import absolute_import, division, print_function
+
+import contextlib
+import json
+import sys
+import timeit
+
+
+#==============================================================================
+class _NullPhase(object):
+    """a context manager that does nothing, used when there is no
+    profiler"""
+    #--------------------------------------------------------------------------
+    def __enter__(self):
+        return self
+
+    #--------------------------------------------------------------------------
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_null_phase = _NullPhase()
+
+
+#------------------------------------------------------------------------------
+def phase(a_profiler, name):
+    """return a context manager that records a phase with the profiler if
+    there is one"""
+    if a_profiler is None:
+        return _null_phase
+    return a_profiler.phase(name)
+
+
+#==============================================================================
+class Profiler(object):
+
+    #--------------------------------------------------------------------------
+    def __init__(self):
+        # phase name -> [count, total seconds]
+        self.phases = {}
+
+    #--------------------------------------------------------------------------
+    @contextlib.contextmanager
+    def phase(self, name):
+        """a context manager that records the time spent within it as a run
+        of the named phase"""
+        start = timeit.default_timer()
+        try:
+            yield
+        finally:
+            self.record(name, timeit.default_timer() - start)
+
+    #--------------------------------------------------------------------------
+    def record(self, name, seconds):
+        try:
+            a_phase = self.phases[name]
+        except KeyError:
+            self.phases[name] = [1, seconds]
+        else:
+            a_phase[0] += 1
+            a_phase[1] += seconds
+
+    #--------------------------------------------------------------------------
+    def as_list(self):
+        """return a list of the phases as tuples of name, count and total
+        seconds, sorted with the most time consuming first"""
+        return sorted(
+            (
+                (name, count, seconds)
+                for name, (count, seconds) in self.phases.items()
+            ),
+            key=lambda a_phase: (-a_phase[2], a_phase[0])
+        )
+
+    #--------------------------------------------------------------------------
+    def report(self, output_format='text', output_stream=None):
+        """write the phases, the most time consuming first, either as a table
+        of text or as json"""
+        if output_stream is None:
+            output_stream = sys.stderr
+        phases = self.as_list()
+        if output_format == 'json':
+            json.dump(
+                [
+                    {'phase': name, 'count': count, 'seconds': seconds}
+                    for name, count, seconds in phases
+                ],
+                output_stream,
+                indent=2
+            )
+            print('', file=output_stream)
+            return
+        name_width = max([len(x[0]) for x in phases] + [len('phase')])
+        print(
+            '%-*s %10s %12s' % (name_width, 'phase', 'count', 'seconds'),
+            file=output_stream
+        )
+        for name, count, seconds in phases:
+            print(
+                '%-*s %10d %12.6f' % (name_width, name, count, seconds),
+                file=output_stream
+            )
@@ -0,0 +1,36 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""This module has the functions shared by the caches that must notice
+when the files behind them have changed: the startup cache and the
+manifests of required config."""
+from __future__ import absolute_import, division, print_function
+
+import inspect
+import os
+import sys
+
+
+#------------------------------------------------------------------------------
+def stat_signature(pathname):
+    """return a string that changes when the file is modified"""
+    try:
+        stat = os.stat(pathname)
+    except (OSError, IOError):
+        return 'missing'
+    return '%r:%r' % (stat.st_mtime, stat.st_size)
+
+
+#------------------------------------------------------------------------------
+def source_file_of(an_object):
+    """return the pathname of the file that defines a class, function or
+    module or None if there isn't one"""
+    if inspect.ismodule(an_object):
+        module = an_object
+    else:
+        module = sys.modules.get(getattr(an_object, '__module__', None))
+    pathname = getattr(module, '__file__', None)
+    if pathname and pathname.endswith(('.pyc', '.pyo')):
+        pathname = pathname[:-1]
+    return pathname
@@ -0,0 +1,418 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""This module implements a persistent cache of the option definitions as
+resolved by a ConfigurationManager.  Applications that are started many times
+with the same definitions, config files, environment and command line pay
+for the same overlay and expansion of the option definitions every time.  With
+the cache, the resolved option definitions and the extra command line
+arguments are saved to a file.  On the next start, if nothing that went into
+the resolution has changed, they are loaded from that file rather than
+resolved again.
+
+A snapshot is keyed on a fingerprint of:
+    the option definitions before expansion
+    the command line arguments
+    the pathnames, modification times and sizes of the config files
+    the parameters of the ConfigurationManager that affect resolution
+
+Mappings used as value sources, like the environment, usually hold far more
+values than the application uses.  Rather than fingerprinting all of them, the
+snapshot records just the values whose keys could have been used by the
+resolution.  On load, those values are compared with the current ones.  In the
+same manner, the snapshot records the modification times of the source files
+of the classes and functions that appear in the resolved options and of the
+files that the ini files include.  If any of those files have changed, the
+snapshot is discarded.
+
+The snapshot is written with pickle, so classes and functions are stored by
+their import paths and are simply imported again on load.  Option definitions
+that cannot be pickled, like those that use lambdas or dynamically created
+classes, cannot be cached.  In that case, no snapshot is written and the
+ConfigurationManager resolves the definitions as usual on every start.
+
+Since the snapshot file is loaded with pickle, it must be kept in a location
+that only the owner of the application can write.
+"""
+from __future__ import absolute_import, division, print_function
+
+import collections
+import hashlib
+import inspect
+import os
+import sys
+import tempfile
+
+import six
+from six.moves import cPickle as pickle
+
+import configman
+from configman.config_file_future_proxy import ConfigFileFutureProxy
+from configman.converters import to_str
+from configman.dotdict import iteritems_breadth_first
+from configman.option import Option, Aggregation
+from configman.source_files import source_file_of, stat_signature
+from configman.value_sources import for_configobj
+
+# increment this if the layout of the snapshot changes
+SNAPSHOT_FORMAT = 2
+
+
+#==============================================================================
+class UncacheableError(Exception):
+    """raised when something that goes into a fingerprint cannot be given a
+    stable representation"""
+    pass
+
+
+#------------------------------------------------------------------------------
+def _stable_repr(a_value):
+    """return a representation of a value that will be the same in the next
+    run of the application.  Classes, functions and modules are represented by
+    their import paths.  Raise UncacheableError for anything for which no such
+    representation can be found."""
+    if a_value is None or isinstance(
+        a_value,
+        (bool, float, six.binary_type, six.text_type) + six.integer_types
+    ):
+        return repr(a_value)
+    if inspect.ismodule(a_value):
+        return 'module:%s' % a_value.__name__
+    if inspect.isclass(a_value) or inspect.isroutine(a_value):
+        name = getattr(
+            a_value,
+            '__qualname__',
+            getattr(a_value, '__name__', None)
+        )
+        if (
+            name is None
+            or '<' in name  # lambdas and locally defined things
+            or (
+                inspect.isfunction(a_value)
+                and six.get_function_closure(a_value)
+            )
+        ):
+            raise UncacheableError(repr(a_value))
+        return 'object:%s.%s' % (getattr(a_value, '__module__', ''), name)
+    if isinstance(a_value, (list, tuple)):
+        return '%s(%s)' % (
+            type(a_value).__name__,
+            ', '.join(_stable_repr(x) for x in a_value)
+        )
+    if isinstance(a_value, collections.Mapping):
+        return '{%s}' % ', '.join(
+            '%s: %s' % (_stable_repr(k), _stable_repr(v))
+            for k, v in sorted(
+                six.iteritems(a_value),
+                key=lambda kv: repr(kv[0])
+            )
+        )
+    representation = repr(a_value)
+    if ' at 0x' in representation:
+        # the default repr of an object includes its address
+        raise UncacheableError(representation)
+    return '%s.%s:%s' % (
+        type(a_value).__module__,
+        type(a_value).__name__,
+        representation
+    )
+
+
+#------------------------------------------------------------------------------
+def _option_signature(key, an_option):
+    if isinstance(an_option, Option):
+        return '%s=Option(%s)' % (key, ', '.join(_stable_repr(x) for x in (
+            an_option.default,
+            an_option.doc,
+            an_option.from_string_converter,
+            an_option.to_string_converter,
+            an_option.short_form,
+            an_option.is_argument,
+            an_option.reference_value_from,
+            an_option.secret,
+            an_option.exclude_from_print_conf,
+            an_option.exclude_from_dump_conf,
+            an_option.likely_to_be_changed,
+            an_option.not_for_definition,
+        )))
+    if isinstance(an_option, Aggregation):
+        return '%s=Aggregation(%s)' % (key, _stable_repr(an_option.function))
+    # this is a Namespace
+    return '%s=Namespace(%r)' % (
+        key,
+        getattr(an_option, '_reference_value_from', False)
+    )
+
+
+#------------------------------------------------------------------------------
+def _ignores_mismatches(a_mapping):
+    """mirror the rules of the mapping value source"""
+    if a_mapping is os.environ:
+        return True
+    try:
+        return bool(a_mapping.always_ignore_mismatches)
+    except (AttributeError, KeyError):
+        pass
+    return bool(a_mapping.get('always_ignore_mismatches', False))
+
+
+#------------------------------------------------------------------------------
+def _leaf_name(key):
+    return key.rsplit('.', 1)[-1]
+
+
+#------------------------------------------------------------------------------
+def _resolved_value_sources(config_manager, values_source_list):
+    """yield the value sources with the config file proxy replaced by the
+    pathname of the config file"""
+    for a_source in values_source_list:
+        if a_source is ConfigFileFutureProxy:
+            try:
+                a_source = \
+                    config_manager.option_definitions.admin.conf.default
+            except KeyError:
+                a_source = None
+        yield a_source
+
+
+#==============================================================================
+class StartupCache(object):
+
+    #--------------------------------------------------------------------------
+    def __init__(self, pathname):
+        self.pathname = pathname
+
+    #--------------------------------------------------------------------------
+    def fingerprint(self, config_manager, values_source_list):
+        """return a hex digest that identifies everything that went into the
+        resolution of the option definitions.  Mappings used as value sources
+        are not part of the fingerprint, they're checked separately.  Raise
+        UncacheableError if something cannot be fingerprinted."""
+        parts = [
+            'format:%d' % SNAPSHOT_FORMAT,
+            'configman:%s' % configman.__version__,
+            'python:%s' % (sys.version_info[:2],),
+            'argv:%s' % _stable_repr(list(config_manager.argv_source)),
+            'app_name:%s' % _stable_repr(config_manager.app_name),
+            'config_optional:%s' % config_manager.config_optional,
+            'object_hook:%s' % _stable_repr(
+                config_manager.value_source_object_hook
+            ),
+        ]
+        for key, an_option in iteritems_breadth_first(
+            config_manager.option_definitions,
+            include_dicts=True
+        ):
+            parts.append(_option_signature(key, an_option))
+        for a_source in _resolved_value_sources(
+            config_manager,
+            values_source_list
+        ):
+            parts.append(self._value_source_signature(a_source))
+        hasher = hashlib.sha1()
+        for a_part in parts:
+            hasher.update(a_part.encode('utf-8', 'replace'))
+            hasher.update(b'\n')
+        return hasher.hexdigest()
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _value_source_signature(a_source):
+        if a_source is None:
+            return 'source:None'
+        if isinstance(a_source, (six.binary_type, six.text_type)):
+            if os.path.isfile(a_source):
+                return 'file:%s:%s' % (
+                    os.path.abspath(a_source),
+                    stat_signature(a_source)
+                )
+            # it's not a file, it may name a python module
+            module = sys.modules.get(a_source)
+            if module is not None:
+                a_source = module
+            else:
+                return 'source:%r' % a_source
+        if inspect.ismodule(a_source):
+            pathname = source_file_of(a_source)
+            return 'module:%s:%s' % (
+                a_source.__name__,
+                stat_signature(pathname) if pathname else ''
+            )
+        if isinstance(a_source, collections.Mapping):
+            # mappings are checked by 'relevant_mapping_values'
+            return 'mapping'
+        raise UncacheableError(repr(a_source))
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def relevant_mapping_values(values_source_list, known_leaf_names):
+        """for each of the mappings in the values source list, return a digest
+        of the values that could have been used by the resolution: those with
+        keys that end in the name of a known option.  Mappings that are
+        checked for mismatched options contribute all of their keys, too."""
+        digests = []
+        for a_source in values_source_list:
+            if not isinstance(a_source, collections.Mapping):
+                continue
+            relevant_values = []
+            all_keys = []
+            for key, value in iteritems_breadth_first(a_source):
+                if _leaf_name(key) in known_leaf_names:
+                    relevant_values.append((key, _stable_repr(value)))
+                all_keys.append(key)
+            relevant_values.sort()
+            hasher = hashlib.sha1(
+                repr(relevant_values).encode('utf-8', 'replace')
+            )
+            if not _ignores_mismatches(a_source):
+                hasher.update(
+                    repr(sorted(all_keys)).encode('utf-8', 'replace')
+                )
+            digests.append(hasher.hexdigest())
+        return digests
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def source_file_dependencies(option_definitions):
+        """return a mapping of the pathnames of the source files of the
+        classes, functions and modules within the options to their stat
+        signatures"""
+        dependencies = {}
+        for key, an_option in iteritems_breadth_first(option_definitions):
+            if isinstance(an_option, Option):
+                candidates = (
+                    an_option.value,
+                    an_option.default,
+                    an_option.from_string_converter,
+                    an_option.to_string_converter,
+                )
+            elif isinstance(an_option, Aggregation):
+                candidates = (an_option.function,)
+            else:
+                continue
+            for a_candidate in candidates:
+                if not (
+                    inspect.isclass(a_candidate)
+                    or inspect.isroutine(a_candidate)
+                    or inspect.ismodule(a_candidate)
+                ):
+                    continue
+                pathname = source_file_of(a_candidate)
+                if pathname and pathname not in dependencies:
+                    dependencies[pathname] = stat_signature(pathname)
+        return dependencies
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def included_file_dependencies(config_manager, values_source_list):
+        """return a mapping of the pathnames of the files included by the ini
+        files among the value sources to their stat signatures.  The ini
+        files themselves are part of the fingerprint."""
+        dependencies = {}
+        for a_source in _resolved_value_sources(
+            config_manager,
+            values_source_list
+        ):
+            if not isinstance(a_source, (six.binary_type, six.text_type)):
+                continue
+            a_source = to_str(a_source)
+            if not (
+                a_source.endswith(for_configobj.file_name_extension)
+                and os.path.isfile(a_source)
+            ):
+                continue
+            try:
+                pathnames = for_configobj.included_files(a_source)
+            except (OSError, IOError):
+                raise UncacheableError(a_source)
+            for pathname in pathnames:
+                dependencies[pathname] = stat_signature(pathname)
+        return dependencies
+
+    #--------------------------------------------------------------------------
+    def load(self, fingerprint, values_source_list):
+        """return the snapshot, a mapping, saved by a previous run if it is
+        still valid.  Otherwise return None."""
+        try:
+            with open(self.pathname, 'rb') as f:
+                snapshot = pickle.load(f)
+        except Exception:
+            # a missing, unreadable or corrupt cache is just a cache miss
+            return None
+        try:
+            if snapshot['fingerprint'] != fingerprint:
+                return None
+            known_leaf_names = snapshot['known_leaf_names']
+            if snapshot['mapping_values'] != self.relevant_mapping_values(
+                values_source_list,
+                known_leaf_names
+            ):
+                return None
+            for pathname, signature in six.iteritems(
+                snapshot['dependencies']
+            ):
+                if stat_signature(pathname) != signature:
+                    return None
+        except (KeyError, TypeError, UncacheableError):
+            return None
+        return snapshot
+
+    #--------------------------------------------------------------------------
+    def save(self, config_manager, values_source_list, fingerprint,
+             known_keys):
+        """write a snapshot of the resolved option definitions.  Failure to
+        write the snapshot is not an error, the cache is just an
+        optimization."""
+        known_leaf_names = set(_leaf_name(k) for k in known_keys)
+        try:
+            snapshot = {
+                'fingerprint': fingerprint,
+                'option_definitions': config_manager.option_definitions,
+                'args': config_manager.args,
+                'known_keys': known_keys,
+                # the state of the resolution, needed to reload
+                'definition_defaults': config_manager._definition_defaults,
+                'all_reference_values': config_manager._all_reference_values,
+                'known_leaf_names': known_leaf_names,
+                'mapping_values': self.relevant_mapping_values(
+                    values_source_list,
+                    known_leaf_names
+                ),
+                'dependencies': self.source_file_dependencies(
+                    config_manager.option_definitions
+                ),
+            }
+            snapshot['dependencies'].update(
+                self.included_file_dependencies(
+                    config_manager,
+                    values_source_list
+                )
+            )
+            pickled_snapshot = pickle.dumps(snapshot, 2)
+        except Exception:
+            # there is something in the option definitions that cannot be
+            # saved, there will be no cache for this configuration
+            return False
+        directory = os.path.dirname(os.path.abspath(self.pathname))
+        try:
+            # write to a temporary file and rename it so that a concurrently
+            # starting application never sees a partially written snapshot
+            file_descriptor, temporary_pathname = tempfile.mkstemp(
+                dir=directory,
+                prefix='.configman_cache_'
+            )
+        except (OSError, IOError):
+            return False
+        try:
+            with os.fdopen(file_descriptor, 'wb') as f:
+                f.write(pickled_snapshot)
+            os.rename(temporary_pathname, self.pathname)
+        except (OSError, IOError):
+            # don't leave the partially written snapshot behind
+            try:
+                os.unlink(temporary_pathname)
+            except OSError:
+                pass
+            return False
+        return True
@@ -0,0 +1,39 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+import bisect
+
+
+#==============================================================================
+class SuffixIndex(object):
+    """an index over a collection of strings that answers the question "do
+    any of the strings end with this suffix?" without examining every one of
+    the strings.  The strings are stored reversed and sorted, which turns the
+    question into a search for a prefix within a sorted list:  a binary search
+    finds the first reversed string that is not less than the reversed
+    suffix.  Only that one candidate needs to be compared.
+
+        index = SuffixIndex(['x.y.z', 'x.a'])
+        assert index.has_string_ending_with('y.z')
+        assert index.has_string_ending_with('.a')
+        assert not index.has_string_ending_with('x.y')
+    """
+
+    #--------------------------------------------------------------------------
+    def __init__(self, strings):
+        self._reversed_strings = sorted(a_string[::-1] for a_string in strings)
+
+    #--------------------------------------------------------------------------
+    def has_string_ending_with(self, suffix):
+        reversed_suffix = suffix[::-1]
+        index = bisect.bisect_left(self._reversed_strings, reversed_suffix)
+        return (
+            index < len(self._reversed_strings)
+            and self._reversed_strings[index].startswith(reversed_suffix)
+        )
+
+    #--------------------------------------------------------------------------
+    def __len__(self):
+        return len(self._reversed_strings)
@@ -0,0 +1,171 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+import gc
+import unittest
+
+import mock
+from six.moves import cStringIO as StringIO
+
+from configman import Namespace, command_line, cache_registry
+from configman.config_exceptions import CannotConvertError
+from configman.config_manager import ConfigurationManager
+from configman.memoize import memoize, CacheInfo
+
+
+#==============================================================================
+class TestCase(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    def _row(self, name):
+        for row in cache_registry.statistics():
+            if row['name'] == name:
+                return row
+        return None
+
+    #--------------------------------------------------------------------------
+    def test_memoized_functions_register(self):
+
+        @memoize()
+        def square(a):
+            return a * a
+
+        name = square.__module__ + '.' + getattr(
+            square,
+            '__qualname__',
+            square.__name__
+        )
+        self.assertEqual(self._row(name)['caches'], 1)
+        square(2)
+        square(2)
+        square(3)
+        row = self._row(name)
+        self.assertEqual(
+            (row['caches'], row['hits'], row['misses'], row['size']),
+            (1, 1, 2, 2)
+        )
+        self.assertTrue(row['bytes'] > 0)
+        totals = cache_registry.totals()
+        self.assertTrue(totals['hits'] >= 1)
+        self.assertTrue(totals['size'] >= 2)
+
+        cache_registry.clear_all()
+        self.assertEqual(square.cache_info().size, 0)
+
+        # a cache that is gone leaves the registry
+        del square
+        gc.collect()
+        self.assertTrue(self._row(name) is None)
+
+    #--------------------------------------------------------------------------
+    def test_other_caches(self):
+
+        class Cache(object):
+            def __init__(self):
+                self.cleared = False
+
+            def cache_info(self):
+                return CacheInfo(3, 4, 0, None, 5)
+
+            def cache_clear(self):
+                self.cleared = True
+
+        a_cache = Cache()
+        another_cache = Cache()
+        cache_registry.register(a_cache, 'test_other_caches')
+        cache_registry.register(another_cache, 'test_other_caches')
+        row = self._row('test_other_caches')
+        self.assertEqual(
+            (row['caches'], row['hits'], row['misses'], row['size']),
+            (2, 6, 8, 10)
+        )
+        self.assertEqual(row['bytes'], 0)
+        cache_registry.clear_all()
+        self.assertTrue(a_cache.cleared and another_cache.cleared)
+
+        output = StringIO()
+        cache_registry.report(output)
+        lines = output.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith('cache '))
+        self.assertTrue(
+            any(x.split()[:4] == ['test_other_caches', '2', '6', '8']
+                for x in lines)
+        )
+        self.assertEqual(lines[-1].split()[0], 'total')
+
+    #--------------------------------------------------------------------------
+    def test_config_manager_cache_report(self):
+        n = Namespace()
+        n.add_option('a', default=1)
+        with mock.patch('sys.stderr', new_callable=StringIO) as stderr:
+            cm = ConfigurationManager(
+                n,
+                [command_line],
+                argv_source=[],
+                cache_report=True,
+            )
+        self.assertTrue(stderr.getvalue().startswith('cache '))
+        self.assertTrue('admin.cache_report' in cm.get_option_names())
+
+        with mock.patch(
+            'configman.cache_registry.report_at_exit'
+        ) as report_at_exit:
+            with mock.patch('sys.stderr', new_callable=StringIO) as stderr:
+                ConfigurationManager(
+                    n,
+                    [command_line],
+                    argv_source=['--admin.cache_report=exit'],
+                    cache_report=True,
+                )
+        self.assertEqual(stderr.getvalue(), '')
+        report_at_exit.assert_called_once_with()
+
+    #--------------------------------------------------------------------------
+    def test_no_cache_report_by_default(self):
+        n = Namespace()
+        n.add_option('a', default=1)
+        with mock.patch('sys.stderr', new_callable=StringIO) as stderr:
+            cm = ConfigurationManager(n, [], argv_source=[])
+        self.assertEqual(stderr.getvalue(), '')
+        self.assertTrue('admin.cache_report' not in cm.get_option_names())
+
+        # offered, but off
+        with mock.patch('sys.stderr', new_callable=StringIO) as stderr:
+            cm = ConfigurationManager(
+                n,
+                [],
+                argv_source=[],
+                cache_report=False
+            )
+        self.assertEqual(stderr.getvalue(), '')
+        self.assertEqual(cm.option_definitions.admin.cache_report.value, '')
+
+    #--------------------------------------------------------------------------
+    def test_cache_report_from_a_value_source(self):
+        n = Namespace()
+        n.add_option('a', default=1)
+        with mock.patch('sys.stderr', new_callable=StringIO) as stderr:
+            ConfigurationManager(
+                n,
+                [{'admin.cache_report': 'startup'}, command_line],
+                argv_source=[],
+                cache_report=False,
+            )
+        self.assertTrue(stderr.getvalue().startswith('cache '))
+
+    #--------------------------------------------------------------------------
+    def test_invalid_cache_report(self):
+        n = Namespace()
+        n.add_option('a', default=1)
+        with mock.patch('sys.stderr', new_callable=StringIO) as stderr:
+            self.assertRaises(
+                CannotConvertError,
+                ConfigurationManager,
+                n,
+                [{'admin.cache_report': 'sometimes'}],
+                argv_source=[],
+                cache_report=False,
+            )
+        self.assertEqual(stderr.getvalue(), '')
@@ -10,6 +10,9 @@ from contextlib import contextmanager
 import io
 from six.moves import cStringIO as StringIO
 import getopt
+import shutil
+import signal
+import tempfile
 import six
 
 import mock
@@ -19,6 +22,8 @@ from configman.option import Option
 from configman.dotdict import (
     DotDict,
     DotDictWithAcquisition,
+    FrozenDotDict,
+    PersistentDotDict,
     create_key_translating_dot_dict,
 )
 from configman import Namespace, RequiredConfig
@@ -30,6 +35,7 @@ from configman.value_sources.source_exceptions import (
     AllHandlersFailedException,
     UnknownFileExtensionException,
 )
+from configman.value_sources.merged_values import MergedValueSources
 
 
 #==============================================================================
@@ -2010,6 +2016,70 @@ c.string =   from ini
         self.assertEqual(c.source.cls, T2)
         self.assertEqual(c.destination.cls, T2)
 
+    #--------------------------------------------------------------------------
+    def test_get_config_with_flattened_acquisition(self):
+        n = Namespace()
+        n.add_option('hostname', default='localhost')
+        n.namespace('database')
+        n.database.add_option('port', default=5432)
+        n.database.namespace('pool')
+        n.database.pool.add_option('size', default=4)
+        cm = config_manager.ConfigurationManager(
+            n,
+            values_source_list=[],
+        )
+        config = cm.get_config(flatten_acquisition=True)
+        self.assertEqual(config.database.pool.hostname, 'localhost')
+        self.assertEqual(
+            config.database.pool._acquired[2],
+            {'hostname': config}
+        )
+        config.database.hostname = 'db.example.com'
+        self.assertEqual(config.database.pool.hostname, 'db.example.com')
+
+        config = cm.get_config()
+        self.assertEqual(config.database.pool.hostname, 'localhost')
+        self.assertTrue(config.database.pool._acquired is None)
+
+    #--------------------------------------------------------------------------
+    def test_get_config_frozen(self):
+        n = Namespace()
+        n.add_option('hostname', default='localhost')
+        n.namespace('database')
+        n.database.add_option('port', default=5432)
+        cm = config_manager.ConfigurationManager(
+            n,
+            values_source_list=[],
+        )
+        config = cm.get_config(mapping_class=FrozenDotDict)
+        self.assertTrue(isinstance(config, FrozenDotDict))
+        self.assertTrue(isinstance(config.database, FrozenDotDict))
+        self.assertEqual(config.database.port, 5432)
+        self.assertRaises(TypeError, setattr, config, 'hostname', 'x')
+        self.assertEqual(
+            config.evolve(database__port=6543).database.port,
+            6543
+        )
+        with cm.context(mapping_class=FrozenDotDict) as config:
+            self.assertEqual(config.hostname, 'localhost')
+
+    #--------------------------------------------------------------------------
+    def test_get_config_persistent(self):
+        n = Namespace()
+        n.add_option('timeout', default=10)
+        n.namespace('database')
+        n.database.add_option('port', default=5432)
+        cm = config_manager.ConfigurationManager(
+            n,
+            values_source_list=[],
+        )
+        config = cm.get_config(mapping_class=PersistentDotDict)
+        self.assertTrue(isinstance(config.database, PersistentDotDict))
+        per_request = config.set('timeout', 30)
+        self.assertEqual(per_request.timeout, 30)
+        self.assertEqual(config.timeout, 10)
+        self.assertTrue(per_request.database is config.database)
+
     #--------------------------------------------------------------------------
     def test_admin_conf_all_handlers_fail(self):
         """no handler found produces empty message"""
@@ -2517,3 +2587,290 @@ c.string =   from ini
         self.assertFalse(config.option_definitions.wilma.has_changed)
         self.assertFalse(config.option_definitions.sarita.has_changed)
         self.assertTrue(config.option_definitions.robert.has_changed)
+
+    #--------------------------------------------------------------------------
+    def test_overlay_compares_with_the_previous_value_source(self):
+        n = config_manager.Namespace()
+        n.add_option('dwight', default=0)
+        n.add_option('wilma', default=0)
+        n.add_option('robert', default=0)
+        c = config_manager.ConfigurationManager(
+            n,
+            [],
+            use_admin_controls=False,
+            use_auto_help=False,
+            argv_source=[]
+        )
+        merged_values = MergedValueSources([
+            DotDict({'dwight': 20, 'wilma': 10}),
+            DotDict({'dwight': 20, 'wilma': 0, 'robert': 16}),
+        ])
+        for key in ('dwight', 'wilma', 'robert'):
+            c._overlay_option(key, merged_values, {}, set())
+        # the last value source that offers an option changes it if its
+        # value differs from the value of the value source before it
+        self.assertFalse(c.option_definitions.dwight.has_changed)
+        self.assertEqual(c.option_definitions.dwight.default, 20)
+        self.assertTrue(c.option_definitions.wilma.has_changed)
+        self.assertEqual(c.option_definitions.wilma.default, 0)
+        # or from the default, if no value source before it offers it
+        self.assertTrue(c.option_definitions.robert.has_changed)
+
+    #--------------------------------------------------------------------------
+    def _nested_class_namespace_setup(self):
+        n = config_manager.Namespace()
+        n.add_option(
+            'aclass',
+            default='configman.tests.test_config_manager.AClass',
+            from_string_converter=class_converter
+        )
+        n.namespace('source')
+        n.source.add_option(
+            'cls',
+            default='configman.tests.test_config_manager.T1',
+            from_string_converter=class_converter
+        )
+        return n
+
+    #--------------------------------------------------------------------------
+    def test_worklist_expansion_matches_iterative_expansion(self):
+        value_sources = [
+            {
+                'source': {
+                    'cls': 'configman.tests.test_config_manager.T3',
+                    'ccc.x': '101',
+                },
+                'zzz.fff.a': '17',
+            },
+            {
+                'xxx.yyy.a': '2',
+            },
+        ]
+        configs = []
+        for use_worklist_expansion in (False, True):
+            c = config_manager.ConfigurationManager(
+                self._nested_class_namespace_setup(),
+                value_sources,
+                use_admin_controls=True,
+                use_auto_help=False,
+                argv_source=[],
+                use_worklist_expansion=use_worklist_expansion,
+            )
+            configs.append(c.get_config(mapping_class=DotDict))
+        iterative_config, worklist_config = configs
+        self.assertEqual(
+            list(iterative_config.keys_breadth_first()),
+            list(worklist_config.keys_breadth_first())
+        )
+        self.assertEqual(iterative_config, worklist_config)
+        self.assertEqual(worklist_config.source.cls, T3)
+        self.assertEqual(worklist_config.source.ccc.x, 101)
+        self.assertEqual(worklist_config.zzz.fff.a, 17)
+        self.assertEqual(worklist_config.zzz.fff.bclass, BClass)
+        self.assertEqual(worklist_config.xxx.yyy.a, 2)
+        self.assertEqual(worklist_config.zzz.fff.ooo.a, 2)
+
+    #--------------------------------------------------------------------------
+    def test_worklist_expansion_visits_options_once(self):
+        cm_class = config_manager.ConfigurationManager
+        with mock.patch.object(
+            cm_class,
+            '_expand_option',
+            autospec=True,
+            side_effect=cm_class._expand_option
+        ) as expand_option_spy:
+            c = cm_class(
+                self._nested_class_namespace_setup(),
+                [],
+                use_admin_controls=False,
+                use_auto_help=False,
+                argv_source=[],
+                use_worklist_expansion=True,
+            )
+        expanded_keys = [
+            a_call[0][1] for a_call in expand_option_spy.call_args_list
+        ]
+        self.assertEqual(len(expanded_keys), len(set(expanded_keys)))
+        self.assertEqual(set(expanded_keys), set(c.get_option_names()))
+
+    #--------------------------------------------------------------------------
+    def test_mismatch_check_reuses_final_pass_values(self):
+        n = config_manager.Namespace()
+        n.add_option('a', default=1)
+        c = config_manager.ConfigurationManager(
+            n,
+            [{'a': 2}, getopt],
+            use_admin_controls=True,
+            use_auto_help=False,
+            argv_source=['--a=3']
+        )
+        self.assertEqual(c.get_config().a, 3)
+        mapping_source, getopt_source = c.values_source_list
+        with mock.patch.object(
+            mapping_source,
+            'get_values'
+        ) as mocked_mapping_get_values:
+            with mock.patch.object(
+                getopt_source,
+                'getopt_create_opts'
+            ) as mocked_getopt_create_opts:
+                c._check_for_mismatches(set(['a']))
+        self.assertFalse(mocked_mapping_get_values.called)
+        self.assertFalse(mocked_getopt_create_opts.called)
+
+        getopt_source.argv_source = ['--a=3', '--b=4']
+        self.assertRaises(
+            NotAnOptionError,
+            c._check_for_mismatches,
+            set(['a'])
+        )
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _write_ini_file(pathname, contents):
+        with open(pathname, 'w') as f:
+            f.write(contents)
+        # make sure that the change is seen even on file systems with a
+        # coarse modification time
+        stat = os.stat(pathname)
+        os.utime(pathname, (stat.st_atime, stat.st_mtime + 10))
+
+    #--------------------------------------------------------------------------
+    def _reload_setup(self, ini_contents, included_ini_contents=None):
+        ini_pathname = os.path.join(
+            tempfile.mkdtemp(),
+            'reload_test.ini'
+        )
+        if included_ini_contents is not None:
+            self._write_ini_file(
+                os.path.join(os.path.dirname(ini_pathname), 'included.ini'),
+                included_ini_contents
+            )
+        self._write_ini_file(ini_pathname, ini_contents)
+        self.addCleanup(shutil.rmtree, os.path.dirname(ini_pathname))
+        n = config_manager.Namespace()
+        n.add_option('a', default=1)
+        n.namespace('source')
+        n.source.add_option(
+            'cls',
+            default=T1,
+            from_string_converter=class_converter
+        )
+        n.namespace('other')
+        n.other.add_option('b', default='b')
+        c = config_manager.ConfigurationManager(
+            n,
+            [ini_pathname],
+            use_admin_controls=True,
+            use_auto_help=False,
+            argv_source=[],
+        )
+        return c, ini_pathname
+
+    #--------------------------------------------------------------------------
+    def test_reload_changed_values(self):
+        c, ini_pathname = self._reload_setup(
+            'a=2\n[source]\na=12\n[other]\nb=x\n'
+        )
+        config = c.get_config()
+        self.assertEqual(config.a, 2)
+        self.assertEqual(config.source.a, 12)
+
+        self.assertTrue(c.poll_for_reload() is None)
+        config, changes = c.reload()
+        self.assertEqual(changes, {})
+
+        source_changes = []
+        all_changes = []
+        c.subscribe('source', lambda cfg, chg: source_changes.append(chg))
+        c.subscribe('', lambda cfg, chg: all_changes.append(chg))
+
+        # 'a' is removed, it reverts to its defined default
+        self._write_ini_file(ini_pathname, '[source]\na=13\n[other]\nb=x\n')
+        config, changes = c.poll_for_reload()
+        self.assertEqual(config.a, 1)
+        self.assertEqual(config.source.a, 13)
+        self.assertEqual(config.other.b, 'x')
+        self.assertEqual(changes, {'a': (2, 1), 'source.a': (12, 13)})
+        self.assertEqual(source_changes, [{'source.a': (12, 13)}])
+        self.assertEqual(all_changes, [changes])
+
+    #--------------------------------------------------------------------------
+    def test_reload_changed_included_file(self):
+        c, ini_pathname = self._reload_setup(
+            'a=2\n[other]\n+include ./included.ini\n',
+            included_ini_contents='b=x\n'
+        )
+        self.assertEqual(c.get_config().other.b, 'x')
+        self.assertTrue(c.poll_for_reload() is None)
+
+        self._write_ini_file(
+            os.path.join(os.path.dirname(ini_pathname), 'included.ini'),
+            'b=y\n'
+        )
+        config, changes = c.poll_for_reload()
+        self.assertEqual(config.other.b, 'y')
+        self.assertEqual(changes, {'other.b': ('x', 'y')})
+
+    #--------------------------------------------------------------------------
+    def test_reload_re_expands_classes(self):
+        c, ini_pathname = self._reload_setup('[source]\na=12\n')
+        self.assertEqual(c.get_config().source.a, 12)
+        self._write_ini_file(
+            ini_pathname,
+            '[source]\ncls=configman.tests.test_config_manager.T2\nb=7\n'
+        )
+        config, changes = c.reload()
+        self.assertTrue(config.source.cls is T2)
+        self.assertEqual(config.source.b, 7)
+        self.assertEqual(changes['source.cls'], (T1, T2))
+        self.assertEqual(changes['source.b'], (None, 7))
+        # the options of the class that was replaced are left in place
+        self.assertEqual(config.source.a, 11)
+
+    #--------------------------------------------------------------------------
+    def test_failed_reload_leaves_the_configuration_untouched(self):
+        c, ini_pathname = self._reload_setup(
+            'a=2\n[admin]\nstrict=True\n[source]\na=12\n'
+        )
+        original_option_names = sorted(c.get_option_names())
+        original_value_sources = list(c.values_source_list)
+        # 'source.c' is not an option, a mismatch is an error in strict mode
+        self._write_ini_file(
+            ini_pathname,
+            'a=3\n[admin]\nstrict=True\n'
+            '[source]\ncls=configman.tests.test_config_manager.T2\nc=1\n'
+        )
+        self.assertRaises(NotAnOptionError, c.reload)
+        config = c.get_config()
+        self.assertEqual(config.a, 2)
+        self.assertTrue(config.source.cls is T1)
+        self.assertEqual(config.source.a, 12)
+        self.assertEqual(sorted(c.get_option_names()), original_option_names)
+        self.assertEqual(c.values_source_list, original_value_sources)
+
+        # the file is still seen as changed, the reload can be tried again
+        self._write_ini_file(
+            ini_pathname,
+            'a=3\n[admin]\nstrict=True\n'
+            '[source]\ncls=configman.tests.test_config_manager.T2\n'
+        )
+        config, changes = c.poll_for_reload()
+        self.assertEqual(config.a, 3)
+        self.assertTrue(config.source.cls is T2)
+        self.assertEqual(changes['a'], (2, 3))
+
+    #--------------------------------------------------------------------------
+    def test_reload_requested_by_signal(self):
+        c, ini_pathname = self._reload_setup('a=2\n')
+        original_handler = signal.getsignal(signal.SIGHUP)
+        self.addCleanup(signal.signal, signal.SIGHUP, original_handler)
+        c.install_reload_signal_handler()
+        with mock.patch.object(c, 'reload') as mocked_reload:
+            self.assertTrue(c.poll_for_reload() is None)
+            os.kill(os.getpid(), signal.SIGHUP)
+            c.poll_for_reload()
+            mocked_reload.assert_called_once_with(
+                DotDictWithAcquisition,
+                force=True
+            )
@@ -3,10 +3,19 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import types
 import unittest
 import datetime
+from collections import namedtuple
 import six
 
+import mock
+
 from configman import converters
 from configman import RequiredConfig, Namespace, ConfigurationManager
 from configman.dotdict import DotDict
@@ -172,6 +181,161 @@ class TestCase(unittest.TestCase):
         """),
             Foo)
 
+    #--------------------------------------------------------------------------
+    def test_str_to_python_object_remembers_resolutions(self):
+        function = converters.str_to_python_object
+        cache = converters._import_cache
+        cache.cache_clear()
+        self.assertTrue(function('configman.tests.test_converters.Foo') is Foo)
+        self.assertTrue(
+            function(' configman.tests.test_converters.Foo') is Foo
+        )
+        self.assertEqual(cache.cache_info().hits, 1)
+
+        # a module replaced in sys.modules is imported again
+        self.assertTrue(function('collections.namedtuple') is namedtuple)
+        import collections
+        fake_module = types.ModuleType('collections')
+        fake_module.namedtuple = Foo
+        with mock.patch.dict(sys.modules, {'collections': fake_module}):
+            self.assertTrue(function('collections.namedtuple') is Foo)
+        self.assertTrue(function('collections.namedtuple') is namedtuple)
+        self.assertTrue(sys.modules['collections'] is collections)
+
+        # so are attributes that have gone
+        self.assertTrue(function('configman.tests.test_converters.Foo') is Foo)
+        with mock.patch.object(
+            sys.modules[__name__],
+            'Imported',
+            create=True
+        ) as imported:
+            self.assertTrue(
+                function('configman.tests.test_converters.Imported')
+                is imported
+            )
+        self.assertRaises(
+            converters.CannotConvertError,
+            function,
+            'configman.tests.test_converters.Imported'
+        )
+
+    #--------------------------------------------------------------------------
+    def test_str_to_python_object_remembers_failures(self):
+        function = converters.str_to_python_object
+        cache = converters._import_cache
+        cache.cache_clear()
+        name = 'not_a_module_%d.Foo' % id(self)
+        self.assertRaises(converters.CannotConvertError, function, name)
+        with mock.patch(
+            'six.moves.builtins.__import__',
+            side_effect=AssertionError('imported')
+        ):
+            self.assertRaises(converters.CannotConvertError, function, name)
+        self.assertEqual(cache.cache_info().hits, 1)
+
+        # a new module may make the name resolvable
+        fake_module = types.ModuleType(name.rsplit('.', 1)[0])
+        fake_module.Foo = Foo
+        with mock.patch.dict(sys.modules, {fake_module.__name__: fake_module}):
+            self.assertTrue(function(name) is Foo)
+
+        # so may a module replaced in sys.modules
+        with mock.patch.dict(sys.modules, {fake_module.__name__: None}):
+            sys.modules[fake_module.__name__] = types.ModuleType(
+                fake_module.__name__
+            )
+            self.assertRaises(converters.CannotConvertError, function, name)
+            self.assertRaises(converters.CannotConvertError, function, name)
+            sys.modules[fake_module.__name__] = fake_module
+            self.assertTrue(function(name) is Foo)
+
+        # or an attribute of __main__ defined later
+        name = 'not_yet_defined_%d' % id(self)
+        self.assertRaises(converters.CannotConvertError, function, name)
+        self.assertRaises(converters.CannotConvertError, function, name)
+        with mock.patch.object(
+            sys.modules['__main__'],
+            name,
+            Foo,
+            create=True
+        ):
+            self.assertTrue(function(name) is Foo)
+
+    #--------------------------------------------------------------------------
+    def test_str_to_python_object_notices_new_module_files(self):
+        function = converters.str_to_python_object
+        converters._import_cache.cache_clear()
+        module_name = 'written_later_%d' % id(self)
+        name = '%s.Foo' % module_name
+        directory = tempfile.mkdtemp()
+        try:
+            with mock.patch.object(sys, 'path', list(sys.path)):
+                self.assertRaises(
+                    converters.CannotConvertError,
+                    function,
+                    name
+                )
+                # a directory added to the path may hold the module
+                sys.path.append(directory)
+                with open(os.path.join(directory, 'mod.py'), 'w') as f:
+                    f.write('Foo = 1\n')
+                self.assertRaises(
+                    converters.CannotConvertError,
+                    function,
+                    name
+                )
+                # so may a file written to a directory already searched
+                with open(
+                    os.path.join(directory, module_name + '.py'),
+                    'w'
+                ) as f:
+                    f.write('Foo = 17\n')
+                later = os.stat(directory).st_mtime + 10
+                os.utime(directory, (later, later))
+                self.assertEqual(function(name), 17)
+        finally:
+            sys.modules.pop(module_name, None)
+            shutil.rmtree(directory)
+
+    #--------------------------------------------------------------------------
+    def test_str_to_python_object_doesnt_remember_broken_modules(self):
+        function = converters.str_to_python_object
+        cache = converters._import_cache
+        cache.cache_clear()
+        name = 'broken_module_%d.Foo' % id(self)
+        with mock.patch(
+            'six.moves.builtins.__import__',
+            side_effect=ImportError('No module named missing_dependency')
+        ):
+            self.assertRaises(converters.CannotConvertError, function, name)
+        self.assertEqual(cache.cache_info().size, 0)
+
+    #--------------------------------------------------------------------------
+    def test_str_to_python_object_converts_while_following_attributes(self):
+        function = converters.str_to_python_object
+
+        class NestingModule(types.ModuleType):
+            # an attribute of this module converts another name
+            @property
+            def Nested(inner_self):
+                return function('configman.tests.test_converters.Foo')
+
+        module_name = 'nesting_module_%d' % id(self)
+        a_module = NestingModule(module_name)
+        results = []
+
+        def convert():
+            for i in range(2):
+                results.append(function('%s.Nested' % module_name))
+
+        with mock.patch.dict(sys.modules, {module_name: a_module}):
+            a_thread = threading.Thread(target=convert)
+            a_thread.daemon = True
+            a_thread.start()
+            a_thread.join(10)
+        self.assertFalse(a_thread.is_alive())
+        self.assertEqual(results, [Foo, Foo])
+
     #--------------------------------------------------------------------------
     def test_dict_conversions(self):
         d = {
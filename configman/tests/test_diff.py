@@ -0,0 +1,52 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+import unittest
+
+from configman import Namespace
+from configman.diff import diff
+from configman.dotdict import DotDict, DotDictWithAcquisition
+
+
+#==============================================================================
+class TestCase(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    def test_diff(self):
+        shared = DotDict({'x': 1, 'y': {'z': 2}})
+        a = DotDictWithAcquisition({'a': 1, 'b': 2, 'c': {'d': 3, 'e': 4}})
+        a.shared = shared
+        b = DotDictWithAcquisition(
+            {'a': 1, 'b': 22, 'c': {'a': 1, 'd': 3, 'f': 5}}
+        )
+        b.shared = shared
+        b.g = DotDict({'h': 6})
+        added, removed, changed = diff(a, b)
+        # 'c.a' is found in 'a' only via acquisition, it's still added
+        self.assertEqual(sorted(added), ['c.a', 'c.f', 'g.h'])
+        self.assertEqual(removed, ['c.e'])
+        self.assertEqual(changed, ['b'])
+        added, removed, changed = diff(b, a)
+        self.assertEqual(added, ['c.e'])
+        self.assertEqual(sorted(removed), ['c.a', 'c.f', 'g.h'])
+
+    #--------------------------------------------------------------------------
+    def test_diff_of_option_definitions(self):
+        n1 = Namespace()
+        n1.add_option('a', default=1)
+        n1.namespace('b')
+        n1.b.add_option('c', default=2)
+        n2 = n1.safe_copy()
+        self.assertEqual(diff(n1, n2), ([], [], []))
+        n2.b.c.set_value(3)
+        n2.add_option('d', default=4)
+        self.assertEqual(diff(n1, n2), (['d'], [], ['b.c']))
+
+    #--------------------------------------------------------------------------
+    def test_diff_of_flat_mappings(self):
+        # values that are mappings, but not DotDicts, are compared whole
+        a = {'a': {'x': 1}, 'b.c': 2, 'd': 3}
+        b = {'a': {'x': 2}, 'b.c': 2, 'e': 4}
+        self.assertEqual(diff(a, b), (['e'], ['d'], ['a']))
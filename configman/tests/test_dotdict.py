@@ -4,16 +4,22 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 from __future__ import absolute_import, division, print_function
 
+import copy
+import pickle
 import six
 import unittest
+import weakref
 from configman.dotdict import (
     DotDict,
     DotDictWithAcquisition,
+    FrozenDotDict,
+    PersistentDotDict,
     iteritems_breadth_first,
     configman_keys,
-    create_key_translating_dot_dict
+    create_key_translating_dot_dict,
+    _compile_key_translation,
 )
-from configman.orderedset import OrderedSet
+from configman.orderedset import OrderedSet, DictWithKeyList
 from configman import Namespace
 
 
@@ -605,3 +611,374 @@ class TestCase(unittest.TestCase):
             '\te.a: 8',
         ])
         self.assertEqual(output, expected_output)
+
+    #--------------------------------------------------------------------------
+    def test_the_python_2_6_ordered_dict(self):
+        d = DictWithKeyList([('b', 1), ('a', 2)], c=3)
+        d['x'] = 4
+        del d['a']
+        self.assertEqual(list(d), ['b', 'c', 'x'])
+        self.assertEqual(d.items(), [('b', 1), ('c', 3), ('x', 4)])
+        self.assertEqual(d.popitem(last=False), ('b', 1))
+        self.assertEqual(d.pop('x'), 4)
+        self.assertEqual(d.pop('x', None), None)
+        self.assertEqual(pickle.loads(pickle.dumps(d, 2)).items(), [('c', 3)])
+
+        # it can be the __dict__ of a DotDict
+        a_dot_dict = DotDict()
+        object.__setattr__(a_dot_dict, '__dict__', DictWithKeyList())
+        a_dot_dict['z.y'] = 1
+        a_dot_dict['a'] = 2
+        self.assertEqual(list(a_dot_dict.keys_breadth_first()), ['a', 'z.y'])
+        self.assertEqual(list(a_dot_dict._key_order), ['z', 'a'])
+
+    #--------------------------------------------------------------------------
+    def test_pickle_and_copy(self):
+        d = DotDictWithAcquisition()
+        d['a.b.c'] = 17
+        d.x = 99
+        for a_copy in (
+            pickle.loads(pickle.dumps(d, 2)),
+            copy.deepcopy(d),
+        ):
+            self.assertEqual(list(a_copy.keys_breadth_first()), ['x', 'a.b.c'])
+            self.assertEqual(a_copy.a.b.c, 17)
+            # the parents are restored for acquisition
+            self.assertEqual(a_copy.a.b.x, 99)
+
+        n = Namespace(doc='top')
+        n.add_option('a', default=1)
+        n.namespace('b', doc='lower')
+        n.b.ref_value_namespace()
+        a_copy = pickle.loads(pickle.dumps(n, 2))
+        self.assertEqual(a_copy._doc, 'top')
+        self.assertEqual(a_copy.b._doc, 'lower')
+        self.assertTrue(a_copy.b._reference_value_from)
+        self.assertEqual(a_copy.a.default, 1)
+
+    #--------------------------------------------------------------------------
+    def test_the_dict_holds_only_the_items(self):
+        d = DotDictWithAcquisition()
+        d['a.b'] = 1
+        d['__doc__'] = 'from a module'
+        self.assertEqual(d.__dict__, {'a': d.a, '__doc__': 'from a module'})
+        self.assertEqual(list(d.a.__dict__), ['b'])
+        self.assertEqual(d.__doc__, 'from a module')
+        n = Namespace(doc='top')
+        self.assertEqual(len(n.__dict__), 0)
+        self.assertEqual(n._doc, 'top')
+
+    #--------------------------------------------------------------------------
+    def test_key_index(self):
+        d = DotDict()
+        d['a.b.c'] = 17
+        d.enable_key_index()
+        d['a.b.d'] = 8
+        # the index is built by the first lookup of a qualified key
+        self.assertTrue(d._key_index.entries is None)
+        self.assertEqual(d['a'].b.d, 8)
+        self.assertTrue(d._key_index.entries is None)
+        self.assertTrue(d.a._key_index_memberships is None)
+        self.assertEqual(d['a.b.c'], 17)
+        self.assertEqual(d._key_index.entries['a.b.d'], 8)
+        d.a['x'] = 99
+        d.b = 21
+        a_b = d.a.b
+        a_b.e = DotDict({'f': 1})
+        self.assertEqual(d['a.b.e.f'], 1)
+        self.assertEqual(d['a.x'], 99)
+        self.assertEqual(
+            list(d.keys_breadth_first(include_dicts=True)),
+            ['a', 'b', 'a.b', 'a.x', 'a.b.c', 'a.b.d', 'a.b.e', 'a.b.e.f']
+        )
+        self.assertEqual(
+            list(d.keys_breadth_first()),
+            ['b', 'a.x', 'a.b.c', 'a.b.d', 'a.b.e.f']
+        )
+
+        # replacing and deleting subtrees takes their keys out of the index
+        d.a.b = 'no longer a DotDict'
+        self.assertEqual(d['a.b'], 'no longer a DotDict')
+        a_b.c = 'detached'
+        self.assertEqual(
+            list(d.keys_breadth_first(include_dicts=True)),
+            ['a', 'b', 'a.b', 'a.x']
+        )
+        del d['a.x']
+        self.assertFalse('a.x' in d)
+        del d.a
+        self.assertEqual(list(d.keys_breadth_first(True)), ['b'])
+
+        d.disable_key_index()
+        d['a.b.c'] = 3
+        self.assertEqual(list(d.keys_breadth_first()), ['b', 'a.b.c'])
+        self.assertEqual(a_b._key_index_memberships, [])
+
+    #--------------------------------------------------------------------------
+    def test_key_index_with_acquisition_and_translation(self):
+        d = DotDictWithAcquisition()
+        d.x = 1
+        d['a.b.c'] = 2
+        d.enable_key_index()
+        self.assertEqual(d['a.b.x'], 1)
+        self.assertEqual(d['a.b.c'], 2)
+
+        HyphenUnderscoreDict = create_key_translating_dot_dict(
+            "HyphenUnderscoreDict",
+            (('-', '_'),)
+        )
+        d = HyphenUnderscoreDict()
+        d.enable_key_index()
+        d['a-a.b-b'] = 17
+        self.assertEqual(d['a_a.b_b'], 17)
+        self.assertEqual(d['a-a.b-b'], 17)
+        self.assertEqual(list(d.keys_breadth_first()), ['a_a.b_b'])
+
+    #--------------------------------------------------------------------------
+    def test_modification_counts(self):
+        d = DotDict()
+        d['a.b.c'] = 1
+        a, a_b = d.a, d.a.b
+        # nothing is counted until a cache depends on the counts
+        a_b.untracked = 1
+        self.assertEqual(
+            (
+                d._modification_count,
+                a._modification_count,
+                a_b._modification_count
+            ),
+            (0, 0, 0)
+        )
+        self.assertTrue(a_b._parents is None)
+        d.keys_breadth_first()
+        counts = (
+            d._modification_count,
+            a._modification_count,
+            a_b._modification_count
+        )
+        a_b.x = 2
+        self.assertEqual(
+            (
+                d._modification_count,
+                a._modification_count,
+                a_b._modification_count
+            ),
+            tuple(x + 1 for x in counts)
+        )
+        # changing the value of a key doesn't change the keys
+        a_b.x = 3
+        self.assertEqual(a_b._modification_count, counts[2] + 1)
+
+        # a DotDict held in two places counts its changes in both
+        e = DotDict()
+        e.shared = a_b
+        e.keys_breadth_first()
+        d_count, e_count = d._modification_count, e._modification_count
+        del a_b.x
+        self.assertEqual(d._modification_count, d_count + 1)
+        self.assertEqual(e._modification_count, e_count + 1)
+
+        # a DotDict removed from the tree no longer counts in it
+        del d.a
+        d_count = d._modification_count
+        a_b.y = 4
+        self.assertEqual(d._modification_count, d_count)
+
+        # even a cycle is counted just once
+        d.cycle = d
+        d_count = d._modification_count
+        d.z = 5
+        self.assertEqual(d._modification_count, d_count + 1)
+
+    #--------------------------------------------------------------------------
+    def test_keys_breadth_first_is_cached(self):
+        d = DotDict()
+        d['a.b.c'] = 1
+        d.x = 2
+        keys = list(d.keys_breadth_first())
+        self.assertEqual(keys, ['x', 'a.b.c'])
+        self.assertTrue(
+            d._keys_breadth_first is not None
+            and d._keys_breadth_first[2] == keys
+        )
+        cached = d._keys_breadth_first
+        d.x = 3
+        list(d.keys_breadth_first())
+        self.assertTrue(d._keys_breadth_first is cached)
+
+        d.a.b.d = 4
+        self.assertEqual(
+            list(d.keys_breadth_first()),
+            ['x', 'a.b.c', 'a.b.d']
+        )
+        self.assertEqual(
+            list(d.keys_breadth_first(include_dicts=True)),
+            ['a', 'x', 'a.b', 'a.b.c', 'a.b.d']
+        )
+        d.a.b = 5
+        self.assertEqual(list(d.keys_breadth_first()), ['x', 'a.b'])
+        d2 = pickle.loads(pickle.dumps(d))
+        d2.a.c = 6
+        self.assertEqual(list(d2.keys_breadth_first()), ['x', 'a.b', 'a.c'])
+
+    #--------------------------------------------------------------------------
+    def test_flatten_acquisition(self):
+        d = DotDictWithAcquisition()
+        d.hostname = 'localhost'
+        d['a.b.c.x'] = 1
+        a, c = d.a, d.a.b.c
+        d.flatten_acquisition()
+        self.assertEqual(c.hostname, 'localhost')
+        self.assertEqual(list(c._acquired[2].keys()), ['hostname'])
+
+        # replacing the acquired value is seen right away
+        d.hostname = 'example.com'
+        self.assertEqual(c.hostname, 'example.com')
+        # as is a nearer ancestor taking the key
+        a.hostname = 'a.example.com'
+        self.assertEqual(c.hostname, 'a.example.com')
+        del a.hostname
+        self.assertEqual(c.hostname, 'example.com')
+
+        # missing keys are still missing
+        self.assertRaises(KeyError, getattr, c, 'port')
+        d.port = 80
+        self.assertEqual(c.port, 80)
+        self.assertRaises(AttributeError, getattr, c, '__missing__')
+
+        # a nested mapping added later joins the flattening
+        a.y = DotDictWithAcquisition()
+        self.assertEqual(a.y.port, 80)
+        self.assertTrue(a.y._acquired is not None)
+        self.assertEqual(a.y._acquired[2], {'port': d})
+
+        # the flattening isn't part of a copy
+        d2 = copy.deepcopy(d)
+        self.assertTrue(d2.a.b.c._acquired is None)
+        self.assertEqual(d2.a.b.c.hostname, 'example.com')
+
+    #--------------------------------------------------------------------------
+    def test_flatten_acquisition_below_the_top(self):
+        d = DotDictWithAcquisition()
+        d.hostname = 'localhost'
+        d['a.b.x'] = 1
+        a, b = d.a, d.a.b
+        a.flatten_acquisition()
+        self.assertEqual(b.hostname, 'localhost')
+        # the ancestors of the flattened tree are not watched, so what is
+        # acquired from them is not remembered
+        self.assertEqual(b._acquired[2], {})
+        d.hostname = 'example.com'
+        self.assertEqual(b.hostname, 'example.com')
+
+    #--------------------------------------------------------------------------
+    def test_frozen_dot_dict(self):
+        d = FrozenDotDict({'a': 1, 'b.c': 2, 'x': {'y': [3]}})
+        self.assertEqual(d.b.c, 2)
+        self.assertEqual(d['x.y'], [3])
+        self.assertTrue(isinstance(d.x, FrozenDotDict))
+        self.assertEqual(
+            list(d.keys_breadth_first()),
+            ['a', 'b.c', 'x.y']
+        )
+        self.assertRaises(TypeError, setattr, d, 'a', 2)
+        self.assertRaises(TypeError, d.__setitem__, 'b.c', 2)
+        self.assertRaises(TypeError, d.__setitem__, 'z', 2)
+        self.assertRaises(TypeError, delattr, d.b, 'c')
+        self.assertRaises(TypeError, d.__delitem__, 'a')
+        self.assertRaises(TypeError, d.update, {'a': 2})
+        self.assertEqual(d.a, 1)
+
+        self.assertTrue(copy.copy(d) is d)
+        self.assertTrue(copy.deepcopy(d) is d)
+        self.assertEqual(pickle.loads(pickle.dumps(d)), d)
+        self.assertEqual(FrozenDotDict.freeze(d), d)
+        self.assertTrue(FrozenDotDict.freeze(d) is d)
+        self.assertEqual(d, DotDict({'a': 1, 'b.c': 2, 'x.y': [3]}))
+        self.assertNotEqual(d, FrozenDotDict({'a': 1, 'b.c': 3}))
+
+        # hashing
+        self.assertRaises(TypeError, hash, d)  # the list isn't hashable
+        d = FrozenDotDict({'a': 1, 'b.c': 2})
+        self.assertEqual(hash(d), hash(FrozenDotDict({'b.c': 2, 'a': 1})))
+        self.assertEqual(len(set([d, FrozenDotDict(d), d.b])), 2)
+
+    #--------------------------------------------------------------------------
+    def test_frozen_dot_dict_evolve(self):
+        d = FrozenDotDict({'a': 1, 'b.c': 2, 'x.y': 3})
+        d2 = d.evolve(a=10, b__c=20, b__d=30, z__w=40)
+        self.assertEqual(
+            d2,
+            {'a': 10, 'b': {'c': 20, 'd': 30}, 'x': {'y': 3}, 'z': {'w': 40}}
+        )
+        self.assertEqual(d, {'a': 1, 'b': {'c': 2}, 'x': {'y': 3}})
+        self.assertTrue(d2.x is d.x)
+        self.assertTrue(isinstance(d2.z, FrozenDotDict))
+        self.assertTrue(d.evolve() is d)
+
+        d3 = d.evolve(b={'e': 5}, b__f=6)
+        self.assertEqual(d3.b, {'e': 5, 'f': 6})
+        self.assertTrue(isinstance(d3.b, FrozenDotDict))
+        self.assertRaises(TypeError, d.evolve, a__b=1)
+
+    #--------------------------------------------------------------------------
+    def test_persistent_dot_dict(self):
+        base = PersistentDotDict({
+            'timeout': 10,
+            'database.port': 5432,
+            'database.pool.size': 4,
+            'cache.ttl': 60,
+        })
+        self.assertTrue(isinstance(base.database.pool, PersistentDotDict))
+        self.assertRaises(TypeError, setattr, base, 'timeout', 30)
+
+        tenant = base.set('database.pool.size', 8)
+        self.assertEqual(tenant.database.pool.size, 8)
+        self.assertEqual(tenant['database.pool.size'], 8)
+        self.assertEqual(base.database.pool.size, 4)
+        # only the mappings on the path to the key are new
+        self.assertTrue(tenant.cache is base.cache)
+        self.assertFalse(tenant.database is base.database)
+        self.assertEqual(tenant.database.port, 5432)
+        self.assertEqual(
+            list(tenant.keys_breadth_first()),
+            list(base.keys_breadth_first())
+        )
+
+        tenant = tenant.set('logging.level', 'debug')
+        self.assertEqual(tenant.logging.level, 'debug')
+        self.assertFalse('logging' in base)
+
+        smaller = tenant.delete('database.pool')
+        self.assertEqual(list(smaller.database.keys()), ['port'])
+        self.assertEqual(tenant.database.pool.size, 8)
+        self.assertTrue(smaller.cache is base.cache)
+        self.assertRaises(KeyError, base.delete, 'database.nothing')
+        self.assertRaises(KeyError, base.delete, 'timeout.nothing')
+
+    #--------------------------------------------------------------------------
+    def test_compiled_key_translation(self):
+        translate = _compile_key_translation((('-', '_'),))
+        self.assertEqual(translate('a-b-c'), 'a_b_c')
+        self.assertTrue(_compile_key_translation((('-', '_'),)) is translate)
+
+        translate = _compile_key_translation((('--', '.'), ('+', 'plus')))
+        self.assertEqual(translate('a--b+c---d'), 'a.bplusc.-d')
+
+        # these depend upon their order, they are applied one after the other
+        translate = _compile_key_translation((('-', '_'), ('_', '.')))
+        self.assertEqual(translate('a-b_c'), 'a.b.c')
+        translate = _compile_key_translation((('ba', 'X'), ('ab', 'Y')))
+        self.assertEqual(translate('aba'), 'aX')
+
+        HyphenUnderscoreDict = create_key_translating_dot_dict(
+            "HyphenUnderscoreDict",
+            (('-', '_'),)
+        )
+        d = HyphenUnderscoreDict()
+        d['a-b'] = 1
+        self.assertEqual(d.a_b, 1)
+        # the translations hold no references to the instances
+        a_reference = weakref.ref(d)
+        del d
+        self.assertTrue(a_reference() is None)
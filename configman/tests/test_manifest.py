@@ -0,0 +1,288 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from six.moves import cStringIO as StringIO
+
+from configman import Namespace, manifest
+from configman.config_manager import ConfigurationManager
+from configman.converters import class_converter, to_str
+from configman.lazy_import import LazyImport
+from configman.manifest import Manifest
+
+plugins_source = '''
+import datetime
+
+from configman import Namespace, RequiredConfig
+from configman.converters import class_converter
+from %(package)s.helpers import Helper
+
+
+def total(config, local_config, args):
+    return local_config.size * 2
+
+
+class Base(RequiredConfig):
+    required_config = Namespace()
+    required_config.add_option('size', default=10, doc='the size')
+    required_config.add_option(
+        'timeout',
+        default=datetime.timedelta(seconds=30),
+        doc='the timeout'
+    )
+
+
+class Plugin(Base):
+    required_config = Namespace()
+    required_config.namespace('inner', doc='inner things')
+    required_config.inner.add_option('name', default='fred', short_form='n')
+    required_config.add_option(
+        'helper',
+        default='%(package)s.helpers.Helper',
+        from_string_converter=class_converter
+    )
+    required_config.add_option('fallback', default=Helper)
+    required_config.add_aggregation('total', total)
+
+    def __init__(self, config):
+        self.config = config
+
+
+class UnwritablePlugin(RequiredConfig):
+    required_config = Namespace()
+    required_config.add_option(
+        'x',
+        default='1',
+        from_string_converter=lambda x: int(x)
+    )
+'''
+
+helpers_source = '''
+from configman import Namespace, RequiredConfig
+
+
+class Helper(RequiredConfig):
+    required_config = Namespace()
+    required_config.add_option('level', default=3, doc='the level')
+'''
+
+
+#------------------------------------------------------------------------------
+def stringIO_context_wrapper(a_stringIO_instance):
+    @contextlib.contextmanager
+    def stringIO_context_manager():
+        yield a_stringIO_instance
+    return stringIO_context_manager
+
+
+#==============================================================================
+class TestCase(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.package_name = 'manifest_test_%d' % id(self)
+        package_directory = os.path.join(self.directory, self.package_name)
+        os.mkdir(package_directory)
+        with open(os.path.join(package_directory, '__init__.py'), 'w'):
+            pass
+        self.plugins_pathname = os.path.join(package_directory, 'plugins.py')
+        with open(self.plugins_pathname, 'w') as f:
+            f.write(plugins_source % {'package': self.package_name})
+        with open(os.path.join(package_directory, 'helpers.py'), 'w') as f:
+            f.write(helpers_source)
+        self.manifest_pathname = os.path.join(self.directory, 'manifest.json')
+        sys.path.insert(0, self.directory)
+
+    #--------------------------------------------------------------------------
+    def tearDown(self):
+        sys.path.remove(self.directory)
+        self._forget_modules()
+        shutil.rmtree(self.directory)
+
+    #--------------------------------------------------------------------------
+    def _forget_modules(self):
+        for a_name in list(sys.modules):
+            if a_name.startswith(self.package_name):
+                del sys.modules[a_name]
+
+    #--------------------------------------------------------------------------
+    def _imported(self):
+        # Python 2 leaves None in sys.modules for its relative imports
+        return sorted(
+            x for x, a_module in sys.modules.items()
+            if x.startswith(self.package_name + '.') and a_module is not None
+        )
+
+    #--------------------------------------------------------------------------
+    def _definitions(self):
+        n = Namespace()
+        n.namespace('source')
+        n.source.add_option(
+            'cls',
+            default='%s.plugins.Plugin' % self.package_name,
+            from_string_converter=class_converter
+        )
+        return n
+
+    #--------------------------------------------------------------------------
+    def _config_manager(self, **kwargs):
+        return ConfigurationManager(
+            self._definitions(),
+            values_source_list=[],
+            argv_source=[],
+            **kwargs
+        )
+
+    #--------------------------------------------------------------------------
+    def _ini(self, config_manager):
+        output = StringIO()
+        config_manager.write_conf('ini', stringIO_context_wrapper(output))
+        return output.getvalue()
+
+    #--------------------------------------------------------------------------
+    def _generate(self):
+        cm = self._config_manager()
+        a_manifest = manifest.generate(
+            self.manifest_pathname,
+            cm,
+            ['%s.plugins.UnwritablePlugin' % self.package_name]
+        )
+        expected = (
+            sorted(cm.get_option_names()),
+            self._ini(cm),
+        )
+        self._forget_modules()
+        return a_manifest, expected
+
+    #--------------------------------------------------------------------------
+    def test_generate(self):
+        a_manifest, expected = self._generate()
+        self.assertEqual(
+            sorted(a_manifest.classes),
+            [
+                '%s.helpers.Helper' % self.package_name,
+                '%s.plugins.Plugin' % self.package_name,
+            ]
+        )
+        self.assertEqual(
+            Manifest.load(self.manifest_pathname).classes,
+            a_manifest.classes
+        )
+        # a missing manifest is an empty one
+        self.assertEqual(
+            Manifest.load(os.path.join(self.directory, 'nothing')).classes,
+            {}
+        )
+
+    #--------------------------------------------------------------------------
+    def test_expansion_without_imports(self):
+        a_manifest, expected = self._generate()
+        cm = self._config_manager(manifest=self.manifest_pathname)
+        self.assertEqual((sorted(cm.get_option_names()), self._ini(cm)),
+                         expected)
+        self.assertTrue('source.level' in cm.get_option_names())
+        self.assertEqual(self._imported(), [])
+        self.assertTrue(
+            isinstance(cm.option_definitions.source.cls.value, LazyImport)
+        )
+
+        # the help doesn't import anything either, it names the class
+        output = StringIO()
+        cm.output_summary(output)
+        self.assertTrue('source.level' in output.getvalue())
+        self.assertTrue(
+            '(default: %s.plugins.Plugin)' % self.package_name
+            in output.getvalue()
+        )
+        self.assertFalse('LazyImport' in output.getvalue())
+        output = StringIO()
+        cm.write_conf('json', stringIO_context_wrapper(output))
+        self.assertEqual(
+            json.loads(output.getvalue())['source']['cls']['value'],
+            '%s.plugins.Plugin' % self.package_name
+        )
+        self.assertEqual(self._imported(), [])
+
+        # the config has the classes themselves
+        config = cm.get_config()
+        self.assertEqual(
+            self._imported(),
+            [
+                '%s.helpers' % self.package_name,
+                '%s.plugins' % self.package_name,
+            ]
+        )
+        plugins_module = sys.modules['%s.plugins' % self.package_name]
+        self.assertTrue(config.source.cls is plugins_module.Plugin)
+        self.assertTrue(config.source.helper is plugins_module.Helper)
+        self.assertTrue(config.source.fallback is plugins_module.Helper)
+        self.assertEqual(config.source.total, 20)
+        a_plugin = config.source.cls(config.source)
+        self.assertTrue(isinstance(a_plugin, config.source.cls))
+        self.assertEqual(
+            to_str(config.source.helper),
+            '%s.helpers.Helper' % self.package_name
+        )
+        # the option definitions are left as they were
+        self.assertTrue(
+            isinstance(cm.option_definitions.source.cls.value, LazyImport)
+        )
+
+    #--------------------------------------------------------------------------
+    def test_write_python_module(self):
+        cm = self._config_manager()
+        expected = StringIO()
+        cm.write_conf('py', stringIO_context_wrapper(expected))
+        manifest.generate(self.manifest_pathname, cm)
+        self._forget_modules()
+
+        cm = self._config_manager(manifest=self.manifest_pathname)
+        self.assertEqual(self._imported(), [])
+        output = StringIO()
+        # the classes are imported by the module that is written
+        cm.write_conf('py', stringIO_context_wrapper(output))
+        self.assertEqual(output.getvalue(), expected.getvalue())
+        # writing didn't change the option definitions
+        self.assertTrue(
+            isinstance(cm.option_definitions.source.cls.value, LazyImport)
+        )
+
+    #--------------------------------------------------------------------------
+    def test_changed_class_is_imported(self):
+        self._generate()
+        # the plugins module changes after the manifest was written
+        with open(self.plugins_pathname, 'a') as f:
+            f.write('\n# a change\n')
+        stat = os.stat(self.plugins_pathname)
+        os.utime(self.plugins_pathname, (stat.st_atime, stat.st_mtime + 10))
+        cm = self._config_manager(manifest=self.manifest_pathname)
+        plugins_module = sys.modules['%s.plugins' % self.package_name]
+        self.assertTrue(
+            cm.option_definitions.source.cls.value is plugins_module.Plugin
+        )
+        # the helpers module was imported by the plugins module
+        self.assertTrue(
+            cm.option_definitions.source.helper.value is plugins_module.Helper
+        )
+        self.assertTrue('source.level' in cm.get_option_names())
+
+    #--------------------------------------------------------------------------
+    def test_imported_class_is_used(self):
+        a_manifest, expected = self._generate()
+        __import__('%s.plugins' % self.package_name)
+        cm = self._config_manager(manifest=a_manifest)
+        plugins_module = sys.modules['%s.plugins' % self.package_name]
+        self.assertTrue(
+            cm.option_definitions.source.cls.value is plugins_module.Plugin
+        )
+        self.assertEqual(sorted(cm.get_option_names()), expected[0])
@@ -3,9 +3,14 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 from __future__ import absolute_import, division, print_function
 
+import gc
+import threading
 import unittest
+import weakref
 
-from configman.memoize import memoize
+import mock
+
+from configman.memoize import memoize, CacheInfo
 
 
 #==============================================================================
@@ -91,3 +96,162 @@ class TestCase(unittest.TestCase):
             expected = [(x, x, x) for x in range(10)]
             self.assertEqual(results, expected)
             self.assertEqual(A.counter, 10)
+
+    #--------------------------------------------------------------------------
+    def test_least_recently_used_is_evicted(self):
+
+        @memoize(max_cache_size=2)
+        def foo(a):
+            foo.counter += 1
+            return a
+        foo.counter = 0
+
+        foo(1)
+        foo(2)
+        foo(1)  # 2 is now the least recently used
+        foo(3)  # evicts 2
+        self.assertEqual(foo.counter, 3)
+        foo(1)
+        self.assertEqual(foo.counter, 3)
+        foo(2)
+        self.assertEqual(foo.counter, 4)
+        self.assertEqual(
+            foo.cache_info(),
+            CacheInfo(hits=2, misses=4, evictions=2, max_size=2, size=2)
+        )
+        foo.cache_clear()
+        self.assertEqual(
+            foo.cache_info(),
+            CacheInfo(hits=0, misses=0, evictions=0, max_size=2, size=0)
+        )
+
+    #--------------------------------------------------------------------------
+    def test_time_to_live(self):
+
+        @memoize(ttl=10)
+        def foo(a):
+            foo.counter += 1
+            return a
+        foo.counter = 0
+
+        with mock.patch('configman.memoize._now') as mocked_now:
+            mocked_now.return_value = 100
+            foo(1)
+            mocked_now.return_value = 109
+            foo(1)
+            self.assertEqual(foo.counter, 1)
+            mocked_now.return_value = 110
+            foo(1)
+            self.assertEqual(foo.counter, 2)
+        self.assertEqual(foo.cache_info().evictions, 1)
+
+    #--------------------------------------------------------------------------
+    def test_unhashable_arguments_are_not_cached(self):
+
+        @memoize()
+        def foo(a, b=None):
+            foo.counter += 1
+            return a
+        foo.counter = 0
+
+        self.assertEqual(foo([1]), [1])
+        self.assertEqual(foo([1]), [1])
+        self.assertEqual(foo.counter, 2)
+        foo(1, b=2)
+        foo(1, b=2)
+        self.assertEqual(foo.counter, 3)
+
+    #--------------------------------------------------------------------------
+    def test_instances_have_their_own_caches(self):
+
+        class A(object):
+            @memoize()
+            def foo(self, a):
+                return (id(self), a)
+
+        a = A()
+        b = A()
+        a.foo(1)
+        a.foo(1)
+        b.foo(1)
+        self.assertEqual(a.foo.cache_info().hits, 1)
+        self.assertEqual(b.foo.cache_info().hits, 0)
+        self.assertEqual(A.foo.cache_info().misses, 2)
+        # the limit of the function's cache and of the two instance caches
+        self.assertEqual(A.foo.cache_info().max_size, 3000)
+        self.assertEqual(a.foo.cache_info().max_size, 1000)
+        b.foo.cache_clear()
+        self.assertEqual(A.foo.cache_info().size, 1)
+
+        # the caches don't keep the instances alive
+        a_reference = weakref.ref(a)
+        del a
+        gc.collect()
+        self.assertTrue(a_reference() is None)
+        self.assertEqual(A.foo.cache_info().size, 0)
+
+    #--------------------------------------------------------------------------
+    def test_arguments_referring_to_the_instance_are_not_kept(self):
+
+        class Owner(object):
+            def __init__(self):
+                self.sources = []
+
+        class Source(object):
+            def __init__(self, owner):
+                owner.sources.append(self)
+
+            @memoize()
+            def get_values(self, owner, a):
+                return a * 2
+
+        an_owner = Owner()
+        a_source = Source(an_owner)
+        self.assertEqual(a_source.get_values(an_owner, 2), 4)
+        self.assertEqual(a_source.get_values(an_owner, 2), 4)
+        self.assertEqual(a_source.get_values.cache_info().hits, 1)
+        # another owner is another key
+        self.assertEqual(a_source.get_values(Owner(), 2), 4)
+        self.assertEqual(a_source.get_values.cache_info().misses, 2)
+
+        # the owner refers to the source, the cache of the source holds the
+        # owner as an argument.  Neither is kept alive by the cache.
+        owner_reference = weakref.ref(an_owner)
+        source_reference = weakref.ref(a_source)
+        del an_owner, a_source
+        gc.collect()
+        self.assertTrue(owner_reference() is None)
+        self.assertTrue(source_reference() is None)
+
+        @memoize()
+        def foo(an_owner, a=1):
+            return a
+
+        an_owner = Owner()
+        self.assertEqual(foo(an_owner, a=3), 3)
+        self.assertEqual(foo(an_owner, a=3), 3)
+        self.assertEqual(foo.cache_info().hits, 1)
+        owner_reference = weakref.ref(an_owner)
+        del an_owner
+        gc.collect()
+        self.assertTrue(owner_reference() is None)
+
+    #--------------------------------------------------------------------------
+    def test_thread_safety(self):
+
+        @memoize(max_cache_size=10)
+        def foo(a):
+            return a * 2
+
+        def worker():
+            for i in range(1000):
+                self.assertEqual(foo(i % 20), (i % 20) * 2)
+
+        threads = [threading.Thread(target=worker) for i in range(4)]
+        for a_thread in threads:
+            a_thread.start()
+        for a_thread in threads:
+            a_thread.join()
+        info = foo.cache_info()
+        self.assertEqual(info.hits + info.misses, 4000)
+        self.assertTrue(info.size <= 10)
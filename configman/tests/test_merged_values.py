@@ -0,0 +1,89 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+import unittest
+
+from configman.dotdict import (
+    DotDict,
+    DotDictWithAcquisition,
+    create_key_translating_dot_dict,
+)
+from configman.value_sources.merged_values import MergedValueSources
+
+
+#==============================================================================
+class TestCase(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    def test_precedence(self):
+        low = DotDict({'a': 1, 'x': {'b': 2, 'c': 3}})
+        high = DotDict({'x': {'c': 33}, 'd': 4})
+        merged = MergedValueSources([low, high])
+        self.assertEqual(merged.lookup('a'), (1, 0))
+        self.assertEqual(merged.lookup('x.b'), (2, 0))
+        self.assertEqual(merged.lookup('x.c'), (33, 1))
+        self.assertEqual(merged['d'], 4)
+        self.assertTrue('x.b' in merged)
+        self.assertFalse('x.d' in merged)
+        self.assertRaises(KeyError, merged.lookup, 'x.d')
+
+    #--------------------------------------------------------------------------
+    def test_lookup_below_a_value_source(self):
+        low = DotDict({'a': 1, 'x': {'b': 2}})
+        middle = DotDictWithAcquisition({'a': 11})
+        high = DotDict({'a': 111, 'x': {'b': 22}})
+        merged = MergedValueSources([low, middle, high])
+        self.assertEqual(merged.lookup('a'), (111, 2))
+        self.assertEqual(merged.lookup('a', below=2), (11, 1))
+        self.assertEqual(merged.lookup('a', below=1), (1, 0))
+        self.assertRaises(KeyError, merged.lookup, 'a', below=0)
+        # acquired from the middle source
+        self.assertEqual(merged.lookup('x.a', below=2), (11, 1))
+        self.assertEqual(merged.lookup('x.b', below=2), (2, 0))
+
+    #--------------------------------------------------------------------------
+    def test_namespaces_are_values_too(self):
+        source = DotDict({'x': {'b': 2}})
+        merged = MergedValueSources([source])
+        self.assertTrue(merged['x'] is source.x)
+
+    #--------------------------------------------------------------------------
+    def test_acquisition(self):
+        exact = DotDict({'x': {'a': 1}})
+        acquiring = DotDictWithAcquisition({'a': 2, 'q': {'b': 3}})
+        merged = MergedValueSources([exact, acquiring])
+        # the acquired value has precedence over the exact match
+        self.assertEqual(merged.lookup('x.a'), (2, 1))
+        self.assertEqual(merged.lookup('q.b'), (3, 1))
+        self.assertRaises(KeyError, merged.lookup, 'x.b')
+
+        merged = MergedValueSources([acquiring, exact])
+        # the exact match has precedence over the acquired value
+        self.assertEqual(merged.lookup('x.a'), (1, 1))
+        self.assertEqual(merged.lookup('z.a'), (2, 0))
+
+    #--------------------------------------------------------------------------
+    def test_unknown_mapping_types_are_probed(self):
+        HyphenUnderscoreDict = create_key_translating_dot_dict(
+            "HyphenUnderscoreDict",
+            (('-', '_'),)
+        )
+        translating = HyphenUnderscoreDict()
+        translating['a_b'] = 1
+        merged = MergedValueSources([DotDict({'a-b': 0}), translating])
+        self.assertEqual(merged.lookup('a-b'), (1, 1))
+        self.assertEqual(merged.lookup('a_b'), (1, 1))
+
+    #--------------------------------------------------------------------------
+    def test_reuse_of_previous_flattening(self):
+        unchanged = DotDict({'a': 1})
+        merged = MergedValueSources([unchanged, DotDict({'b': 2})])
+        merged_again = MergedValueSources(
+            [unchanged, DotDict({'b': 3})],
+            merged
+        )
+        self.assertTrue(merged_again._flattened[0] is merged._flattened[0])
+        self.assertFalse(merged_again._flattened[1] is merged._flattened[1])
+        self.assertEqual(merged_again['b'], 3)
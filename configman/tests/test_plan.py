@@ -0,0 +1,193 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+import unittest
+
+import mock
+
+from configman import Namespace, RequiredConfig, command_line
+from configman.config_manager import ConfigurationManager
+from configman.converters import class_converter
+from configman.dotdict import DotDict
+from configman.plan import ConfigurationPlan, resolve_many
+
+
+#==============================================================================
+class Alpha(RequiredConfig):
+    required_config = Namespace()
+    required_config.add_option('a', default=11)
+    required_config.add_option(
+        'helper_class',
+        default='configman.tests.test_plan.Gamma',
+        from_string_converter=class_converter
+    )
+
+
+#==============================================================================
+class Beta(RequiredConfig):
+    required_config = Namespace()
+    required_config.add_option('b', default=22)
+
+
+#==============================================================================
+class Gamma(RequiredConfig):
+    required_config = Namespace()
+    required_config.add_option('g', default=33)
+
+
+#==============================================================================
+class TestCase(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _definitions():
+        n = Namespace()
+        n.add_option('x', default=1)
+        n.namespace('source')
+        n.source.add_option(
+            'cls',
+            default=Alpha,
+            from_string_converter=class_converter
+        )
+        n.namespace('destination')
+        n.destination.add_option(
+            'cls',
+            default=Beta,
+            from_string_converter=class_converter
+        )
+        return n
+
+    #--------------------------------------------------------------------------
+    def _assert_same_as_full_construction(self, plan, values_source_list,
+                                          argv_source):
+        config = plan.resolve(values_source_list, argv_source).get_config()
+        expected_config = ConfigurationManager(
+            self._definitions(),
+            values_source_list,
+            argv_source,
+            use_auto_help=False,
+        ).get_config()
+        self.assertEqual(config, expected_config)
+        return config
+
+    #--------------------------------------------------------------------------
+    def test_resolve_matches_full_construction(self):
+        plan = ConfigurationPlan(self._definitions(), use_auto_help=False)
+        for values_source_list, argv_source in (
+            ([], []),
+            ([{'x': 2}], []),
+            ([{'source': {'a': 3}}, command_line], ['--source.g=4']),
+            ([{'destination.b': 5}, command_line], ['--x=6']),
+        ):
+            self._assert_same_as_full_construction(
+                plan,
+                values_source_list,
+                argv_source
+            )
+
+    #--------------------------------------------------------------------------
+    def test_resolve_with_a_replaced_class(self):
+        plan = ConfigurationPlan(self._definitions(), use_auto_help=False)
+        config = self._assert_same_as_full_construction(
+            plan,
+            [command_line],
+            ['--source.cls=configman.tests.test_plan.Beta'],
+        )
+        self.assertTrue(config.source.cls is Beta)
+        self.assertEqual(config.source.b, 22)
+        # the options brought in by Alpha are gone
+        self.assertFalse('a' in config.source)
+        self.assertFalse('helper_class' in config.source)
+
+    #--------------------------------------------------------------------------
+    def test_resolve_only_expands_options_with_values(self):
+        plan = ConfigurationPlan(self._definitions(), use_auto_help=False)
+        with mock.patch.object(
+            ConfigurationManager,
+            '_expand_option',
+            autospec=True,
+            side_effect=ConfigurationManager._expand_option
+        ) as expand_option_spy:
+            cm = plan.resolve([{'x': 2, 'source.a': 5}], [])
+        expanded_keys = set(
+            a_call[0][1] for a_call in expand_option_spy.call_args_list
+        )
+        # everything not in the plan, like the admin options, is expanded
+        expected_keys = set(['x', 'source.a'])
+        expected_keys.update(
+            key for key in cm.get_option_names() if key.startswith('admin.')
+        )
+        self.assertEqual(expanded_keys, expected_keys)
+        self.assertEqual(cm.get_config().source.a, 5)
+
+    #--------------------------------------------------------------------------
+    def test_plan_is_not_changed_by_resolution(self):
+        plan = ConfigurationPlan(self._definitions(), use_auto_help=False)
+        config = plan.resolve([{'x': 2, 'source.a': 5}], []).get_config()
+        self.assertEqual(config.x, 2)
+        config = plan.resolve([], []).get_config()
+        self.assertEqual(config.x, 1)
+        self.assertEqual(config.source.a, 11)
+
+    #--------------------------------------------------------------------------
+    def test_value_sources_are_given_to_resolve(self):
+        self.assertRaises(
+            TypeError,
+            ConfigurationPlan,
+            self._definitions(),
+            argv_source=[]
+        )
+
+    #--------------------------------------------------------------------------
+    def _resolve_many_test(self, **kwargs):
+        values_source_lists = [
+            [{'x': i, 'destination.b': i * 10}] for i in range(7)
+        ]
+        configs = list(resolve_many(
+            self._definitions(),
+            values_source_lists,
+            use_auto_help=False,
+            use_admin_controls=False,
+            chunk_size=2,
+            **kwargs
+        ))
+        self.assertEqual([c.x for c in configs], list(range(7)))
+        self.assertEqual(
+            [c.destination.b for c in configs],
+            [i * 10 for i in range(7)]
+        )
+        self.assertTrue(all(isinstance(c, DotDict) for c in configs))
+        self.assertTrue(all(c.source.cls is Alpha for c in configs))
+
+    #--------------------------------------------------------------------------
+    def test_resolve_many_serially(self):
+        self._resolve_many_test(max_workers=1)
+
+    #--------------------------------------------------------------------------
+    def test_resolve_many_in_a_pool(self):
+        self._resolve_many_test(max_workers=2)
+
+    #--------------------------------------------------------------------------
+    def test_resolve_many_is_bounded(self):
+        consumed = []
+
+        def values_source_lists():
+            for i in range(1000):
+                consumed.append(i)
+                yield [{'x': i}]
+
+        configs = resolve_many(
+            self._definitions(),
+            values_source_lists(),
+            use_auto_help=False,
+            use_admin_controls=False,
+            max_workers=2,
+            chunk_size=3,
+        )
+        self.assertEqual(next(configs).x, 0)
+        # no more than two chunks per worker in flight plus the chunk that
+        # was being submitted
+        self.assertTrue(len(consumed) <= (2 * 2 + 1) * 3)
+        configs.close()
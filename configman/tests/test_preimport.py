@@ -0,0 +1,138 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+import unittest
+
+import mock
+import six
+from six.moves import cStringIO as StringIO
+
+from configman import Namespace
+from configman.config_manager import ConfigurationManager
+from configman.converters import class_converter
+from configman.preimport import preimport
+
+# a module that is slow to import, with a class of its own
+slow_module_source = '''
+import threading
+import time
+time.sleep(%(seconds)s)
+IMPORTED_BY = threading.current_thread().name
+
+class Plugin(object):
+    pass
+'''
+
+
+#==============================================================================
+class TestCase(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.package_name = 'preimport_test_%d' % id(self)
+        package_directory = os.path.join(self.directory, self.package_name)
+        os.mkdir(package_directory)
+        with open(os.path.join(package_directory, '__init__.py'), 'w'):
+            pass
+        for i in range(6):
+            with open(
+                os.path.join(package_directory, 'slow%d.py' % i),
+                'w'
+            ) as f:
+                f.write(slow_module_source % {'seconds': 0.2})
+        with open(os.path.join(package_directory, 'broken.py'), 'w') as f:
+            f.write('raise RuntimeError("broken")\n')
+        sys.path.insert(0, self.directory)
+
+    #--------------------------------------------------------------------------
+    def tearDown(self):
+        sys.path.remove(self.directory)
+        for a_name in list(sys.modules):
+            if a_name.startswith(self.package_name):
+                del sys.modules[a_name]
+        shutil.rmtree(self.directory)
+
+    #--------------------------------------------------------------------------
+    def test_preimport(self):
+        names = ['%s.slow%d.Plugin' % (self.package_name, i) for i in range(4)]
+        names.extend([
+            '%s.slow0' % self.package_name,  # a module rather than a class
+            '%s.broken.Plugin' % self.package_name,
+            '%s.nothing.Plugin' % self.package_name,
+            'Plugin',  # no module to import
+            None,
+        ])
+        start = timeit.default_timer()
+        self.assertEqual(preimport(names, 4), 7)
+        if six.PY3:
+            # the four slow imports overlapped, Python 2 imports one module
+            # at a time
+            self.assertTrue(timeit.default_timer() - start < 0.6)
+        for i in range(4):
+            a_module = sys.modules['%s.slow%d' % (self.package_name, i)]
+            self.assertTrue(
+                a_module.IMPORTED_BY.startswith('configman-preimport-')
+            )
+        self.assertFalse('%s.broken' % self.package_name in sys.modules)
+        # there's nothing left to import
+        self.assertEqual(preimport(names[:5], 4), 0)
+
+    #--------------------------------------------------------------------------
+    def test_config_manager_parallel_imports(self):
+        n = Namespace()
+        for i in range(4):
+            n.namespace('plugin%d' % i)
+            n['plugin%d' % i].add_option(
+                'cls',
+                default='%s.slow%d.Plugin' % (self.package_name, i),
+                from_string_converter=class_converter
+            )
+        # two of the plugins are replaced by a value source
+        values = {
+            'plugin2.cls': '%s.slow4.Plugin' % self.package_name,
+            'plugin3.cls': '%s.slow5.Plugin' % self.package_name,
+        }
+        with mock.patch('sys.stderr', new_callable=StringIO):
+            cm = ConfigurationManager(
+                n,
+                values_source_list=[values],
+                parallel_imports=4,
+                profile=True,
+            )
+            config = cm.get_config()
+        for key, i in (
+            ('plugin0.cls', 0),
+            ('plugin1.cls', 1),
+            ('plugin2.cls', 4),
+            ('plugin3.cls', 5),
+        ):
+            a_module = sys.modules['%s.slow%d' % (self.package_name, i)]
+            self.assertTrue(config[key] is a_module.Plugin)
+            self.assertTrue(
+                a_module.IMPORTED_BY.startswith('configman-preimport-')
+            )
+        self.assertTrue('setup_definitions preimport' in cm.profiler.phases)
+        self.assertTrue(
+            'overlay_expand pass 1 preimport' in cm.profiler.phases
+        )
+
+    #--------------------------------------------------------------------------
+    def test_no_parallel_imports_by_default(self):
+        n = Namespace()
+        n.add_option(
+            'cls',
+            default='%s.slow0.Plugin' % self.package_name,
+            from_string_converter=class_converter
+        )
+        config = ConfigurationManager(n, values_source_list=[]).get_config()
+        a_module = sys.modules['%s.slow0' % self.package_name]
+        self.assertTrue(config.cls is a_module.Plugin)
+        self.assertEqual(a_module.IMPORTED_BY, 'MainThread')
@@ -0,0 +1,151 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+import json
+import unittest
+
+import mock
+from six.moves import cStringIO as StringIO
+
+from configman import Namespace, command_line, profiler
+from configman.config_exceptions import CannotConvertError
+from configman.config_manager import ConfigurationManager
+from configman.converters import class_converter
+from configman.profiler import Profiler
+
+
+#==============================================================================
+class TestCase(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    def test_record_and_report(self):
+        p = Profiler()
+        p.record('fast', 0.5)
+        p.record('slow', 2.0)
+        p.record('fast', 0.25)
+        self.assertEqual(p.as_list(), [('slow', 1, 2.0), ('fast', 2, 0.75)])
+
+        output = StringIO()
+        p.report('json', output)
+        self.assertEqual(
+            json.loads(output.getvalue()),
+            [
+                {'phase': 'slow', 'count': 1, 'seconds': 2.0},
+                {'phase': 'fast', 'count': 2, 'seconds': 0.75},
+            ]
+        )
+
+        output = StringIO()
+        p.report('text', output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[1].split(), ['slow', '1', '2.000000'])
+
+    #--------------------------------------------------------------------------
+    def test_phase_without_a_profiler(self):
+        p = Profiler()
+        with profiler.phase(None, 'nothing'):
+            pass
+        with profiler.phase(p, 'something'):
+            pass
+        self.assertEqual(list(p.phases.keys()), ['something'])
+
+    #--------------------------------------------------------------------------
+    def test_config_manager_profile(self):
+        n = Namespace()
+        n.add_option('a', default=1)
+        n.add_option(
+            'cls',
+            default='configman.tests.test_profiler.TestCase',
+            from_string_converter=class_converter
+        )
+        with mock.patch('sys.stderr', new_callable=StringIO) as stderr:
+            cm = ConfigurationManager(
+                n,
+                [{'a': '2'}, command_line],
+                argv_source=['--admin.profile=json'],
+                use_auto_help=False,
+                profile=True,
+            )
+        phase_names = set(
+            a_phase['phase'] for a_phase in json.loads(stderr.getvalue())
+        )
+        for expected_name in (
+            'setup_definitions',
+            'wrap_with_value_source_api',
+            'get_values[0] for_mapping',
+            'get_values[1] for_getopt',
+            'overlay_expand pass 1 overlay',
+            'overlay_expand pass 1 expansion',
+            'from_string_converter',
+            'str_to_python_object',
+            '_check_for_mismatches',
+        ):
+            self.assertTrue(expected_name in phase_names, expected_name)
+        self.assertTrue(cm.get_config().cls is TestCase)
+        self.assertEqual(
+            cm.profiler.phases['get_config aggregation'][0],
+            1
+        )
+
+    #--------------------------------------------------------------------------
+    def test_no_profile_by_default(self):
+        n = Namespace()
+        n.add_option('a', default=1)
+        with mock.patch('sys.stderr', new_callable=StringIO) as stderr:
+            cm = ConfigurationManager(n, [], argv_source=[])
+        self.assertTrue(cm.profiler is None)
+        self.assertTrue('admin.profile' not in cm.get_option_names())
+        self.assertEqual(stderr.getvalue(), '')
+
+        # offered, but off
+        with mock.patch('sys.stderr', new_callable=StringIO) as stderr:
+            cm = ConfigurationManager(n, [], argv_source=[], profile=False)
+        self.assertTrue(cm.profiler is None)
+        self.assertEqual(cm.option_definitions.admin.profile.value, '')
+        self.assertEqual(stderr.getvalue(), '')
+
+    #--------------------------------------------------------------------------
+    def test_profile_from_the_command_line(self):
+        n = Namespace()
+        n.add_option('a', default=1)
+        with mock.patch('sys.stderr', new_callable=StringIO) as stderr:
+            cm = ConfigurationManager(
+                n,
+                [command_line],
+                argv_source=['--admin.profile=json'],
+                use_auto_help=False,
+                profile=False,
+            )
+        phase_names = set(
+            a_phase['phase'] for a_phase in json.loads(stderr.getvalue())
+        )
+        self.assertTrue('overlay_expand pass 1 overlay' in phase_names)
+        self.assertTrue(cm.profiler is not None)
+
+        # and turned off from the command line
+        with mock.patch('sys.stderr', new_callable=StringIO) as stderr:
+            ConfigurationManager(
+                n,
+                [command_line],
+                argv_source=['--admin.profile='],
+                use_auto_help=False,
+                profile=True,
+            )
+        self.assertEqual(stderr.getvalue(), '')
+
+    #--------------------------------------------------------------------------
+    def test_invalid_profile_format(self):
+        n = Namespace()
+        n.add_option('a', default=1)
+        self.assertRaises(
+            CannotConvertError,
+            ConfigurationManager,
+            n,
+            [command_line],
+            argv_source=['--admin.profile=xml'],
+            use_auto_help=False,
+            profile=False,
+        )
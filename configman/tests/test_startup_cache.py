@@ -0,0 +1,178 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+import configman.config_manager as config_manager
+from configman import Namespace, command_line
+from configman.converters import class_converter
+from configman.dotdict import DotDict
+
+
+#==============================================================================
+class TestCase(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    def setUp(self):
+        self.temp_directory = tempfile.mkdtemp()
+        self.cache_pathname = os.path.join(self.temp_directory, 'cache.pkl')
+        self.ini_pathname = os.path.join(self.temp_directory, 'app.ini')
+        with open(self.ini_pathname, 'w') as f:
+            f.write('a=17\n')
+
+    #--------------------------------------------------------------------------
+    def tearDown(self):
+        shutil.rmtree(self.temp_directory)
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _definitions(default_b='b'):
+        n = Namespace()
+        n.add_option('a', default=1, doc='the a')
+        n.add_option('b', default=default_b, doc='the b')
+        n.add_option(
+            'cls',
+            default='configman.dotdict.DotDict',
+            from_string_converter=class_converter
+        )
+        return n
+
+    #--------------------------------------------------------------------------
+    def _get_config(self, definitions=None, mapping=None, argv=None):
+        """return a tuple of the config and whether the option definitions
+        were resolved rather than loaded from the cache"""
+        cm_class = config_manager.ConfigurationManager
+        with mock.patch.object(
+            cm_class,
+            '_overlay_expand',
+            autospec=True,
+            side_effect=cm_class._overlay_expand
+        ) as overlay_expand_spy:
+            cm = cm_class(
+                definitions or self._definitions(),
+                [self.ini_pathname, mapping or {}, command_line],
+                argv_source=argv or [],
+                use_auto_help=False,
+                startup_cache_pathname=self.cache_pathname,
+            )
+            config = cm.get_config()
+        return config, overlay_expand_spy.called
+
+    #--------------------------------------------------------------------------
+    def test_hit_skips_the_overlay_expansion(self):
+        config, resolved = self._get_config(argv=['--b=22'])
+        self.assertTrue(resolved)
+        self.assertTrue(os.path.isfile(self.cache_pathname))
+        config_from_cache, resolved = self._get_config(argv=['--b=22'])
+        self.assertFalse(resolved)
+        self.assertEqual(config_from_cache, config)
+        self.assertEqual(config_from_cache.a, 17)
+        self.assertEqual(config_from_cache.b, '22')
+        self.assertTrue(config_from_cache.cls is DotDict)
+
+    #--------------------------------------------------------------------------
+    def test_miss_on_changed_command_line(self):
+        self._get_config(argv=['--b=22'])
+        config, resolved = self._get_config(argv=['--b=33'])
+        self.assertTrue(resolved)
+        self.assertEqual(config.b, '33')
+
+    #--------------------------------------------------------------------------
+    def test_miss_on_changed_definitions(self):
+        self._get_config()
+        config, resolved = self._get_config(self._definitions('bb'))
+        self.assertTrue(resolved)
+        self.assertEqual(config.b, 'bb')
+
+    #--------------------------------------------------------------------------
+    def test_miss_on_modified_config_file(self):
+        self._get_config()
+        with open(self.ini_pathname, 'w') as f:
+            f.write('a=18\n')
+        stat = os.stat(self.ini_pathname)
+        os.utime(self.ini_pathname, (stat.st_atime, stat.st_mtime + 10))
+        config, resolved = self._get_config()
+        self.assertTrue(resolved)
+        self.assertEqual(config.a, 18)
+
+    #--------------------------------------------------------------------------
+    def test_miss_on_modified_included_file(self):
+        included_pathname = os.path.join(self.temp_directory, 'included.ini')
+        with open(included_pathname, 'w') as f:
+            f.write('b=from_include\n')
+        with open(self.ini_pathname, 'w') as f:
+            f.write('a=17\n+include ./included.ini\n')
+        config, resolved = self._get_config()
+        self.assertTrue(resolved)
+        self.assertEqual(config.b, 'from_include')
+        config, resolved = self._get_config()
+        self.assertFalse(resolved)
+        with open(included_pathname, 'w') as f:
+            f.write('b=changed_include\n')
+        stat = os.stat(included_pathname)
+        os.utime(included_pathname, (stat.st_atime, stat.st_mtime + 10))
+        config, resolved = self._get_config()
+        self.assertTrue(resolved)
+        self.assertEqual(config.b, 'changed_include')
+
+    #--------------------------------------------------------------------------
+    def test_mappings_are_checked_for_relevant_values(self):
+        self._get_config(mapping={'b': 'x', 'unrelated': 1,
+                                  'always_ignore_mismatches': True})
+        config, resolved = self._get_config(
+            mapping={'b': 'x', 'unrelated': 2,
+                     'always_ignore_mismatches': True}
+        )
+        self.assertFalse(resolved)
+        config, resolved = self._get_config(
+            mapping={'b': 'y', 'unrelated': 2,
+                     'always_ignore_mismatches': True}
+        )
+        self.assertTrue(resolved)
+        self.assertEqual(config.b, 'y')
+
+    #--------------------------------------------------------------------------
+    def test_uncacheable_definitions(self):
+        n = self._definitions()
+        n.add_option('c', default=1, from_string_converter=lambda s: int(s))
+        config, resolved = self._get_config(n)
+        self.assertTrue(resolved)
+        self.assertFalse(os.path.exists(self.cache_pathname))
+        config, resolved = self._get_config(n)
+        self.assertTrue(resolved)
+
+    #--------------------------------------------------------------------------
+    def test_failed_write_leaves_no_temporary_file(self):
+        with mock.patch(
+            'configman.startup_cache.os.rename',
+            side_effect=OSError('the disk is full')
+        ):
+            config, resolved = self._get_config()
+        self.assertTrue(resolved)
+        self.assertEqual(config.a, 17)
+        self.assertEqual(os.listdir(self.temp_directory), ['app.ini'])
+
+    #--------------------------------------------------------------------------
+    def test_reload_after_a_hit(self):
+        self._get_config()
+        cm = config_manager.ConfigurationManager(
+            self._definitions(),
+            [self.ini_pathname, {}, command_line],
+            argv_source=[],
+            use_auto_help=False,
+            startup_cache_pathname=self.cache_pathname,
+        )
+        with open(self.ini_pathname, 'w') as f:
+            f.write('a=18\n')
+        stat = os.stat(self.ini_pathname)
+        os.utime(self.ini_pathname, (stat.st_atime, stat.st_mtime + 10))
+        config, changes = cm.reload()
+        self.assertEqual(config.a, 18)
+        self.assertEqual(changes, {'a': (17, 18)})
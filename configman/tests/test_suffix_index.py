@@ -0,0 +1,50 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+import unittest
+
+from configman.suffix_index import SuffixIndex
+
+
+#==============================================================================
+class TestCase(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    def test_has_string_ending_with(self):
+        index = SuffixIndex(['x.y.z', 'x.a', 'admin.strict', 'b'])
+        self.assertEqual(len(index), 4)
+        self.assertTrue(index.has_string_ending_with('z'))
+        self.assertTrue(index.has_string_ending_with('y.z'))
+        self.assertTrue(index.has_string_ending_with('x.y.z'))
+        self.assertTrue(index.has_string_ending_with('strict'))
+        self.assertTrue(index.has_string_ending_with('b'))
+        self.assertTrue(index.has_string_ending_with(''))
+        self.assertFalse(index.has_string_ending_with('x.y'))
+        self.assertFalse(index.has_string_ending_with('w.x.y.z'))
+        self.assertFalse(index.has_string_ending_with('c'))
+
+    #--------------------------------------------------------------------------
+    def test_same_answers_as_endswith(self):
+        known_keys = [
+            'a', 'a.b', 'aa.b', 'a.bb', 'x.a.b', 'source.cls', 'cls',
+            'destination.cls', 'destination.ccc.x', 'ab',
+        ]
+        index = SuffixIndex(known_keys)
+        candidates = set()
+        for a_key in known_keys:
+            for i in range(len(a_key) + 1):
+                candidates.add(a_key[i:])
+                candidates.add('q' + a_key[i:])
+        for a_candidate in candidates:
+            self.assertEqual(
+                index.has_string_ending_with(a_candidate),
+                any(k.endswith(a_candidate) for k in known_keys),
+                a_candidate
+            )
+
+    #--------------------------------------------------------------------------
+    def test_empty(self):
+        index = SuffixIndex([])
+        self.assertFalse(index.has_string_ending_with('a'))
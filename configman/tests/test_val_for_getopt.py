@@ -44,6 +44,34 @@ class TestCase(unittest.TestCase):
         v = o.get_values(c, True, DotDictWithAcquisition)
         self.assertTrue(isinstance(v, DotDictWithAcquisition))
 
+    #--------------------------------------------------------------------------
+    def test_for_getopt_revalidate_values(self):
+        c = config_manager.ConfigurationManager(
+            use_admin_controls=True,
+            use_auto_help=False,
+            argv_source=[]
+        )
+        c.option_definitions.add_option('limit', default=0)
+
+        o = ValueSource(['--limit', '10', 'an_arg'])
+        # without a previous call to get_values, there is nothing to reuse
+        self.assertEqual(
+            o.revalidate_values(c, None),
+            {'limit': '10'}
+        )
+        values = o.get_values(c, True)
+        c.args = []
+        self.assertTrue(o.revalidate_values(c, values) is values)
+        self.assertEqual(c.args, ['an_arg'])
+
+        o = ValueSource(['--limit', '10', '--bad'])
+        values = o.get_values(c, True)
+        self.assertEqual(values, {'limit': '10'})
+        self.assertRaises(
+            NotAnOptionError,
+            o.revalidate_values, c, values
+        )
+
     #--------------------------------------------------------------------------
     def test_for_getopt_get_values_with_short_form(self):
         c = config_manager.ConfigurationManager(
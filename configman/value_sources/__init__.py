@@ -188,15 +188,24 @@ def dispatch_request_to_write(
 
 
 #------------------------------------------------------------------------------
-def config_filename_from_commandline(config_manager):
+def admin_values_from_commandline(config_manager):
+    """some of the admin options, like the name of the config file, must be
+    known before the rest of the command line can be processed.  Return the
+    values from a preliminary pass over the command line."""
     command_line_value_source = for_getopt.ValueSource(
         for_getopt.getopt,
         config_manager
     )
-    values = command_line_value_source.get_values(
+    return command_line_value_source.get_values(
         config_manager,
         ignore_mismatches=True
     )
+
+
+#------------------------------------------------------------------------------
+def config_filename_from_commandline(config_manager, values=None):
+    if values is None:
+        values = admin_values_from_commandline(config_manager)
     try:
         config_file_name = values['admin.conf']
     except KeyError:
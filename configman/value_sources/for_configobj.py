@@ -116,6 +116,27 @@ class ConfigObjWithIncludes(configobj.ConfigObj):
             super(ConfigObjWithIncludes, self)._load(infile, configspec)
 
 
+#------------------------------------------------------------------------------
+def included_files(file_name):
+    """return the pathnames of the files that an ini file includes, directly
+    or through the files that it includes, in the order that they're
+    included.  An included file that cannot be read is listed but not
+    examined any further."""
+    pathnames = []
+    original_path = os.path.dirname(file_name)
+    with open(file_name) as f:
+        for a_line in f:
+            match = ConfigObjWithIncludes._include_re.match(a_line)
+            if match:
+                include_file = os.path.join(original_path, match.group(2))
+                pathnames.append(include_file)
+                try:
+                    pathnames.extend(included_files(include_file))
+                except (OSError, IOError):
+                    pass
+    return pathnames
+
+
 #==============================================================================
 class LoadingIniFileFailsException(ValueException):
     pass
@@ -80,6 +80,8 @@ class ValueSource(object):
         short_options_str, long_options_list = self.getopt_create_opts(
             config_manager.option_definitions
         )
+        # save the switches for 'revalidate_values'
+        self._last_getopt_opts = (short_options_str, long_options_list)
         try:
             if ignore_mismatches:
                 fn = ValueSource.getopt_with_ignore
@@ -123,6 +125,31 @@ class ValueSource(object):
             command_line_values[name] = value
         return command_line_values
 
+    #--------------------------------------------------------------------------
+    def revalidate_values(self, config_manager, previous_values,
+                          obj_hook=DotDict):
+        """check the command line strictly for switches that are not
+        defined, raising NotAnOptionError for any that are found.  This is
+        to be called after the final call to 'get_values' with the same
+        option definitions.  Rather than rebuilding the getopt switches from
+        the option definitions, it reuses those from that final call.  Since
+        the command line is otherwise unchanged, the values returned by that
+        call, 'previous_values', are returned again."""
+        try:
+            short_options_str, long_options_list = self._last_getopt_opts
+        except AttributeError:
+            # 'get_values' has never been called, there is nothing to reuse
+            return self.get_values(config_manager, False, obj_hook)
+        try:
+            getopt_options, config_manager.args = getopt.gnu_getopt(
+                self.argv_source,
+                short_options_str,
+                long_options_list
+            )
+        except getopt.GetoptError as x:
+            raise NotAnOptionError(str(x))
+        return previous_values
+
     #--------------------------------------------------------------------------
     def getopt_create_opts(self, option_definitions):
         short_options_list = []
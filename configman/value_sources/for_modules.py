@@ -21,6 +21,7 @@ from collections import defaultdict
 from configman.namespace import Namespace
 from configman.dotdict import DotDict
 from configman.option import Option, Aggregation
+from configman.lazy_import import resolve
 from configman.converters import (
     to_str,
     class_converter,
@@ -300,14 +301,11 @@ class ValueSource(object):
         print('\n', end='', file=output_stream)
         if an_option.doc:
             print('# %s' % an_option.doc, file=output_stream)
-        if (
-            isclass(an_option.value)
-            or ismodule(an_option.value)
-            or isfunction(an_option.value)
-        ):
+        value = resolve(an_option.value)
+        if isclass(value) or ismodule(value) or isfunction(value):
             ValueSource.write_class(
                 key,
-                an_option.value,
+                value,
                 alias_by_class,
                 output_stream
             )
@@ -360,7 +358,9 @@ class ValueSource(object):
                 # it's the value inside the option, not the option itself
                 # that is of interest to us
                 option = value
-                value = option.value
+                # a class known from a manifest must be imported to be
+                # written as an import
+                value = resolve(option.value)
 
             if value is None:
                 # we don't need in import anything having to do with None
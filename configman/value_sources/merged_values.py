@@ -0,0 +1,134 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""This module implements a merged index of the values offered by a list of
+value sources.  During the overlay phase, the ConfigurationManager must find,
+for each option, the value from the value source with the highest precedence
+that offers a value for that option.  Probing each value source in turn with a
+dotted key costs a walk through the nested mappings for every probe and an
+exception for every miss.  Instead, the values from all the sources are
+flattened and merged once into a single dict of qualified keys, so that the
+lookup for an option is a single dict access.
+
+Some value sources offer values via acquisition: a DotDictWithAcquisition will
+answer a lookup for 'x.y.a' with the value of 'a' from one of the enclosing
+levels.  Acquired values cannot be flattened ahead of time, so a fallback
+table records, for each leaf name, which of the acquiring sources could offer
+it.  Only those sources are probed and only when they have precedence over the
+source that matched exactly.  Value sources built from any other class of
+mapping, like the key translating DotDicts, have lookup semantics that are
+unknown here, so they are always probed in the traditional manner.
+"""
+from __future__ import absolute_import, division, print_function
+
+from configman.dotdict import (
+    DotDict,
+    DotDictWithAcquisition,
+    iteritems_breadth_first,
+)
+
+
+#==============================================================================
+class MergedValueSources(object):
+    #--------------------------------------------------------------------------
+    def __init__(self, values_from_all_sources, previous=None):
+        """parameters:
+            values_from_all_sources - a list of the mappings returned by the
+                                      'get_values' methods of the value
+                                      sources in order of increasing
+                                      precedence.
+            previous - (optional) the MergedValueSources from a previous pass.
+                       Value sources that returned the very same mapping
+                       object are not flattened again."""
+        self.values_from_all_sources = values_from_all_sources
+        # qualified key -> (value, index of the value source, the entry for
+        # the key from the value sources of lower precedence or None)
+        self.merged = {}
+        # leaf name -> indexes of the acquiring sources that have that name
+        self.acquisition_fallback = {}
+        # indexes of the sources with unknown lookup semantics
+        self.always_probe = []
+        self._flattened = []
+        for index, a_mapping in enumerate(values_from_all_sources):
+            mapping_type = type(a_mapping)
+            if mapping_type not in (DotDict, DotDictWithAcquisition):
+                self.always_probe.append(index)
+                self._flattened.append(None)
+                continue
+            flattened = None
+            if (
+                previous is not None
+                and index < len(previous.values_from_all_sources)
+                and previous.values_from_all_sources[index] is a_mapping
+            ):
+                flattened = previous._flattened[index]
+            if flattened is None:
+                flattened = list(
+                    iteritems_breadth_first(a_mapping, include_dicts=True)
+                )
+            self._flattened.append(flattened)
+            for key, value in flattened:
+                self.merged[key] = (value, index, self.merged.get(key))
+            if mapping_type is DotDictWithAcquisition:
+                for key, value in flattened:
+                    leaf_name = key.rsplit('.', 1)[-1]
+                    indexes = self.acquisition_fallback.setdefault(
+                        leaf_name,
+                        []
+                    )
+                    if not indexes or indexes[-1] != index:
+                        indexes.append(index)
+
+    #--------------------------------------------------------------------------
+    def lookup(self, key, below=None):
+        """return a tuple of the value for the key from the value source with
+        the highest precedence and the index of that value source.  Raise a
+        KeyError if no value source has a value for the key.
+
+        parameters:
+            key - the qualified name of an option
+            below - (optional) the index of a value source, only the value
+                    sources of lower precedence are considered"""
+        if below is None:
+            below = len(self.values_from_all_sources)
+        entry = self.merged.get(key)
+        while entry is not None and entry[1] >= below:
+            entry = entry[2]
+        if entry is None:
+            value, index = None, -1
+        else:
+            value, index = entry[:2]
+        candidates = [
+            i for i in self.always_probe if index < i < below
+        ]
+        if self.acquisition_fallback:
+            candidates.extend(
+                i
+                for i in self.acquisition_fallback.get(
+                    key.rsplit('.', 1)[-1],
+                    ()
+                )
+                if index < i < below
+            )
+        if candidates:
+            for i in sorted(candidates, reverse=True):
+                try:
+                    return self.values_from_all_sources[i][key], i
+                except KeyError:
+                    pass  # okay, that source doesn't have this value
+        if index < 0:
+            raise KeyError(key)
+        return value, index
+
+    #--------------------------------------------------------------------------
+    def __getitem__(self, key):
+        return self.lookup(key)[0]
+
+    #--------------------------------------------------------------------------
+    def __contains__(self, key):
+        try:
+            self.lookup(key)
+            return True
+        except KeyError:
+            return False